@@ -1,49 +1,286 @@
-#include "bsp/adc.h"
-#include <fcntl.h>
-#include <unistd.h>
-#include <stdio.h>
-#include <stdlib.h>
-#include <string.h>
-
-#define ADC_BASE_PATH "/sys/bus/iio/devices/iio:device0/in_voltage"
-#define ADC_PATH_LEN 64
-
-static int adc_fds[5] = {-1, -1, -1, -1, -1};
-
-int adc_init() {
-    char path[ADC_PATH_LEN];
-    
-    for (int i = 0; i < 5; i++) {
-        snprintf(path, ADC_PATH_LEN, "%s%d_raw", ADC_BASE_PATH, i);
-        adc_fds[i] = open(path, O_RDONLY);
-        if (adc_fds[i] < 0) {
-            perror("Failed to open ADC channel");
-            return -1;
-        }
-    }
-    return 0;
-}
-
-uint16_t adc_read(uint8_t channel) {
-    if (channel >= 5) return 0;
-    
-    char buffer[16];
-    lseek(adc_fds[channel], 0, SEEK_SET);
-    ssize_t bytes_read = read(adc_fds[channel], buffer, sizeof(buffer)-1);
-    
-    if (bytes_read <= 0) {
-        return 0;
-    }
-    
-    buffer[bytes_read] = '\0';
-    return (uint16_t)atoi(buffer);
-}
-
-void adc_close() {
-    for (int i = 0; i < 5; i++) {
-        if (adc_fds[i] >= 0) {
-            close(adc_fds[i]);
-            adc_fds[i] = -1;
-        }
-    }
-}
\ No newline at end of file
+#include "bsp/adc.h"
+#include <fcntl.h>
+#include <unistd.h>
+#include <poll.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define ADC_PATH_LEN 256
+#define ADC_BUFFER_LENGTH 128  // 内核缓冲区长度(扫描数)
+#define ADC_RING_SIZE 256      // 用户态环形缓冲区长度(扫描数)
+#define ADC_READ_SCANS 64      // 每次read最多取的扫描数
+#define ADC_MAX_SCAN_BYTES 64
+#define ADC_TIMEOUT_MS 1000
+
+// 扫描数据中一个通道的布局，由scan_elements/in_voltageN_{index,type}得到
+typedef struct {
+    int index;
+    int offset;     // 在一次扫描中的字节偏移
+    int bytes;      // 存储字节数
+    int bits;       // 有效位数
+    int shift;
+    int big_endian;
+} adc_channel;
+
+static int adc_fds[ADC_CHANNELS] = {-1, -1, -1, -1, -1};
+static int adc_dev_fd = -1;
+static char adc_dir[ADC_PATH_LEN];
+
+static adc_channel channels[ADC_CHANNELS];
+static int scan_size;
+
+// 读取得到的不完整扫描留在raw中，下次read接在后面
+static uint8_t raw[ADC_READ_SCANS * ADC_MAX_SCAN_BYTES];
+static int raw_len;
+
+static uint16_t ring[ADC_RING_SIZE][ADC_CHANNELS];
+static unsigned ring_head, ring_tail;  // 只增不减，下标取模
+static uint16_t latest[ADC_CHANNELS];
+
+static adc_stats stats;
+
+static int write_attr(const char *name, const char *value) {
+    char path[ADC_PATH_LEN + 64];
+    snprintf(path, sizeof(path), "%s/%s", adc_dir, name);
+    int fd = open(path, O_WRONLY | O_TRUNC);
+    if (fd < 0) return -1;
+    ssize_t n = write(fd, value, strlen(value));
+    close(fd);
+    return n == (ssize_t)strlen(value) ? 0 : -1;
+}
+
+static int read_attr(const char *name, char *buffer, int len) {
+    char path[ADC_PATH_LEN + 64];
+    snprintf(path, sizeof(path), "%s/%s", adc_dir, name);
+    int fd = open(path, O_RDONLY);
+    if (fd < 0) return -1;
+    ssize_t n = read(fd, buffer, len - 1);
+    close(fd);
+    if (n <= 0) return -1;
+    buffer[n] = '\0';
+    return 0;
+}
+
+// 解析 "le:u12/16>>0" 形式的通道类型
+static int parse_channel(int ch, adc_channel *c) {
+    char name[64], value[32];
+    char endian, sign;
+    int storage;
+    snprintf(name, sizeof(name), "scan_elements/in_voltage%d_index", ch);
+    if (read_attr(name, value, sizeof(value)) < 0) return -1;
+    c->index = atoi(value);
+    snprintf(name, sizeof(name), "scan_elements/in_voltage%d_type", ch);
+    if (read_attr(name, value, sizeof(value)) < 0) return -1;
+    c->shift = 0;
+    if (sscanf(value, "%ce:%c%d/%d>>%d", &endian, &sign, &c->bits, &storage, &c->shift) < 4) return -1;
+    if (storage != 8 && storage != 16 && storage != 32) return -1;
+    c->bytes = storage / 8;
+    c->big_endian = endian == 'b';
+    return 0;
+}
+
+static int buffered_init(const char *dev) {
+    char name[64];
+    int order[ADC_CHANNELS];
+
+    // 修改缓冲区长度和扫描通道前必须先关闭缓冲区
+    write_attr("buffer/enable", "0");
+    write_attr("scan_elements/in_timestamp_en", "0");
+    for (int ch = 0; ch < ADC_CHANNELS; ch++) {
+        snprintf(name, sizeof(name), "scan_elements/in_voltage%d_en", ch);
+        if (write_attr(name, "1") < 0 || parse_channel(ch, &channels[ch]) < 0) return -1;
+        order[ch] = ch;
+    }
+
+    // 扫描中的通道按index升序排列，每个通道按自身存储大小对齐
+    for (int i = 1; i < ADC_CHANNELS; i++) {
+        for (int j = i; j > 0 && channels[order[j]].index < channels[order[j - 1]].index; j--) {
+            int t = order[j]; order[j] = order[j - 1]; order[j - 1] = t;
+        }
+    }
+    int offset = 0, align = 1;
+    for (int i = 0; i < ADC_CHANNELS; i++) {
+        adc_channel *c = &channels[order[i]];
+        offset = (offset + c->bytes - 1) / c->bytes * c->bytes;
+        c->offset = offset;
+        offset += c->bytes;
+        if (c->bytes > align) align = c->bytes;
+    }
+    scan_size = (offset + align - 1) / align * align;
+    if (scan_size > ADC_MAX_SCAN_BYTES) return -1;
+
+    char value[16];
+    snprintf(value, sizeof(value), "%d", ADC_BUFFER_LENGTH);
+    const char *trigger = getenv("ADC_IIO_TRIGGER");
+    if (trigger != NULL && write_attr("trigger/current_trigger", trigger) < 0) return -1;
+    if (write_attr("buffer/length", value) < 0 || write_attr("buffer/enable", "1") < 0) return -1;
+
+    adc_dev_fd = open(dev, O_RDONLY | O_NONBLOCK);
+    if (adc_dev_fd < 0) {
+        write_attr("buffer/enable", "0");
+        return -1;
+    }
+    raw_len = 0;
+    ring_head = ring_tail = 0;
+    return 0;
+}
+
+int adc_init_path(const char *dir, const char *dev) {
+    char path[ADC_PATH_LEN + 32];
+
+    snprintf(adc_dir, ADC_PATH_LEN, "%s", dir);
+    memset(&stats, 0, sizeof(stats));
+    if (dev != NULL && buffered_init(dev) == 0) {
+        return 0;
+    }
+    if (dev != NULL) {
+        fprintf(stderr, "IIO buffer unavailable, falling back to sysfs\n");
+    }
+
+    for (int i = 0; i < ADC_CHANNELS; i++) {
+        snprintf(path, sizeof(path), "%s/in_voltage%d_raw", adc_dir, i);
+        adc_fds[i] = open(path, O_RDONLY);
+        if (adc_fds[i] < 0) {
+            perror("Failed to open ADC channel");
+            return -1;
+        }
+    }
+    return 0;
+}
+
+int adc_init() {
+    const char *dir = getenv("ADC_IIO_DIR");
+    const char *dev = getenv("ADC_IIO_DEV");
+    if (dir == NULL) dir = ADC_DEFAULT_DIR;
+    if (dev == NULL) dev = ADC_DEFAULT_DEV;
+    return adc_init_path(dir, strcmp(dev, "-") == 0 ? NULL : dev);
+}
+
+int adc_buffered(void) {
+    return adc_dev_fd >= 0;
+}
+
+static uint16_t decode_channel(const uint8_t *scan, const adc_channel *c) {
+    const uint8_t *p = scan + c->offset;
+    uint32_t v = 0;
+    for (int i = 0; i < c->bytes; i++) {
+        int k = c->big_endian ? i : c->bytes - 1 - i;
+        v = (v << 8) | p[k];
+    }
+    v >>= c->shift;
+    if (c->bits < 32) v &= (1u << c->bits) - 1;
+    return (uint16_t)v;
+}
+
+// 从字符设备读取一批扫描放入环形缓冲区，返回读到的扫描数；wait_ms<0表示不等待
+static int fill_ring(int wait_ms) {
+    if (wait_ms >= 0) {
+        struct pollfd pfd = {adc_dev_fd, POLLIN, 0};
+        stats.syscalls++;
+        if (poll(&pfd, 1, wait_ms) <= 0) return 0;
+    }
+    // 最多读取环形缓冲区剩余空间能容纳的扫描数（缓冲区已满时仍读取，覆盖最旧的扫描）
+    int room = ADC_RING_SIZE - (int)(ring_head - ring_tail);
+    int want = room > 0 && room < ADC_READ_SCANS ? room : ADC_READ_SCANS;
+    stats.syscalls++;
+    ssize_t n = read(adc_dev_fd, raw + raw_len, want * scan_size - raw_len);
+    if (n <= 0) return n == 0 ? -1 : 0;  // 返回0表示写端已关闭（测试用FIFO）
+    raw_len += n;
+
+    int scans = raw_len / scan_size;
+    for (int s = 0; s < scans; s++) {
+        const uint8_t *scan = raw + s * scan_size;
+        if (ring_head - ring_tail == ADC_RING_SIZE) {
+            ring_tail++;  // 满时丢弃最旧的扫描
+            stats.dropped++;
+        }
+        uint16_t *slot = ring[ring_head % ADC_RING_SIZE];
+        for (int ch = 0; ch < ADC_CHANNELS; ch++) {
+            slot[ch] = decode_channel(scan, &channels[ch]);
+        }
+        ring_head++;
+    }
+    raw_len -= scans * scan_size;
+    memmove(raw, raw + scans * scan_size, raw_len);
+    return scans;
+}
+
+int adc_read_scans(uint16_t (*scans)[ADC_CHANNELS], int max, int timeout_ms) {
+    if (!adc_buffered()) {
+        if (max < 1 || adc_read_scan(scans[0]) < 0) return -1;
+        return 1;
+    }
+    // 一次read可能只得到半个扫描，多试几次直到凑满一个扫描或超时
+    for (int tries = 0; ring_head == ring_tail && tries < 3; tries++) {
+        if (fill_ring(timeout_ms) < 0) return -1;
+    }
+    int n = 0;
+    while (n < max && ring_tail != ring_head) {
+        memcpy(scans[n++], ring[ring_tail++ % ADC_RING_SIZE], sizeof(scans[0]));
+    }
+    if (n > 0) {
+        memcpy(latest, scans[n - 1], sizeof(latest));
+    }
+    stats.samples += n;
+    return n;
+}
+
+int adc_read_scan(uint16_t values[ADC_CHANNELS]) {
+    if (adc_buffered()) {
+        uint16_t scan[1][ADC_CHANNELS];
+        if (adc_read_scans(scan, 1, ADC_TIMEOUT_MS) != 1) return -1;
+        memcpy(values, scan[0], sizeof(scan[0]));
+        return 0;
+    }
+    for (int ch = 0; ch < ADC_CHANNELS; ch++) {
+        values[ch] = adc_read(ch);
+    }
+    stats.samples++;
+    return 0;
+}
+
+uint16_t adc_read(uint8_t channel) {
+    if (channel >= ADC_CHANNELS) return 0;
+
+    if (adc_buffered()) {
+        // 取走已到达的全部扫描，返回最新值
+        while (fill_ring(-1) > 0) {
+        }
+        if (ring_head != ring_tail) {
+            memcpy(latest, ring[(ring_head - 1) % ADC_RING_SIZE], sizeof(latest));
+            ring_tail = ring_head;
+        }
+        return latest[channel];
+    }
+
+    char buffer[16];
+    stats.syscalls += 2;
+    lseek(adc_fds[channel], 0, SEEK_SET);
+    ssize_t bytes_read = read(adc_fds[channel], buffer, sizeof(buffer)-1);
+
+    if (bytes_read <= 0) {
+        return 0;
+    }
+
+    buffer[bytes_read] = '\0';
+    return (uint16_t)atoi(buffer);
+}
+
+void adc_get_stats(adc_stats *out) {
+    *out = stats;
+}
+
+void adc_close() {
+    if (adc_dev_fd >= 0) {
+        close(adc_dev_fd);
+        adc_dev_fd = -1;
+        write_attr("buffer/enable", "0");
+    }
+    for (int i = 0; i < ADC_CHANNELS; i++) {
+        if (adc_fds[i] >= 0) {
+            close(adc_fds[i]);
+            adc_fds[i] = -1;
+        }
+    }
+}
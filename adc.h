@@ -1,15 +1,42 @@
-#ifndef __ADC_H__
-#define __ADC_H__
-
-#include <stdint.h>
-
-// ADC初始化
-int adc_init();
-
-// 读取指定通道的ADC值
-uint16_t adc_read(uint8_t channel);
-
-// 关闭ADC
-void adc_close();
-
-#endif
\ No newline at end of file
+#ifndef __ADC_H__
+#define __ADC_H__
+
+#include <stdint.h>
+
+#define ADC_CHANNELS 5
+#define ADC_DEFAULT_DIR "/sys/bus/iio/devices/iio:device0"
+#define ADC_DEFAULT_DEV "/dev/iio:device0"
+
+// 采集统计：扫描数（每次扫描包含全部通道）、系统调用次数、环形缓冲区溢出丢弃的扫描数
+typedef struct {
+    uint32_t samples;
+    uint32_t syscalls;
+    uint32_t dropped;
+} adc_stats;
+
+// ADC初始化：优先使用IIO缓冲采集，失败时退回逐次读取sysfs
+// 环境变量ADC_IIO_DIR/ADC_IIO_DEV可替换设备目录和字符设备（"-"表示只用sysfs）
+int adc_init();
+
+// 指定设备目录和字符设备初始化，dev为NULL时只用sysfs（测试时可指向伪造的目录和FIFO）
+int adc_init_path(const char *dir, const char *dev);
+
+// 是否处于缓冲采集模式
+int adc_buffered(void);
+
+// 读取指定通道的ADC值（缓冲模式下为最新一次扫描的值）
+uint16_t adc_read(uint8_t channel);
+
+// 读取一次完整扫描，成功返回0
+int adc_read_scan(uint16_t values[ADC_CHANNELS]);
+
+// 批量读取最多max次扫描，没有数据时最多等待timeout_ms，返回读到的扫描数，出错返回-1
+int adc_read_scans(uint16_t (*scans)[ADC_CHANNELS], int max, int timeout_ms);
+
+// 获取采集统计
+void adc_get_stats(adc_stats *stats);
+
+// 关闭ADC
+void adc_close();
+
+#endif
@@ -0,0 +1,163 @@
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import numpy as np
+
+ADC_CHANNELS = 5
+
+_BENCH_MAIN = r'''
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include "bsp/adc.h"
+
+/* 用法: adc_bench <设备目录> <字符设备|-> <扫描数> */
+int main(int argc, char **argv) {
+    static uint16_t scans[256][ADC_CHANNELS];
+    if (argc < 4) return 2;
+    const char *dev = strcmp(argv[2], "-") == 0 ? NULL : argv[2];
+    long count = atol(argv[3]);
+    if (adc_init_path(argv[1], dev) < 0) return 1;
+
+    struct timespec t0, t1;
+    unsigned long long checksum = 0;
+    long total = 0;
+    clock_gettime(CLOCK_MONOTONIC, &t0);
+    while (total < count) {
+        int max = count - total < 256 ? (int)(count - total) : 256;
+        int n = adc_read_scans(scans, max, 1000);
+        if (n <= 0) break;
+        for (int i = 0; i < n; i++) {
+            for (int ch = 0; ch < ADC_CHANNELS; ch++) {
+                checksum += (unsigned long long)scans[i][ch] * (ch + 1);
+            }
+        }
+        total += n;
+    }
+    clock_gettime(CLOCK_MONOTONIC, &t1);
+
+    adc_stats stats;
+    adc_get_stats(&stats);
+    double seconds = (t1.tv_sec - t0.tv_sec) + (t1.tv_nsec - t0.tv_nsec) * 1e-9;
+    printf("%d %ld %.9f %u %u %llu\n", adc_buffered(), total, seconds,
+           stats.syscalls, stats.dropped, checksum);
+    adc_close();
+    return 0;
+}
+'''
+
+
+def make_fake_iio(directory, raw_values, channel_type='le:u12/16>>0'):
+    """在directory下伪造IIO设备的sysfs属性和字符设备(FIFO)，返回FIFO路径"""
+    os.makedirs(os.path.join(directory, 'scan_elements'), exist_ok=True)
+    os.makedirs(os.path.join(directory, 'buffer'), exist_ok=True)
+
+    def write(name, value):
+        with open(os.path.join(directory, name), 'w') as f:
+            f.write(f"{value}\n")
+
+    for ch, value in enumerate(raw_values):
+        write(f'in_voltage{ch}_raw', value)
+        write(f'scan_elements/in_voltage{ch}_en', 0)
+        write(f'scan_elements/in_voltage{ch}_index', ch)
+        write(f'scan_elements/in_voltage{ch}_type', channel_type)
+    write('buffer/length', 0)
+    write('buffer/enable', 0)
+    dev = os.path.join(directory, 'iio:device0')
+    os.mkfifo(dev)
+    return dev
+
+
+def build_bench(workdir, cc='gcc'):
+    """用主机gcc把adc.c和基准主程序编译成可执行文件"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    bsp = os.path.join(workdir, 'bsp')
+    os.makedirs(bsp, exist_ok=True)
+    shutil.copy(os.path.join(here, 'adc.h'), bsp)
+    main_c = os.path.join(workdir, 'adc_bench_main.c')
+    with open(main_c, 'w') as f:
+        f.write(_BENCH_MAIN)
+    exe = os.path.join(workdir, 'adc_bench')
+    subprocess.run([cc, '-std=gnu11', '-O2', '-Wall', '-I', workdir,
+                    os.path.join(here, 'adc.c'), main_c, '-o', exe], check=True)
+    return exe
+
+
+def _run(exe, directory, dev, count):
+    result = subprocess.run([exe, directory, dev or '-', str(count)],
+                            capture_output=True, text=True, check=True)
+    buffered, total, seconds, syscalls, dropped, checksum = result.stdout.split()
+    total = int(total)
+    return {
+        'buffered': buffered == '1',
+        'samples': total,
+        'samples_per_s': total / float(seconds),
+        'syscalls_per_sample': int(syscalls) / max(total, 1),
+        'dropped': int(dropped),
+        'checksum': int(checksum),
+    }
+
+
+def _checksum(scans):
+    return int((scans.astype(np.uint64) * np.arange(1, ADC_CHANNELS + 1, dtype=np.uint64)).sum())
+
+
+def bench_sysfs(exe, directory, raw_values, count):
+    """逐通道lseek+read+atoi读取sysfs属性文件"""
+    result = _run(exe, directory, None, count)
+    result['ok'] = result['checksum'] == _checksum(np.tile(raw_values, (result['samples'], 1)))
+    return result
+
+
+def bench_buffered(exe, directory, dev, count, seed=0, chunk=4096):
+    """另一个线程向FIFO写入count个随机扫描（le:u12/16），C程序批量读取并解码"""
+    scans = np.random.default_rng(seed).integers(0, 4096, (count, ADC_CHANNELS)).astype('<u2')
+    payload = scans.tobytes()
+    step = chunk * scans.itemsize * ADC_CHANNELS
+
+    def feed():
+        # 打开FIFO写端会阻塞到读端打开
+        with open(dev, 'wb') as f:
+            for i in range(0, len(payload), step):
+                f.write(payload[i:i + step])
+
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+    result = _run(exe, directory, dev, count)
+    writer.join(5.0)
+    result['ok'] = result['buffered'] and result['checksum'] == _checksum(scans[:result['samples']])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="在伪造的IIO设备目录上比较sysfs逐次读取与缓冲采集")
+    parser.add_argument('--sysfs-samples', type=int, default=100_000)
+    parser.add_argument('--buffered-samples', type=int, default=1_000_000)
+    parser.add_argument('--cc', default='gcc')
+    args = parser.parse_args()
+
+    raw_values = [512, 331, 303, 479, 959]
+    with tempfile.TemporaryDirectory() as workdir:
+        exe = build_bench(workdir, args.cc)
+        directory = os.path.join(workdir, 'iio:device0')
+        dev = make_fake_iio(directory, raw_values)
+        results = {
+            'sysfs': bench_sysfs(exe, directory, raw_values, args.sysfs_samples),
+            'buffered': bench_buffered(exe, directory, dev, args.buffered_samples),
+        }
+        with open(os.path.join(directory, 'buffer', 'enable')) as f:
+            disabled = f.read().strip() == '0'
+    for mode, r in results.items():
+        print(f"{mode:<9} {r['samples_per_s']:>12,.0f} 扫描/秒  {r['syscalls_per_sample']:6.3f} 系统调用/扫描  "
+              f"丢弃 {r['dropped']}  数据{'正确' if r['ok'] else '错误'}")
+    print(f"缓冲采集加速 {results['buffered']['samples_per_s'] / results['sysfs']['samples_per_s']:.1f}x; "
+          f"关闭后buffer/enable已复位: {disabled}")
+    print("注: 伪造目录中的属性文件是普通文件，真实sysfs每次读取还会触发一次ADC转换，逐次读取实际更慢")
+
+
+if __name__ == "__main__":
+    main()
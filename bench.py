@@ -0,0 +1,267 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import numpy as np
+from network import train_model, save_model, save_artifact, FastPredictor, CachedPredictor, CACHE_BUCKET
+from filters import make_stabilizer
+from protocol import StreamParser, DownlinkEncoder
+from replay import synthesize, replay_in_background, PtyDevice, read_recording
+from sensor_stream import SerialReader
+from devices import DeviceManager
+from service import RecognitionService
+
+
+def _rate(count, fn, repeat=3):
+    """重复执行fn取最快一次，返回 count/秒"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def _chunks(records, size=256):
+    stream = b''.join(chunk for _, chunk in records)
+    return [stream[i:i + size] for i in range(0, len(stream), size)]
+
+
+def bench_parse(records, count):
+    chunks = _chunks(records)
+    return _rate(count, lambda: [StreamParser().feed(c) for c in chunks])
+
+
+def bench_predict(predictor, samples, batch=256):
+    single = samples[:2000]
+    return {
+        'single': _rate(len(single), lambda: [predictor.predict(s[None, :]) for s in single]),
+        'batch': _rate(len(samples), lambda: [predictor.predict(samples[i:i + batch])
+                                              for i in range(0, len(samples), batch)]),
+    }
+
+
+def bench_downlink(samples):
+    encoder = DownlinkEncoder()
+    sample_lists = samples.tolist()
+    return {
+        'single': _rate(len(samples), lambda: [encoder.encode(s) for s in sample_lists]),
+        'batch': _rate(len(samples), lambda: encoder.encode_batch(samples)),
+    }
+
+
+def bench_cache(predictor, records, bucket=CACHE_BUCKET):
+    """按界面的方式逐个预测滤波后的样本，统计预测缓存省掉的推理次数和单次耗时"""
+    stabilizer = make_stabilizer()
+    samples = np.array([stabilizer.smooth(s) for s in StreamParser().feed(b''.join(c for _, c in records))])
+    cached = CachedPredictor(predictor, bucket)
+    start = time.perf_counter()
+    for sample in samples:
+        cached.predict(sample[None, :])
+    cached_us = (time.perf_counter() - start) / len(samples) * 1e6
+    start = time.perf_counter()
+    for sample in samples:
+        predictor.predict(sample[None, :])
+    direct_us = (time.perf_counter() - start) / len(samples) * 1e6
+    return {**cached.stats(), 'samples': len(samples), 'cached_us': cached_us, 'direct_us': direct_us}
+
+
+def bench_pipeline(predictor, mapping, records, count):
+    """解析 -> 滤波 -> 批量推理 -> 表决 的进程内全流程吞吐"""
+    chunks = _chunks(records)
+
+    def run():
+        service = RecognitionService(predictor, mapping)
+        parser = StreamParser()
+        for chunk in chunks:
+            service.process_samples(parser.feed(chunk))
+
+    return _rate(count, run)
+
+
+def bench_serial(records, count, timeout=30.0):
+    """通过伪终端全速回放，测量SerialReader实际采集的样本率"""
+    device = PtyDevice()
+    reader = SerialReader(device.path, 921600)
+    reader.start()
+    try:
+        reader.wait_connected()
+    except TimeoutError:
+        reader.stop()
+        device.close()
+        raise
+    start = time.perf_counter()
+    thread, _ = replay_in_background(records, device, speed=0)
+    deadline = start + timeout
+    while reader.frames < count and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - start
+    received = reader.frames
+    reader.stop()
+    thread.join(1.0)
+    device.close()
+    return {'samples_per_s': received / elapsed, 'received': received, 'sent': count}
+
+
+def bench_devices(predictor, mapping, records, count, device_counts=(1, 2, 4, 8), speed=1.0, timeout=30.0):
+    """N个伪终端按录制速率同时回放，测量DeviceManager汇总推理的总样本率、
+    丢失样本数以及进程CPU占用(相对单核)"""
+    results = {}
+    for n in device_counts:
+        ptys = [PtyDevice() for _ in range(n)]
+        manager = DeviceManager(predictor, mapping)
+        for i, device in enumerate(ptys):
+            manager.add_device(f"glove{i}", device.path, 921600)
+        manager.start()
+        try:
+            for device in manager.devices:
+                device.reader.wait_connected()
+        except TimeoutError:
+            manager.stop()
+            for device in ptys:
+                device.close()
+            raise
+        runner = threading.Thread(target=manager.run, args=(0.002,), daemon=True)
+        runner.start()
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        players = [replay_in_background(records, device, speed)[0] for device in ptys]
+        deadline = start + timeout
+        while (sum(device.reader.frames for device in manager.devices) < n * count
+               and time.perf_counter() < deadline):
+            time.sleep(0.005)
+        manager.stop()
+        runner.join(1.0)
+        manager.tick()
+        elapsed = time.perf_counter() - start
+        results[n] = {
+            'samples_per_s': manager.predicted / elapsed,
+            'dropped': n * count - manager.predicted,
+            'cpu': (time.process_time() - cpu_start) / elapsed,
+        }
+        for player in players:
+            player.join(1.0)
+        for device in ptys:
+            device.close()
+    return results
+
+
+# 在新进程中加载模型并完成第一次推理
+_COLD_START_SCRIPT = {
+    'npz': "from network import load_artifact; m = load_artifact({path!r})[0]; m.predict([[331, 303, 479, 959]])",
+    'joblib': "from network import load_model, FastPredictor; "
+              "m = FastPredictor(load_model({path!r})); m.predict([[331, 303, 479, 959]])",
+}
+
+
+def bench_cold_start(model, mapping, repeat=3):
+    """分别用.npz和joblib模型文件启动新解释器，测量到第一次推理完成的耗时(毫秒)"""
+    results = {}
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {'npz': os.path.join(tmp, 'model.npz'), 'joblib': os.path.join(tmp, 'model.joblib')}
+        save_artifact(model, mapping, paths['npz'])
+        save_model(model, paths['joblib'])
+        for fmt, path in paths.items():
+            code = _COLD_START_SCRIPT[fmt].format(path=path)
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, '-c', code], cwd=here, check=True)
+                best = min(best, time.perf_counter() - start)
+            results[fmt] = best * 1000
+    return results
+
+
+def run_all(seconds=200.0, rate=100.0):
+    model, mapping = train_model()
+    mapping = {str(k): v for k, v in mapping.items()}
+    predictor = FastPredictor(model)
+    text_records, _ = synthesize(seconds, rate, fmt='text')
+    binary_records, _ = synthesize(seconds, rate, fmt='binary')
+    count = len(text_records)
+    parsed = np.array(StreamParser().feed(b''.join(c for _, c in text_records)), dtype=np.float64)
+
+    predict = bench_predict(predictor, parsed)
+    downlink = bench_downlink(parsed.astype(int))
+    serial_result = bench_serial(binary_records, count)
+    cold_start = bench_cold_start(model, mapping)
+    # 每只手套1000Hz实时回放5秒
+    device_records, _ = synthesize(5, 1000, fmt='binary')
+    devices = bench_devices(predictor, mapping, device_records, len(device_records))
+    cache = bench_cache(predictor, text_records)
+    return {
+        'parse_text_samples_per_s': bench_parse(text_records, count),
+        'parse_binary_samples_per_s': bench_parse(binary_records, count),
+        'predict_single_per_s': predict['single'],
+        'predict_batch_per_s': predict['batch'],
+        'downlink_frames_per_s': downlink['single'],
+        'downlink_batch_frames_per_s': downlink['batch'],
+        'pipeline_samples_per_s': bench_pipeline(predictor, mapping, binary_records, count),
+        'serial_samples_per_s': serial_result['samples_per_s'],
+        'serial_dropped': serial_result['sent'] - serial_result['received'],
+        **{f'devices_{n}_samples_per_s': r['samples_per_s'] for n, r in devices.items()},
+        **{f'devices_{n}_dropped': r['dropped'] for n, r in devices.items()},
+        **{f'devices_{n}_cpu': r['cpu'] for n, r in devices.items()},
+        'cache_hit_rate': cache['hit_rate'],
+        'cache_predictions_saved': cache['hits'],
+        'cold_start_npz_ms': cold_start['npz'],
+        'cold_start_joblib_ms': cold_start['joblib'],
+    }
+
+
+def compare(results, baseline, tolerance):
+    """与基线比较，返回吞吐下降或耗时(_ms)增加超过tolerance的指标"""
+    regressions = []
+    for key, base in baseline.items():
+        if key not in results:
+            continue
+        if key.endswith('_per_s') and results[key] < base * (1 - tolerance):
+            regressions.append((key, base, results[key]))
+        elif key.endswith('_ms') and results[key] > base * (1 + tolerance):
+            regressions.append((key, base, results[key]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="无硬件的全流程吞吐基准")
+    parser.add_argument('--seconds', type=float, default=200, help="合成会话时长(秒)")
+    parser.add_argument('--rate', type=float, default=100, help="合成样本率(Hz)")
+    parser.add_argument('--json', help="把结果写入JSON文件")
+    parser.add_argument('--baseline', help="与基线JSON比较，吞吐下降超过容差时返回非0")
+    parser.add_argument('--tolerance', type=float, default=0.3)
+    parser.add_argument('--cache-recording', help="只统计该录制文件上预测缓存省掉的推理次数")
+    parser.add_argument('--cache-bucket', type=int, default=CACHE_BUCKET)
+    args = parser.parse_args()
+
+    if args.cache_recording:
+        model, _ = train_model()
+        cache = bench_cache(FastPredictor(model), read_recording(args.cache_recording), args.cache_bucket)
+        print(f"样本 {cache['samples']}, 命中 {cache['hits']} ({cache['hit_rate']:.1%}), "
+              f"实际推理 {cache['misses']} 次; 每次预测 {cache['cached_us']:.1f}us (无缓存 {cache['direct_us']:.1f}us)")
+        return
+
+    results = run_all(args.seconds, args.rate)
+    for key, value in results.items():
+        if isinstance(value, int):
+            print(f"{key:<30}{value:>14}")
+        else:
+            print(f"{key:<30}{value:>14.{3 if abs(value) < 10 else 0}f}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for key, base, value in regressions:
+            print(f"性能回退: {key} {base:.0f} -> {value:.0f}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
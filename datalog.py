@@ -0,0 +1,375 @@
+import argparse
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+import numpy as np
+
+# 日志文件格式：文件头 + 若干长度前缀的数据块（小端序）
+#   文件头: b'GLVLOG1\0'
+#   数据块: uint32 类型 + uint32 数据长度 + 数据
+#     CHUNK_DEVICE:   uint8 设备编号 + UTF-8设备名（每个文件中设备首次出现时写入）
+#     CHUNK_SAMPLES:  SAMPLE_LOG_DTYPE 定长记录数组（原始传感器样本）
+#     CHUNK_GESTURES: GESTURE_LOG_DTYPE 定长记录数组（稳定手势事件）
+#     CHUNK_SENTENCE: uint64 时间(ns) + UTF-8文本（保存的手势序列）
+# 定长记录块可以直接在内存映射上用np.frombuffer读取，不需要逐条解析。
+LOG_MAGIC = b'GLVLOG1\0'
+CHUNK_HEADER = struct.Struct('<II')
+CHUNK_DEVICE, CHUNK_SAMPLES, CHUNK_GESTURES, CHUNK_SENTENCE = 1, 2, 3, 4
+SENTENCE_HEADER = struct.Struct('<Q')
+
+# 时间均为time.time_ns()墙上时间，便于跨进程、跨天对齐
+SAMPLE_LOG_DTYPE = np.dtype([('t_ns', '<u8'), ('device', 'u1'), ('x', '<u2', (4,))])
+GESTURE_LOG_DTYPE = np.dtype([('t_ns', '<u8'), ('device', 'u1'), ('gesture', '<i2'),
+                              ('confidence', '<f4'), ('x', '<u2', (4,))])
+
+LOG_DIR = 'logs'
+FLUSH_BYTES = 64 * 1024  # 缓冲数据达到该大小时写盘
+FLUSH_INTERVAL = 1.0  # 最长写盘间隔(秒)
+ROTATE_BYTES = 64 * 1024 * 1024  # 单个日志文件达到该大小后切换新文件
+POLL_INTERVAL = 0.2  # 从串口环形缓冲区取原始样本的周期(秒)，需小于 缓冲区容量/样本率
+
+
+class LogWriter(threading.Thread):
+    """后台日志线程：批量写入识别事件和原始样本，按大小/时间写盘并按大小轮转文件
+
+    记录方法只把数据放入队列，不做文件I/O，可以在识别线程或界面线程中调用。
+    原始样本由本线程定期从attach_reader注册的串口环形缓冲区中取走，
+    采集线程不需要做任何额外工作。
+    """
+
+    def __init__(self, directory=LOG_DIR, prefix='glove', flush_bytes=FLUSH_BYTES,
+                 flush_interval=FLUSH_INTERVAL, rotate_bytes=ROTATE_BYTES, max_files=0):
+        super().__init__(name="LogWriter", daemon=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.rotate_bytes = rotate_bytes
+        self.max_files = max_files  # 最多保留的日志文件数，0表示全部保留
+        self._jobs = queue.Queue()
+        self._devices = {}  # 设备名 -> 编号
+        self._devices_lock = threading.Lock()
+        self._readers = []  # [(reader, 设备编号, 已取走的序号)]
+        self._samples = []
+        self._gestures = []
+        self._sentences = []
+        self._pending = 0  # 缓冲中的字节数
+        self._file = None
+        self._file_devices = set()  # 当前文件中已写入CHUNK_DEVICE的设备
+        # perf_counter -> 墙上时间 的换算偏移
+        self._clock_offset_ns = time.time_ns() - time.perf_counter_ns()
+        self.files = 0
+        self.bytes = 0
+        self.samples = 0
+        self.gestures = 0
+        self.dropped = 0  # 轮询不及时被环形缓冲区覆盖的原始样本数
+
+    def device_id(self, name):
+        with self._devices_lock:
+            if name not in self._devices:
+                if len(self._devices) >= 256:
+                    raise ValueError("最多支持256个设备")
+                self._devices[name] = len(self._devices)
+            return self._devices[name]
+
+    def attach_reader(self, reader, device='glove0'):
+        """记录该SerialReader/SensorRingBuffer此后采集到的全部原始样本"""
+        self._jobs.put(('reader', reader, self.device_id(device)))
+
+    def log_samples(self, samples, stamps=None, device='glove0'):
+        """记录一批原始样本，stamps为到达时间(perf_counter秒)，为None时取当前时间"""
+        self._jobs.put(('samples', np.asarray(samples), stamps, self.device_id(device)))
+
+    def log_event(self, event):
+        """记录一个识别事件，可直接作为RecognitionService/DeviceManager的订阅者"""
+        self._jobs.put(('gesture', time.time_ns(), event))
+
+    def log_sentence(self, text):
+        """记录一条保存的手势序列"""
+        self._jobs.put(('sentence', time.time_ns(), text))
+
+    def flush(self, timeout=2.0):
+        """把已记录的数据写盘，阻塞到写入完成"""
+        done = threading.Event()
+        self._jobs.put(('flush', done))
+        return done.wait(timeout)
+
+    def stop(self, timeout=2.0):
+        self._jobs.put(None)
+        if self.is_alive():
+            self.join(timeout)
+
+    def _to_wall_ns(self, stamps):
+        return (np.asarray(stamps, dtype=np.float64) * 1e9).astype(np.int64) + self._clock_offset_ns
+
+    def _buffer_samples(self, samples, stamps, device):
+        if not len(samples):
+            return
+        records = np.zeros(len(samples), dtype=SAMPLE_LOG_DTYPE)
+        records['t_ns'] = self._to_wall_ns(stamps) if stamps is not None else time.time_ns()
+        records['device'] = device
+        records['x'] = np.clip(np.rint(samples), 0, 65535)
+        self._samples.append(records)
+        self._pending += records.nbytes
+
+    def _buffer_gesture(self, t_ns, event):
+        record = np.zeros(1, dtype=GESTURE_LOG_DTYPE)
+        record['t_ns'] = int(event['time'] * 1e9) if 'time' in event else t_ns
+        record['device'] = self.device_id(event.get('device', 'glove0'))
+        record['gesture'] = event['gesture_id']
+        record['confidence'] = event.get('confidence', np.nan)
+        if 'sample' in event:
+            record['x'] = np.clip(np.rint(event['sample']), 0, 65535)
+        self._gestures.append(record)
+        self._pending += record.nbytes
+
+    def _poll_readers(self):
+        for i, (reader, device, seq) in enumerate(self._readers):
+            samples, stamps, count = reader.since(seq)
+            self.dropped += count - seq - len(samples)
+            self._readers[i] = (reader, device, count)
+            self._buffer_samples(samples, stamps, device)
+
+    def _handle(self, job):
+        kind = job[0]
+        if kind == 'samples':
+            self._buffer_samples(*job[1:])
+        elif kind == 'gesture':
+            self._buffer_gesture(*job[1:])
+        elif kind == 'sentence':
+            _, t_ns, text = job
+            self._sentences.append(SENTENCE_HEADER.pack(t_ns) + text.encode('utf-8'))
+            self._pending += len(self._sentences[-1])
+        elif kind == 'reader':
+            _, reader, device = job
+            buffer = getattr(reader, 'buffer', reader)
+            self._readers.append((reader, device, buffer.count))
+        elif kind == 'flush':
+            self._poll_readers()
+            self._write_pending()
+            job[1].set()
+
+    def _open_file(self):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(self.directory, f"{self.prefix}-{stamp}-{self.files:04d}.glog")
+        self._file = open(path, 'wb')
+        self._file.write(LOG_MAGIC)
+        self._file_devices = set()
+        self.files += 1
+        if self.max_files:
+            for old in list_logs(self.directory, self.prefix)[:-self.max_files]:
+                os.remove(old)
+
+    def _write_chunk(self, kind, payload):
+        self._file.write(CHUNK_HEADER.pack(kind, len(payload)))
+        self._file.write(payload)
+        self.bytes += CHUNK_HEADER.size + len(payload)
+
+    def _write_pending(self):
+        if not self._pending:
+            return
+        if self._file is None or self._file.tell() >= self.rotate_bytes:
+            if self._file is not None:
+                self._file.close()
+            self._open_file()
+        # 设备名先于引用它的记录写入，每个文件都可以单独读取
+        with self._devices_lock:
+            devices = list(self._devices.items())
+        for name, device in devices:
+            if device not in self._file_devices:
+                self._write_chunk(CHUNK_DEVICE, bytes([device]) + name.encode('utf-8'))
+                self._file_devices.add(device)
+        if self._samples:
+            records = np.concatenate(self._samples)
+            self._write_chunk(CHUNK_SAMPLES, records.tobytes())
+            self.samples += len(records)
+        if self._gestures:
+            records = np.concatenate(self._gestures)
+            self._write_chunk(CHUNK_GESTURES, records.tobytes())
+            self.gestures += len(records)
+        for payload in self._sentences:
+            self._write_chunk(CHUNK_SENTENCE, payload)
+        self._file.flush()
+        self._samples, self._gestures, self._sentences = [], [], []
+        self._pending = 0
+
+    def run(self):
+        last_flush = last_poll = time.monotonic()
+        while True:
+            timeout = min(POLL_INTERVAL, self.flush_interval) if self._readers else self.flush_interval
+            try:
+                job = self._jobs.get(timeout=timeout)
+            except queue.Empty:
+                job = ()
+            if job is None:
+                break
+            try:
+                if job:
+                    self._handle(job)
+                now = time.monotonic()
+                if self._readers and now - last_poll >= POLL_INTERVAL:
+                    self._poll_readers()
+                    last_poll = now
+                if self._pending >= self.flush_bytes or now - last_flush >= self.flush_interval:
+                    self._write_pending()
+                    last_flush = now
+            except Exception as e:
+                print(f"写入日志失败: {str(e)}")
+        # 退出前处理队列中剩余的记录并写盘
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job:
+                self._handle(job)
+        self._poll_readers()
+        self._write_pending()
+        if self._file is not None:
+            self._file.close()
+
+
+class LogReader:
+    """以内存映射方式读取日志文件，定长记录块直接映射为NumPy结构化数组"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        if os.path.getsize(path) <= len(LOG_MAGIC):
+            # 空文件无法映射，且没有任何数据块
+            self._map = self._file.read()
+        else:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(LOG_MAGIC)] != LOG_MAGIC:
+            self.close()
+            raise ValueError(f"不是日志文件: {path}")
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            try:
+                self._map.close()
+            except BufferError:
+                # samples()/gestures()返回的数组仍引用映射内存：只释放这里的引用，
+                # 映射在这些数组被回收后自动关闭
+                pass
+        self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def chunks(self):
+        """依次返回 (类型, 数据的memoryview)；文件末尾写到一半的数据块被忽略"""
+        view = memoryview(self._map)
+        pos = len(LOG_MAGIC)
+        while pos + CHUNK_HEADER.size <= len(view):
+            kind, length = CHUNK_HEADER.unpack_from(view, pos)
+            pos += CHUNK_HEADER.size
+            if pos + length > len(view):
+                break
+            yield kind, view[pos:pos + length]
+            pos += length
+
+    def devices(self):
+        """返回 {设备编号: 设备名}"""
+        return {bytes(payload[:1])[0]: bytes(payload[1:]).decode('utf-8')
+                for kind, payload in self.chunks() if kind == CHUNK_DEVICE}
+
+    def _records(self, chunk_kind, dtype):
+        parts = [np.frombuffer(payload, dtype=dtype)
+                 for kind, payload in self.chunks() if kind == chunk_kind]
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    def samples(self):
+        """原始样本记录数组（只有一个数据块时直接引用映射内存，不复制；
+        关闭读取器后数组仍然有效）"""
+        return self._records(CHUNK_SAMPLES, SAMPLE_LOG_DTYPE)
+
+    def gestures(self):
+        return self._records(CHUNK_GESTURES, GESTURE_LOG_DTYPE)
+
+    def sentences(self):
+        """返回 [(时间ns, 文本)]"""
+        return [(SENTENCE_HEADER.unpack_from(payload)[0],
+                 bytes(payload[SENTENCE_HEADER.size:]).decode('utf-8'))
+                for kind, payload in self.chunks() if kind == CHUNK_SENTENCE]
+
+
+def list_logs(directory=LOG_DIR, prefix='glove'):
+    """按写入先后返回目录中的日志文件"""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.startswith(prefix + '-') and name.endswith('.glog'))
+
+
+def load_logs(paths):
+    """合并多个日志文件，返回 (样本记录, 手势记录, 保存的序列)；
+    设备编号按设备名统一，不同文件中同名设备编号相同"""
+    samples, gestures, sentences = [], [], []
+    names = {}
+    for path in paths:
+        with LogReader(path) as reader:
+            remap = np.arange(256, dtype=np.uint8)
+            for device, name in reader.devices().items():
+                remap[device] = names.setdefault(name, len(names))
+            for part, target in ((reader.samples(), samples), (reader.gestures(), gestures)):
+                part = part.copy()  # 关闭映射前复制
+                part['device'] = remap[part['device']]
+                target.append(part)
+            sentences.extend(reader.sentences())
+    samples = np.concatenate(samples) if samples else np.empty(0, dtype=SAMPLE_LOG_DTYPE)
+    gestures = np.concatenate(gestures) if gestures else np.empty(0, dtype=GESTURE_LOG_DTYPE)
+    return samples, gestures, sentences
+
+
+def labeled_samples(gestures, min_confidence=0.9):
+    """从手势记录中取出置信度足够高的样本作为伪标注训练数据，返回 (X[n, 4], y[n])；
+    没有置信度(NaN)的记录不使用"""
+    keep = gestures['confidence'] >= min_confidence
+    return gestures['x'][keep].astype(np.float64), gestures['gesture'][keep].astype(int)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="查看识别日志，或导出为训练样本")
+    parser.add_argument('paths', nargs='*', help="日志文件，默认读取日志目录下的全部文件")
+    parser.add_argument('--dir', default=LOG_DIR, help="日志目录")
+    parser.add_argument('--export-samples', help="把高置信度手势样本追加到该样本文件(供online.py重训)")
+    parser.add_argument('--min-confidence', type=float, default=0.9)
+    args = parser.parse_args()
+
+    paths = args.paths or list_logs(args.dir)
+    start = time.perf_counter()
+    samples, gestures, sentences = load_logs(paths)
+    elapsed = time.perf_counter() - start
+    print(f"{len(paths)} 个文件: 原始样本 {len(samples)}, 手势事件 {len(gestures)}, "
+          f"保存的序列 {len(sentences)} (读取 {elapsed * 1000:.1f}ms)")
+    if len(samples):
+        span = (samples['t_ns'].max() - samples['t_ns'].min()) / 1e9
+        print(f"原始样本时间跨度 {span:.1f}s，平均 {len(samples) / max(span, 1e-9):.1f} 样本/秒")
+    if len(gestures):
+        ids, counts = np.unique(gestures['gesture'], return_counts=True)
+        print("手势统计: " + ", ".join(f"{g}x{c}" for g, c in zip(ids, counts)))
+    for t_ns, text in sentences[-5:]:
+        print(f"  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(t_ns / 1e9))}  {text}")
+
+    if args.export_samples:
+        from online import SampleStore
+        X, y = labeled_samples(gestures, args.min_confidence)
+        store = SampleStore(args.export_samples)
+        for label in np.unique(y):
+            store.append(X[y == label], label)
+        print(f"已导出 {len(y)} 个样本到 {args.export_samples}")
+
+
+if __name__ == "__main__":
+    main()
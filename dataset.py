@@ -0,0 +1,214 @@
+import argparse
+import os
+import time
+import warnings
+import numpy as np
+from network import get_features_and_labels, load_sign_mapping
+from online import SAMPLE_DTYPE, SampleStore
+from protocol import ADC_MAX
+
+DATASET_FILE = 'dataset.bin'
+CHUNK = 65536  # 每次生成/写入的样本数，内存占用与数据集大小无关
+BATCH_SIZE = 256
+SHUFFLE_BLOCK = 65536  # 读取时在块内打乱，块按随机顺序读取
+
+# 增强参数（单位为ADC值）
+GAIN_STD = 0.03  # 每通道增益漂移
+OFFSET_STD = 10.0  # 每通道零点漂移
+JITTER_STD = 6.0  # 逐样本高斯抖动
+DROPOUT_PROB = 0.02  # 单个通道读数为0（传感器断线）的概率
+INTERPOLATE_PROB = 0.5  # 与同类另一姿态插值的样本比例
+
+
+def augment(X, y, n, rng):
+    """从原始样本 (X, y) 中按类别均衡抽取n个并做增强，返回 (X[n, 4] 浮点, y[n])
+
+    全部操作都是整块NumPy运算：同类姿态间插值、每通道增益/零点漂移、
+    高斯抖动、通道掉线，最后裁剪到ADC范围。
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    classes, inverse = np.unique(y, return_inverse=True)
+    # 按类别分组的索引：order中同类样本连续，starts/counts给出每类的区间
+    order = np.argsort(inverse, kind='stable')
+    counts = np.bincount(inverse)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    label_idx = rng.integers(len(classes), size=n)
+    a = order[starts[label_idx] + rng.integers(counts[label_idx])]
+    b = order[starts[label_idx] + rng.integers(counts[label_idx])]
+    t = rng.random((n, 1)) * (rng.random((n, 1)) < INTERPOLATE_PROB)
+    out = X[a] + t * (X[b] - X[a])
+
+    channels = X.shape[1]
+    out *= rng.normal(1.0, GAIN_STD, (n, channels))
+    out += rng.normal(0.0, OFFSET_STD, (n, channels))
+    out += rng.normal(0.0, JITTER_STD, (n, channels))
+    out[rng.random((n, channels)) < DROPOUT_PROB] = 0.0
+    np.clip(out, 0, ADC_MAX, out=out)
+    return out, classes[label_idx]
+
+
+def sign_mapping_for(y, mapping_path='sign_mapping.json'):
+    """内置手势名称加上标定时写入mapping_path的名称（与ModelHolder/Calibrator同一映射），
+    返回覆盖y中全部编号的映射；有编号找不到名称时返回 (None, 缺失编号)"""
+    _, _, sign_names = get_features_and_labels()
+    mapping = {str(k): v for k, v in sign_names.items()}
+    if mapping_path and os.path.exists(mapping_path):
+        mapping.update(load_sign_mapping(mapping_path))
+    missing = sorted(int(label) for label in np.unique(y) if str(int(label)) not in mapping)
+    if missing:
+        return None, missing
+    return mapping, []
+
+
+def load_sources(sample_files=(), log_dir=None, min_confidence=0.9):
+    """合并内置数据、标定样本文件和识别日志中的高置信度样本，返回 (X, y)"""
+    X, y, _ = get_features_and_labels()
+    parts_X, parts_y = [X.astype(np.float64)], [y]
+    for path in sample_files:
+        extra_X, extra_y = SampleStore(path).load()
+        parts_X.append(extra_X)
+        parts_y.append(extra_y)
+    if log_dir:
+        from datalog import list_logs, load_logs, labeled_samples
+        _, gestures, _ = load_logs(list_logs(log_dir))
+        log_X, log_y = labeled_samples(gestures, min_confidence)
+        parts_X.append(log_X)
+        parts_y.append(log_y)
+    return np.vstack(parts_X), np.concatenate(parts_y)
+
+
+def build_dataset(X, y, path=DATASET_FILE, size=1_000_000, seed=0, chunk=CHUNK):
+    """分块生成增强样本并写入内存映射文件（与SampleStore相同的定长记录格式），
+    返回 {'samples', 'augment_s', 'write_s'}"""
+    rng = np.random.default_rng(seed)
+    data = np.memmap(path, dtype=SAMPLE_DTYPE, mode='w+', shape=(size,))
+    augment_s = write_s = 0.0
+    for start in range(0, size, chunk):
+        n = min(chunk, size - start)
+        t0 = time.perf_counter()
+        samples, labels = augment(X, y, n, rng)
+        t1 = time.perf_counter()
+        block = data[start:start + n]
+        block['x'] = np.rint(samples)
+        block['label'] = labels
+        write_s += time.perf_counter() - t1
+        augment_s += t1 - t0
+    t0 = time.perf_counter()
+    data.flush()
+    del data
+    write_s += time.perf_counter() - t0
+    return {'samples': size, 'augment_s': augment_s, 'write_s': write_s}
+
+
+def open_dataset(path=DATASET_FILE):
+    """以只读内存映射打开数据集，返回定长记录数组（不读入内存）"""
+    return np.memmap(path, dtype=SAMPLE_DTYPE, mode='r')
+
+
+def iter_minibatches(data, batch_size=BATCH_SIZE, rng=None, block=SHUFFLE_BLOCK):
+    """从内存映射数据集依次产出 (X[batch, 4] 浮点, y[batch])
+
+    随机顺序读取连续的块并在块内打乱：每次只有一个块在内存中，
+    读取仍是顺序I/O。生成时样本已随机排列，块内打乱足以打散顺序。
+    """
+    starts = np.arange(0, len(data), block)
+    if rng is not None:
+        rng.shuffle(starts)
+    for start in starts:
+        records = np.array(data[start:start + block])
+        if rng is not None:
+            rng.shuffle(records)
+        X = records['x'].astype(np.float64)
+        y = records['label'].astype(int)
+        for i in range(0, len(records), batch_size):
+            yield X[i:i + batch_size], y[i:i + batch_size]
+
+
+def train_streaming(data, epochs=1, batch_size=BATCH_SIZE, hidden_layer_sizes=(64, 32), seed=0):
+    """在内存映射数据集上流式训练 StandardScaler + MLP 管道（可直接用于FastPredictor/save_artifact）
+
+    第一遍用partial_fit累计均值和方差，之后每个minibatch做一次MLP的partial_fit。
+    返回 (管道, 统计信息)。
+    """
+    from sklearn.neural_network import MLPClassifier
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.pipeline import make_pipeline
+
+    start = time.perf_counter()
+    scaler = StandardScaler()
+    labels = set()
+    for X, y in iter_minibatches(data, 65536):
+        scaler.partial_fit(X)
+        labels.update(np.unique(y).tolist())
+    classes = np.array(sorted(labels))
+    scaler_s = time.perf_counter() - start
+
+    mlp = MLPClassifier(hidden_layer_sizes=hidden_layer_sizes, activation='relu', solver='adam',
+                        batch_size=batch_size, random_state=seed)
+    rng = np.random.default_rng(seed)
+    batches = 0
+    with warnings.catch_warnings():
+        # partial_fit每次只迭代一次，不需要收敛警告
+        warnings.simplefilter('ignore')
+        for _ in range(epochs):
+            for X, y in iter_minibatches(data, batch_size, rng):
+                mlp.partial_fit(scaler.transform(X), y, classes=classes)
+                batches += 1
+    elapsed = time.perf_counter() - start
+    return make_pipeline(scaler, mlp), {
+        'epochs': epochs,
+        'batches': batches,
+        'train_s': elapsed,
+        'scaler_s': scaler_s,
+        'train_samples_per_s': epochs * len(data) / (elapsed - scaler_s),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="增强数据集生成与流式训练")
+    parser.add_argument('--size', type=int, default=1_000_000, help="生成的样本数")
+    parser.add_argument('-o', '--output', default=DATASET_FILE, help="数据集文件")
+    parser.add_argument('--samples', nargs='*', default=[], help="标定样本文件（samples.bin格式）")
+    parser.add_argument('--log-dir', help="同时使用该目录下识别日志中的高置信度样本")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--train', action='store_true', help="生成后在数据集上流式训练")
+    parser.add_argument('--epochs', type=int, default=1)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--model-output', help="把训练好的模型保存为.npz")
+    parser.add_argument('--mapping', default='sign_mapping.json', help="标定新增手势的名称映射")
+    args = parser.parse_args()
+
+    X, y = load_sources(args.samples, args.log_dir)
+    print(f"原始样本 {len(y)} 个, {len(np.unique(y))} 个手势")
+    if args.model_output:
+        # 训练前检查，避免训练完才发现无法保存
+        sign_mapping, missing = sign_mapping_for(y, args.mapping)
+        if sign_mapping is None:
+            parser.error(f"手势编号 {missing} 在 {args.mapping} 中没有名称，无法保存模型")
+    stats = build_dataset(X, y, args.output, args.size, args.seed)
+    mb = os.path.getsize(args.output) / 1e6
+    print(f"生成 {stats['samples']} 个增强样本 ({mb:.1f}MB): 增强 {stats['samples'] / stats['augment_s']:,.0f} 样本/秒, "
+          f"写入 {stats['samples'] / stats['write_s']:,.0f} 样本/秒")
+    if not args.train:
+        return
+
+    data = open_dataset(args.output)
+    model, report = train_streaming(data, args.epochs, args.batch_size, seed=args.seed)
+    print(f"流式训练 {report['epochs']} 轮 {report['batches']} 个minibatch: 用时 {report['train_s']:.1f}s "
+          f"(标准化统计 {report['scaler_s']:.1f}s), {report['train_samples_per_s']:,.0f} 样本/秒")
+
+    # 与只在原始样本上训练的模型比较：在另一批增强样本上评估泛化能力
+    from network import FastPredictor, save_artifact, train_model
+    noisy_X, noisy_y = augment(X, y, 20000, np.random.default_rng(args.seed + 1))
+    for name, predictor in (("原始样本训练", FastPredictor(train_model(X, y)[0])), ("增强数据训练", FastPredictor(model))):
+        print(f"{name}: 原始样本准确率 {np.mean(predictor.predict(X) == y):.3f}, "
+              f"新增强样本准确率 {np.mean(predictor.predict(noisy_X) == noisy_y):.3f}")
+    if args.model_output:
+        save_artifact(model, sign_mapping, args.model_output, X, y, meta={'dataset': args.output})
+        print(f"模型已保存: {args.model_output}")
+
+
+if __name__ == "__main__":
+    main()
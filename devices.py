@@ -0,0 +1,205 @@
+import argparse
+import json
+import sys
+import threading
+import time
+import numpy as np
+from sensor_stream import SerialReader
+from scheduler import PeriodicSender
+from protocol import DownlinkEncoder
+from filters import make_stabilizer
+from latency import tracker
+from network import UNKNOWN, REJECT_THRESHOLD, CACHE_BUCKET, CentroidPredictor
+
+BAUD_RATE = 9600
+STALE_TIMEOUT = 0.5  # 超过该时间(秒)未更新的样本不参与分类
+TICK_INTERVAL = 0.02  # 汇总推理周期(秒)
+TRAIN_TIMEOUT = 300.0  # 没有可用模型文件时等待后台训练的最长时间(秒)
+
+
+class Device:
+    """一只手套：独立的串口采集线程、滤波/表决状态和舵机下发线程"""
+
+    def __init__(self, name, port, baud_rate=BAUD_RATE, stabilizer=None, send_interval=None,
+                 open_serial=None):
+        self.name = name
+        self.reader = SerialReader(port, baud_rate, open_serial=open_serial)
+        self.stabilizer = stabilizer if stabilizer is not None else make_stabilizer()
+        self.encoder = DownlinkEncoder()
+        self.sender = PeriodicSender(send_interval, self.send, f"Sender-{name}") if send_interval else None
+        self.last_seq = 0  # 已取走的最后一个样本序号
+        self.samples = 0
+
+    def start(self):
+        self.reader.start()
+        if self.sender is not None:
+            self.sender.start()
+
+    def stop(self):
+        if self.sender is not None:
+            self.sender.stop()
+        self.reader.stop()
+
+    def take_new(self, now=None):
+        """取走上次调用以来的新样本并逐个滤波，返回 (滤波后样本[n, 4], 到达时间[n])"""
+        samples, stamps, self.last_seq = self.reader.since(self.last_seq)
+        if now is None:
+            now = time.perf_counter()
+        fresh = stamps >= now - STALE_TIMEOUT
+        samples, stamps = samples[fresh], stamps[fresh]
+        self.samples += len(samples)
+        smoothed = np.empty(samples.shape, dtype=np.float64)
+        for i, sample in enumerate(samples):
+            smoothed[i] = self.stabilizer.smooth(sample)
+        return smoothed, stamps
+
+    def send(self):
+        """向本设备下发最新样本，由该设备的周期发送线程调用"""
+        ser = self.reader.ser
+        latest = self.reader.latest(STALE_TIMEOUT)
+        if ser is None or latest is None:
+            return
+        write_start = time.perf_counter_ns()
+        ser.write(self.encoder.encode(latest[0]))
+        tracker.record_since('write', write_start)
+
+
+class DeviceManager:
+    """同时管理多只手套：各设备独立采集，每个周期把所有设备的新样本
+    合并成一个批次做一次向量化推理，再按设备分别表决"""
+
+    def __init__(self, model, sign_mapping):
+        self.model = model
+        self.sign_mapping = sign_mapping
+        self.devices = []
+        self.subscribers = []
+        self.ticks = 0
+        self.predicted = 0
+        self._stop_event = threading.Event()
+
+    def add_device(self, name, port, baud_rate=BAUD_RATE, **options):
+        device = Device(name, port, baud_rate, **options)
+        self.devices.append(device)
+        return device
+
+    def subscribe(self, callback):
+        """注册订阅者：callback(event)，event与RecognitionService的事件相同，另含device字段"""
+        self.subscribers.append(callback)
+        return callback
+
+    def start(self):
+        for device in self.devices:
+            device.start()
+
+    def stop(self):
+        self._stop_event.set()
+        for device in self.devices:
+            device.stop()
+
+    def tick(self):
+        """处理所有设备的新样本，返回本周期产生的稳定手势事件"""
+        now = time.perf_counter()
+        batches = [device.take_new(now) for device in self.devices]
+        counts = [len(samples) for samples, _ in batches]
+        self.ticks += 1
+        if not any(counts):
+            return []
+        predict_start = time.perf_counter_ns()
+        labels = self.model.predict(np.concatenate([samples for samples, _ in batches]))
+        tracker.record_since('predict', predict_start)
+        self.predicted += len(labels)
+
+        events = []
+        offset = 0
+        for device, (samples, stamps), n in zip(self.devices, batches, counts):
+            for i in range(n):
+                gesture_id = device.stabilizer.update(labels[offset + i])
+                if gesture_id is None or gesture_id == UNKNOWN:
+                    continue
+                gesture_id = int(gesture_id)
+                events.append({
+                    'time': time.time(),
+                    'device': device.name,
+                    'gesture_id': gesture_id,
+                    'gesture': self.sign_mapping.get(str(gesture_id), f"未知手势({gesture_id})"),
+                    'sample': [int(round(v)) for v in samples[i]],
+                })
+                tracker.record('end_to_end', (time.perf_counter() - stamps[i]) * 1e9)
+            offset += n
+        for event in events:
+            for callback in self.subscribers:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"订阅者处理事件失败: {str(e)}", file=sys.stderr)
+        return events
+
+    def run(self, interval=TICK_INTERVAL):
+        """按固定周期汇总推理，直到stop()"""
+        deadline = time.monotonic()
+        while not self._stop_event.is_set():
+            self.tick()
+            deadline += interval
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            else:
+                deadline = time.monotonic()
+
+
+def main():
+    from online import start_online_learning, build_recognizer
+
+    parser = argparse.ArgumentParser(description="多手套并发采集与识别")
+    parser.add_argument('ports', nargs='+', help="串口设备或pyserial URL，可写成 名称=端口")
+    parser.add_argument('--baud', type=int, default=BAUD_RATE)
+    parser.add_argument('--send-interval', type=float, default=0.8, help="舵机下发周期(秒)，0表示不下发")
+    parser.add_argument('--tick', type=float, default=TICK_INTERVAL, help="汇总推理周期(秒)")
+    parser.add_argument('--log-dir', help="把识别事件批量写入该目录下的轮转日志(datalog.py)")
+    parser.add_argument('--log-raw', action='store_true', help="日志中同时记录各设备的全部原始样本")
+    parser.add_argument('--reject-threshold', type=float, default=REJECT_THRESHOLD,
+                        help="置信度低于该值时拒识，0表示关闭拒识和预检")
+    parser.add_argument('--cache-bucket', type=int, default=CACHE_BUCKET,
+                        help="预测缓存的ADC量化步长，0表示不使用缓存")
+    args = parser.parse_args()
+
+    # 与main.py相同：加载模型并启动后台训练；模型文件缺失或过期时先等待训练完成，
+    # 避免整个运行期间都用后备的类中心模型识别、统计
+    holder, store, trainer = start_online_learning('model.npz', 'sign_mapping.json')
+    trained = threading.Event()
+    holder.add_listener(lambda _: trained.set())
+    if isinstance(holder.model, CentroidPredictor):
+        print("等待后台训练出模型...", file=sys.stderr)
+        if not trained.wait(TRAIN_TIMEOUT):
+            print("后台训练超时，使用后备模型", file=sys.stderr)
+    sign_mapping = holder.sign_mapping
+    recognizer, _ = build_recognizer(holder, store, args.reject_threshold, args.cache_bucket)
+    manager = DeviceManager(recognizer, sign_mapping)
+    for i, spec in enumerate(args.ports):
+        name, _, port = spec.rpartition('=')
+        manager.add_device(name or f"glove{i}", port, args.baud, send_interval=args.send_interval or None)
+    manager.subscribe(lambda event: print(json.dumps(event, ensure_ascii=False), flush=True))
+    logger = None
+    if args.log_dir:
+        from datalog import LogWriter
+        logger = LogWriter(args.log_dir)
+        manager.subscribe(logger.log_event)
+        if args.log_raw:
+            for device in manager.devices:
+                logger.attach_reader(device.reader, device.name)
+        logger.start()
+    manager.start()
+    try:
+        manager.run(args.tick)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.stop()
+        trainer.stop()
+        if logger is not None:
+            logger.stop()
+    print(tracker.format_report(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import numpy as np
+from network import (load_model, train_model, get_features_and_labels, fold_scaler, quantize_model,
+                     FastPredictor, RejectingPredictor, format_calibration)
+
+HEADER_FILE = 'nn_model.h'
+
+# 与neural_network.h中的NN_ACT_*保持一致
+C_ACTIVATIONS = {
+    'identity': 'NN_ACT_IDENTITY',
+    'relu': 'NN_ACT_RELU',
+    'tanh': 'NN_ACT_TANH',
+    'logistic': 'NN_ACT_LOGISTIC',
+    'softmax': 'NN_ACT_SOFTMAX',
+}
+
+def _c_values(values, fmt, per_line=8):
+    values = [fmt(v) for v in np.ravel(values)]
+    lines = [", ".join(values[i:i + per_line]) for i in range(0, len(values), per_line)]
+    return ",\n    ".join(lines)
+
+def _c_float(v):
+    text = f"{v:.9g}"
+    # 整数值需要补小数点，否则"607f"不是合法的C浮点字面量
+    if '.' not in text and 'e' not in text:
+        text += '.0'
+    return text + 'f'
+
+def _c_floats(values):
+    return _c_values(values, _c_float)
+
+def _c_ints(values):
+    return _c_values(values, lambda v: str(int(v)), per_line=16)
+
+def _quantized_tables(qmodel):
+    """int8量化模型的权重、偏置和各隐藏层的定点重缩放参数"""
+    n = len(qmodel.weights)
+    out = [
+        "/* int8量化模型：int16原始ADC输入，int8权重，int32累加，隐藏层激活量化到[0, 127] */",
+        "#define NN_HAS_QUANTIZED 1",
+        "",
+    ]
+    for i, (w, b) in enumerate(zip(qmodel.weights, qmodel.biases)):
+        out += [
+            f"static const int8_t nn_q_layer{i}_weights[{w.size}] = {{\n    {_c_ints(w)}\n}};",
+            f"static const int32_t nn_q_layer{i}_bias[{b.size}] = {{\n    {_c_ints(b)}\n}};",
+            "",
+        ]
+    out += [
+        "static const int8_t *const nn_q_weights[NN_NUM_LAYERS] = {"
+        f"{', '.join(f'nn_q_layer{i}_weights' for i in range(n))}}};",
+        "static const int32_t *const nn_q_biases[NN_NUM_LAYERS] = {"
+        f"{', '.join(f'nn_q_layer{i}_bias' for i in range(n))}}};",
+        "static const int32_t nn_q_multipliers[NN_NUM_LAYERS - 1] = {"
+        f"{', '.join(str(m) for m in qmodel.multipliers)}}};",
+        "static const uint8_t nn_q_shifts[NN_NUM_LAYERS - 1] = {"
+        f"{', '.join(str(s) for s in qmodel.shifts)}}};",
+        "",
+    ]
+    return out
+
+def _precheck_tables(precheck):
+    """最近类中心预检所需的标准化参数、类中心和平方距离上限"""
+    centroids = precheck.centroids
+    return [
+        "/* 最近类中心预检：(x - mean) * inv_scale 到任一类中心的平方距离不超过上限才运行网络 */",
+        "#define NN_HAS_PRECHECK 1",
+        f"#define NN_PRECHECK_CLASSES {len(centroids.classes)}",
+        "",
+        f"static const float nn_pre_mean[NN_INPUT_NODES] = {{{_c_floats(centroids.mean)}}};",
+        f"static const float nn_pre_inv_scale[NN_INPUT_NODES] = {{{_c_floats(1.0 / centroids.scale)}}};",
+        "static const float nn_pre_centroids[NN_PRECHECK_CLASSES * NN_INPUT_NODES] = {\n"
+        f"    {_c_floats(centroids.centroids)}\n}};",
+        f"static const float nn_pre_max_distance = {_c_float(precheck.max_distance)};",
+        "",
+    ]
+
+def generate_header(model, qmodel=None, precheck=None):
+    """生成包含网络拓扑、折叠后权重和激活函数的C头文件内容，
+    给出qmodel时同时生成int8量化表，给出precheck(RejectingPredictor)时生成预检表和标定温度"""
+    mlp = model[-1]
+    layers = fold_scaler(model)
+    sizes = [layers[0][0].shape[0]] + [w.shape[1] for w, _ in layers]
+    activations = [mlp.activation] * (len(layers) - 1) + [mlp.out_activation_]
+
+    out = [
+        "/* 由 export_c.py 根据训练好的模型自动生成，请勿手动修改 */",
+        "#ifndef __NN_MODEL_H__",
+        "#define __NN_MODEL_H__",
+        "",
+        '#include "bsp/neural_network.h"',
+        "",
+        f"#define NN_NUM_LAYERS {len(layers)}",
+        f"#define NN_INPUT_NODES {sizes[0]}",
+        f"#define NN_OUTPUT_NODES {sizes[-1]}",
+        f"#define NN_MAX_NODES {max(sizes)}",
+        "",
+        f"static const int nn_layer_sizes[NN_NUM_LAYERS + 1] = {{{', '.join(map(str, sizes))}}};",
+        "static const uint8_t nn_layer_activations[NN_NUM_LAYERS] = {"
+        f"{', '.join(C_ACTIVATIONS[a] for a in activations)}}};",
+        "static const int nn_class_ids[NN_OUTPUT_NODES] = {"
+        f"{', '.join(str(int(c)) for c in mlp.classes_)}}};",
+        "",
+    ]
+    for i, (w, b) in enumerate(layers):
+        note = "（已折叠StandardScaler）" if i == 0 else ""
+        out += [
+            f"/* 第{i}层 {w.shape[0]}x{w.shape[1]} {activations[i]}{note}，按[输入][输出]行优先存储 */",
+            f"static const float nn_layer{i}_weights[{w.size}] = {{\n    {_c_floats(w)}\n}};",
+            f"static const float nn_layer{i}_bias[{b.size}] = {{\n    {_c_floats(b)}\n}};",
+            "",
+        ]
+    out += [
+        "static const float *const nn_weights[NN_NUM_LAYERS] = {"
+        f"{', '.join(f'nn_layer{i}_weights' for i in range(len(layers)))}}};",
+        "static const float *const nn_biases[NN_NUM_LAYERS] = {"
+        f"{', '.join(f'nn_layer{i}_bias' for i in range(len(layers)))}}};",
+        "",
+    ]
+    if qmodel is not None:
+        out += _quantized_tables(qmodel)
+    if precheck is not None:
+        out += _precheck_tables(precheck)
+        out += [
+            "/* 置信度温度标定：softmax输出层的logits先除以该温度，拒识阈值作用于标定后的概率，"
+            "与上位机RejectingPredictor一致 */",
+            f"#define NN_TEMPERATURE {_c_float(precheck.temperature)}",
+            "",
+        ]
+    out += ["#endif", ""]
+    return "\n".join(out)
+
+def export_header(model, header_path=HEADER_FILE, qmodel=None, precheck=None):
+    with open(header_path, 'w', encoding='utf-8') as f:
+        f.write(generate_header(model, qmodel, precheck))
+
+_PARITY_MAIN = r'''
+#include <stdio.h>
+#include "bsp/neural_network.h"
+
+int main(int argc, char **argv) {
+    float input[NN_MAX_INPUTS];
+    float output[NN_MAX_OUTPUTS];
+    int16_t q_input[NN_MAX_INPUTS];
+    int32_t logits[NN_MAX_OUTPUTS];
+    char mode = argc > 1 ? argv[1][0] : 'f';  /* f: float, q: int8, p: 预检 */
+    int n = nn_input_count();
+    int m = nn_output_count();
+    for (;;) {
+        for (int i = 0; i < n; i++) {
+            if (scanf("%f", &input[i]) != 1) return 0;
+            q_input[i] = (int16_t)input[i];
+        }
+        if (mode == 'p') {
+            printf("%d\n", nn_precheck(input));
+        } else if (mode == 'q') {
+            nn_inference_q(q_input, logits);
+            for (int k = 0; k < m; k++) {
+                printf("%d ", (int)logits[k]);
+            }
+            printf("%d\n", nn_class_id(nn_get_best_match_q(logits)));
+        } else {
+            nn_inference(input, output);
+            for (int k = 0; k < m; k++) {
+                printf("%.9g ", output[k]);
+            }
+            printf("%d\n", nn_class_id(nn_get_best_match(output)));
+        }
+    }
+}
+'''
+
+def build_host_harness(header_path, workdir, cc='gcc'):
+    """用主机gcc把neural_network.c和生成的头文件编译成可执行的对比程序"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    bsp = os.path.join(workdir, 'bsp')
+    os.makedirs(bsp, exist_ok=True)
+    shutil.copy(os.path.join(here, 'neural_network.h'), bsp)
+    shutil.copy(header_path, os.path.join(bsp, 'nn_model.h'))
+    main_c = os.path.join(workdir, 'parity_main.c')
+    with open(main_c, 'w') as f:
+        f.write(_PARITY_MAIN)
+    exe = os.path.join(workdir, 'nn_parity')
+    subprocess.run(
+        [cc, '-std=c11', '-O2', '-Wall', '-I', workdir,
+         os.path.join(here, 'neural_network.c'), main_c, '-o', exe, '-lm'],
+        check=True)
+    return exe
+
+def run_c_inference(exe, X, quantized=False):
+    """通过标准输入把样本交给C程序推理，返回 (标签[N], 概率或int8模型的logits[N, 类别数])"""
+    stdin = "\n".join(" ".join(str(float(v)) for v in row) for row in X) + "\n"
+    args = [exe, 'q'] if quantized else [exe]
+    result = subprocess.run(args, input=stdin, capture_output=True, text=True, check=True)
+    rows = np.array([line.split() for line in result.stdout.splitlines()], dtype=np.float64)
+    return rows[:, -1].astype(int), rows[:, :-1]
+
+def run_c_precheck(exe, X):
+    """返回C预检结果[N]（1表示会运行网络）"""
+    stdin = "\n".join(" ".join(str(float(v)) for v in row) for row in X) + "\n"
+    result = subprocess.run([exe, 'p'], input=stdin, capture_output=True, text=True, check=True)
+    return np.array(result.stdout.split(), dtype=int)
+
+def precheck_probe_samples(X, n=200, seed=0):
+    """训练样本加上覆盖整个ADC范围的随机样本，用于核对预检"""
+    rng = np.random.default_rng(seed)
+    return np.vstack([X, rng.integers(0, 1024, (n, X.shape[1]))]).astype(np.float64)
+
+def verify_c_parity(model, header_path=HEADER_FILE, X=None, cc='gcc', atol=1e-4, qmodel=None,
+                    precheck=None):
+    """在训练集上比较Python与C推理结果，返回 (标签是否一致, 概率最大误差)；
+    给出qmodel时还要求C的整数推理logits与QuantizedMLP逐位相同，
+    给出precheck时还要求C预检与Python的判断一致，C的概率按其温度标定后比较"""
+    if X is None:
+        X, _, _ = get_features_and_labels()
+    with tempfile.TemporaryDirectory() as workdir:
+        exe = build_host_harness(header_path, workdir, cc)
+        c_labels, c_proba = run_c_inference(exe, X)
+        if qmodel is not None:
+            q_labels, q_logits = run_c_inference(exe, X, quantized=True)
+        if precheck is not None:
+            probes = precheck_probe_samples(X)
+            c_near = run_c_precheck(exe, probes)
+    py_proba = model.predict_proba(X)
+    if precheck is not None:
+        py_proba = precheck.scale_proba(py_proba)
+    max_err = float(np.abs(c_proba - py_proba).max())
+    ok = bool(np.array_equal(c_labels, model.predict(X))) and max_err <= atol
+    if qmodel is not None:
+        ok = ok and np.array_equal(q_logits, qmodel.predict_logits(X)) \
+            and np.array_equal(q_labels, qmodel.predict(X))
+    if precheck is not None:
+        py_near = precheck.centroids.distances(probes).min(axis=1) <= precheck.max_distance
+        ok = ok and np.array_equal(c_near.astype(bool), py_near)
+    return ok, max_err
+
+def main():
+    parser = argparse.ArgumentParser(description="把训练好的MLP导出为固件使用的C头文件")
+    parser.add_argument('model', nargs='?', default='model.joblib', help="模型文件")
+    parser.add_argument('-o', '--output', default=HEADER_FILE, help="输出头文件")
+    parser.add_argument('--train', action='store_true', help="不读取模型文件，重新训练后导出")
+    parser.add_argument('--check', action='store_true', help="用主机gcc编译并核对C与Python的推理结果")
+    args = parser.parse_args()
+
+    model = train_model()[0] if args.train else load_model(args.model)
+    qmodel = quantize_model(model)
+    X, y, _ = get_features_and_labels()
+    precheck = RejectingPredictor(FastPredictor(model), X, y)
+    precheck.calibrate(X, y)
+    print(format_calibration(precheck.calibration))
+    export_header(model, args.output, qmodel, precheck)
+    print(f"已导出: {args.output}")
+
+    if args.check:
+        ok, max_err = verify_c_parity(model, args.output, qmodel=qmodel, precheck=precheck)
+        print(f"C/Python一致: {ok} (概率最大误差 {max_err:.2e})")
+        if not ok:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import numpy as np
+
+
+class EMAFilter:
+    """指数滑动平均，与固件gesture_process中的FILTER_FACTOR一致"""
+
+    def __init__(self, alpha=0.3, channels=4):
+        self.alpha = alpha
+        self._state = np.zeros(channels, dtype=np.float64)
+        self._primed = False
+
+    def reset(self):
+        self._primed = False
+
+    def update(self, sample):
+        if not self._primed:
+            self._state[:] = sample
+            self._primed = True
+        else:
+            self._state *= 1 - self.alpha
+            self._state += self.alpha * np.asarray(sample, dtype=np.float64)
+        return self._state.copy()
+
+
+class MovingAverageFilter:
+    """最近n个样本的滑动平均，环形缓冲区 + 累加和，每个样本O(1)"""
+
+    def __init__(self, n=5, channels=4):
+        self.n = n
+        self._ring = np.zeros((n, channels), dtype=np.float64)
+        self._sum = np.zeros(channels, dtype=np.float64)
+        self._count = 0
+
+    def reset(self):
+        self._ring[:] = 0
+        self._sum[:] = 0
+        self._count = 0
+
+    def update(self, sample):
+        idx = self._count % self.n
+        self._sum -= self._ring[idx]
+        self._ring[idx] = sample
+        self._sum += self._ring[idx]
+        self._count += 1
+        return self._sum / min(self._count, self.n)
+
+
+class MedianFilter:
+    """最近n个样本的逐通道中值（n为小常数，每个样本的代价与数据量无关）"""
+
+    def __init__(self, n=5, channels=4):
+        self.n = n
+        self._ring = np.zeros((n, channels), dtype=np.float64)
+        self._count = 0
+
+    def reset(self):
+        self._count = 0
+
+    def update(self, sample):
+        self._ring[self._count % self.n] = sample
+        self._count += 1
+        return np.median(self._ring[:min(self._count, self.n)], axis=0)
+
+
+SAMPLE_FILTERS = {
+    'ema': EMAFilter,
+    'mean': MovingAverageFilter,
+    'median': MedianFilter,
+}
+
+
+def make_sample_filter(kind, **kwargs):
+    """按名称创建样本滤波器: 'ema' / 'mean' / 'median' / None(不滤波)"""
+    if kind is None:
+        return None
+    if kind not in SAMPLE_FILTERS:
+        raise ValueError(f"未知的滤波器类型: {kind}")
+    return SAMPLE_FILTERS[kind](**kwargs)
+
+
+class MajorityVote:
+    """滑动窗口多数表决 + 滞回
+
+    窗口内某个标签出现次数达到min_count时才成为新的稳定标签，
+    稳定标签切换时update返回新标签，其余情况返回None。
+    计数表随窗口增量维护，每个样本O(1)。
+    """
+
+    def __init__(self, window=5, min_count=4):
+        if not 0 < min_count <= window:
+            raise ValueError("min_count必须在1到window之间")
+        self.window = window
+        self.min_count = min_count
+        self._ring = [None] * window
+        self._counts = {}
+        self._index = 0
+        self.stable = None
+
+    def reset(self):
+        self._ring = [None] * self.window
+        self._counts.clear()
+        self._index = 0
+        self.stable = None
+
+    def update(self, label):
+        old = self._ring[self._index]
+        if old is not None:
+            self._counts[old] -= 1
+        self._ring[self._index] = label
+        self._index = (self._index + 1) % self.window
+        count = self._counts.get(label, 0) + 1
+        self._counts[label] = count
+
+        if label != self.stable and count >= self.min_count:
+            self.stable = label
+            return label
+        return None
+
+
+class GestureStabilizer:
+    """分类前的样本滤波 + 分类后的表决，只有稳定的手势切换才会输出"""
+
+    def __init__(self, sample_filter=None, vote=None):
+        self.sample_filter = sample_filter
+        self.vote = vote if vote is not None else MajorityVote()
+
+    def reset(self):
+        if self.sample_filter is not None:
+            self.sample_filter.reset()
+        self.vote.reset()
+
+    def smooth(self, sample):
+        """逐样本滤波，返回滤波后的样本"""
+        if self.sample_filter is None:
+            return sample
+        return self.sample_filter.update(sample)
+
+    def update(self, label):
+        """送入一次分类结果，稳定标签发生切换时返回新标签，否则返回None"""
+        return self.vote.update(label)
+
+    @property
+    def stable(self):
+        return self.vote.stable
+
+
+def make_stabilizer(filter_kind='ema', vote_window=5, vote_min_count=4, **filter_options):
+    """按配置创建GestureStabilizer"""
+    return GestureStabilizer(
+        make_sample_filter(filter_kind, **filter_options),
+        MajorityVote(vote_window, vote_min_count),
+    )
@@ -1,139 +1,197 @@
-#include "gesture.h"
-#include "oled.h"
-#include "bsp/adc.h"
-#include "bsp/neural_network.h"
-#include <stdio.h>
-#include <stdlib.h>
-#include <unistd.h>
-#include <math.h>
-
-#define SAMPLE_COUNT 5
-#define SAMPLE_DELAY_MS 50
-#define FILTER_FACTOR 0.3
-
-const char* GESTURE_NAMES[12] = {
-    "OK", "厉害", "你", "抗议", "谢谢", 
-    "无语", "疑问", "明天见", "好", "对不起", 
-    "没关系", "喜欢"
-};
-
-static float filtered_values[5] = {0};
-
-void gesture_init(void) {
-    if (adc_init() < 0) {
-        fprintf(stderr, "ADC init failed\n");
-        exit(1);
-    }
-    
-    if (i2c_init(1, 0x3C) < 0) {
-        fprintf(stderr, "I2C init failed\n");
-        exit(1);
-    }
-    
-    OLED_Init();
-    
-    nn_init();
-    
-    OLED_ShowString(0, 0, "Gesture System", 16);
-    OLED_ShowString(0, 2, "Initializing...", 16);
-    sleep(1);
-    OLED_Clear();
-    
-    for (int ch = 0; ch < 5; ch++) {
-        filtered_values[ch] = adc_read(ch);
-    }
-}
-
-void gesture_process(void) {
-    float averages[5] = {0};
-    char displayBuffer[50];
-    
-    for (int i = 0; i < SAMPLE_COUNT; i++) {
-        for (int ch = 0; ch < 5; ch++) {
-            uint16_t raw_value = adc_read(ch);
-            filtered_values[ch] = FILTER_FACTOR * raw_value + 
-                                  (1 - FILTER_FACTOR) * filtered_values[ch];
-            averages[ch] += filtered_values[ch];
-        }
-        usleep(SAMPLE_DELAY_MS * 1000);
-    }
-    
-    for (int ch = 0; ch < 5; ch++) {
-        averages[ch] /= SAMPLE_COUNT;
-    }
-
-    float input[5];
-    for (int i = 0; i < 5; i++) {
-        input[i] = averages[i] / 1024.0f; 
-    }
-
-
-    float output[12];
-    nn_inference(input, output);
-
-    int best_match = nn_get_best_match(output);
-
-    OLED_Clear();
-    
-    sprintf(displayBuffer, "ID:%d Prob:%.2f", best_match + 1, output[best_match]);
-    OLED_ShowString(0, 0, displayBuffer, 16);
-    
-    sprintf(displayBuffer, "A0:%.0f A1:%.0f", averages[0], averages[1]);
-    OLED_ShowString(0, 2, displayBuffer, 16);
-    
-    switch(best_match) {
-        case 0: // OK
-            OLED_ShowString(40, 4, "OK", 16);
-            break;
-        case 1: // 厉害
-            OLED_ShowChinese(40, 4, 0, 16); // 厉
-            OLED_ShowChinese(56, 4, 1, 16); // 害
-            break;
-        case 2: // 你
-            OLED_ShowChinese(56, 4, 2, 16);
-            break;
-        case 3: // 抗议
-            OLED_ShowChinese(32, 4, 3, 16); // 抗
-            OLED_ShowChinese(48, 4, 4, 16); // 议
-            break;
-        case 4: // 谢谢
-            OLED_ShowChinese(40, 4, 5, 16); // 谢
-            OLED_ShowChinese(56, 4, 5, 16); // 谢
-            break;
-        case 5: // 无语
-            OLED_ShowChinese(40, 4, 6, 16); // 无
-            OLED_ShowChinese(56, 4, 7, 16); // 语
-            break;
-        case 6: // 疑问
-            OLED_ShowChinese(32, 4, 8, 16); // 疑
-            OLED_ShowChinese(48, 4, 9, 16); // 问
-            break;
-        case 7: // 明天见
-            OLED_ShowChinese(20, 4, 10, 16); // 明
-            OLED_ShowChinese(36, 4, 11, 16); // 天
-            OLED_ShowChinese(52, 4, 12, 16); // 见
-            break;
-        case 8: // 好
-            OLED_ShowChinese(56, 4, 13, 16);
-            break;
-        case 9: // 对不起
-            OLED_ShowChinese(20, 4, 14, 16); // 对
-            OLED_ShowChinese(36, 4, 15, 16); // 不
-            OLED_ShowChinese(52, 4, 16, 16); // 起
-            break;
-        case 10: // 没关系
-            OLED_ShowChinese(20, 4, 17, 16); // 没
-            OLED_ShowChinese(36, 4, 18, 16); // 关
-            OLED_ShowChinese(52, 4, 19, 16); // 系
-            break;
-        case 11: // 喜欢
-            OLED_ShowChinese(40, 4, 20, 16); // 喜
-            OLED_ShowChinese(56, 4, 21, 16); // 欢
-            break;
-    }
-    
-    sprintf(displayBuffer, "Confidence: %.0f%%", output[best_match] * 100);
-    OLED_ShowString(0, 6, displayBuffer, 16);
-    
-    usleep(500000); 
+#include "gesture.h"
+#include "oled.h"
+#include "bsp/adc.h"
+#include "bsp/i2c.h"
+#include "bsp/neural_network.h"
+#include <stdio.h>
+#include <stdlib.h>
+#include <unistd.h>
+#include <math.h>
+
+#define SAMPLE_COUNT 5
+#define SAMPLE_DELAY_MS 50
+#define FILTER_FACTOR 0.3
+// 最大概率低于该值时显示Unknown；nn_inference输出的是按NN_TEMPERATURE标定后的概率，
+// 与上位机REJECT_THRESHOLD作用于同一尺度
+#define REJECT_THRESHOLD 0.6f
+#define SCAN_TIMEOUT_MS 300  // 缓冲模式下每次批量读取的等待时间
+#define MAX_EMPTY_READS 3  // 连续这么多次读不到扫描就放弃本周期，主循环得以检查退出标志
+
+const char* GESTURE_NAMES[12] = {
+    "OK", "厉害", "你", "抗议", "谢谢", 
+    "无语", "疑问", "明天见", "好", "对不起", 
+    "没关系", "喜欢"
+};
+
+// 模型输出的手势编号(sign_mapping.json) -> GESTURE_NAMES下标
+static const int CLASS_TO_GESTURE[] = {-1, 0, 2, 4, 7, 8, 9, 10};
+#define CLASS_COUNT (int)(sizeof(CLASS_TO_GESTURE) / sizeof(CLASS_TO_GESTURE[0]))
+
+static float filtered_values[ADC_CHANNELS] = {0};
+
+void gesture_init(void) {
+    if (adc_init() < 0) {
+        fprintf(stderr, "ADC init failed\n");
+        exit(1);
+    }
+    
+    if (i2c_init(1, 0x3C) < 0) {
+        fprintf(stderr, "I2C init failed\n");
+        exit(1);
+    }
+    
+    OLED_Init();
+    
+    nn_init();
+    
+    OLED_ShowString(0, 0, "Gesture System", 16);
+    OLED_ShowString(0, 2, "Initializing...", 16);
+    OLED_Refresh();
+    sleep(1);
+    OLED_Clear();
+    OLED_Refresh();
+    
+    uint16_t scan[ADC_CHANNELS];
+    if (adc_read_scan(scan) == 0) {
+        for (int ch = 0; ch < ADC_CHANNELS; ch++) {
+            filtered_values[ch] = scan[ch];
+        }
+    }
+}
+
+// 缓冲采集模式：取走上一周期以来到达的全部扫描逐个滤波，至少SAMPLE_COUNT个；
+// sysfs模式：逐次读取SAMPLE_COUNT个扫描，每次间隔SAMPLE_DELAY_MS。
+// 读取出错或连续MAX_EMPTY_READS次超时时提前返回，返回值为实际参与平均的扫描数
+static int sample_averages(float averages[ADC_CHANNELS]) {
+    static uint16_t scans[256][ADC_CHANNELS];
+    int total = 0;
+    int empty_reads = 0;
+    while (total < SAMPLE_COUNT) {
+        int n = adc_read_scans(scans, 256, SCAN_TIMEOUT_MS);
+        if (n < 0) break;
+        if (n == 0) {
+            if (++empty_reads >= MAX_EMPTY_READS) break;
+            continue;
+        }
+        empty_reads = 0;
+        for (int i = 0; i < n; i++) {
+            for (int ch = 0; ch < ADC_CHANNELS; ch++) {
+                filtered_values[ch] = FILTER_FACTOR * scans[i][ch] +
+                                      (1 - FILTER_FACTOR) * filtered_values[ch];
+                averages[ch] += filtered_values[ch];
+            }
+        }
+        total += n;
+        if (!adc_buffered()) {
+            usleep(SAMPLE_DELAY_MS * 1000);
+        }
+    }
+    if (total > 0) {
+        for (int ch = 0; ch < ADC_CHANNELS; ch++) {
+            averages[ch] /= total;
+        }
+    }
+    return total;
+}
+
+void gesture_process(void) {
+    float averages[ADC_CHANNELS] = {0};
+    char displayBuffer[50];
+    
+    if (sample_averages(averages) == 0) {
+        // 没有采到数据时不对全0的平均值做分类
+        OLED_Clear();
+        OLED_ShowString(0, 0, "No ADC data", 16);
+        OLED_Refresh();
+        usleep(500000);
+        return;
+    }
+
+    // 与上位机模型一致：输入A1-A4原始ADC值，标准化已折叠进第一层权重
+    float input[NN_MAX_INPUTS];
+    for (int i = 0; i < nn_input_count(); i++) {
+        input[i] = averages[i + 1];
+    }
+
+    // 先做最近类中心预检，手放松或传感器异常时不运行网络
+    float output[NN_MAX_OUTPUTS] = {0};
+    int best_match = -1;
+    float confidence = 0;
+    if (nn_precheck(input)) {
+        nn_inference(input, output);
+        best_match = nn_get_best_match_threshold(output, REJECT_THRESHOLD);
+        confidence = output[nn_get_best_match(output)];
+    }
+    int class_id = best_match >= 0 ? nn_class_id(best_match) : -1;
+    int gesture = (class_id > 0 && class_id < CLASS_COUNT) ? CLASS_TO_GESTURE[class_id] : -1;
+
+    OLED_Clear();
+    
+    sprintf(displayBuffer, "ID:%d Prob:%.2f", class_id, confidence);
+    OLED_ShowString(0, 0, displayBuffer, 16);
+    
+    sprintf(displayBuffer, "A0:%.0f A1:%.0f", averages[0], averages[1]);
+    OLED_ShowString(0, 2, displayBuffer, 16);
+    
+    switch(gesture) {
+        case 0: // OK
+            OLED_ShowString(40, 4, "OK", 16);
+            break;
+        case 1: // 厉害
+            OLED_ShowChinese(40, 4, 0, 16); // 厉
+            OLED_ShowChinese(56, 4, 1, 16); // 害
+            break;
+        case 2: // 你
+            OLED_ShowChinese(56, 4, 2, 16);
+            break;
+        case 3: // 抗议
+            OLED_ShowChinese(32, 4, 3, 16); // 抗
+            OLED_ShowChinese(48, 4, 4, 16); // 议
+            break;
+        case 4: // 谢谢
+            OLED_ShowChinese(40, 4, 5, 16); // 谢
+            OLED_ShowChinese(56, 4, 5, 16); // 谢
+            break;
+        case 5: // 无语
+            OLED_ShowChinese(40, 4, 6, 16); // 无
+            OLED_ShowChinese(56, 4, 7, 16); // 语
+            break;
+        case 6: // 疑问
+            OLED_ShowChinese(32, 4, 8, 16); // 疑
+            OLED_ShowChinese(48, 4, 9, 16); // 问
+            break;
+        case 7: // 明天见
+            OLED_ShowChinese(20, 4, 10, 16); // 明
+            OLED_ShowChinese(36, 4, 11, 16); // 天
+            OLED_ShowChinese(52, 4, 12, 16); // 见
+            break;
+        case 8: // 好
+            OLED_ShowChinese(56, 4, 13, 16);
+            break;
+        case 9: // 对不起
+            OLED_ShowChinese(20, 4, 14, 16); // 对
+            OLED_ShowChinese(36, 4, 15, 16); // 不
+            OLED_ShowChinese(52, 4, 16, 16); // 起
+            break;
+        case 10: // 没关系
+            OLED_ShowChinese(20, 4, 17, 16); // 没
+            OLED_ShowChinese(36, 4, 18, 16); // 关
+            OLED_ShowChinese(52, 4, 19, 16); // 系
+            break;
+        case 11: // 喜欢
+            OLED_ShowChinese(40, 4, 20, 16); // 喜
+            OLED_ShowChinese(56, 4, 21, 16); // 欢
+            break;
+        default: // 拒识
+            OLED_ShowString(32, 4, "Unknown", 16);
+            break;
+    }
+    
+    sprintf(displayBuffer, "Confidence: %.0f%%", confidence * 100);
+    OLED_ShowString(0, 6, displayBuffer, 16);
+    
+    // 整帧画完后只发送变化的部分，未变化的文字不重复传输
+    OLED_Refresh();
+    
+    usleep(500000); 
 }
\ No newline at end of file
@@ -0,0 +1,131 @@
+import json
+import sys
+import threading
+import time
+
+SUB_BUCKET_BITS = 7  # 每个2的幂区间再分128格，相对误差<1%
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_EXPONENT = 64 - SUB_BUCKET_BITS
+
+# 各阶段名称（纳秒）：
+#   queue  字节到达(read返回)到被消费者取走
+#   parse  解析一块串口数据
+#   predict 模型推理
+#   ui     刷新界面
+#   write  下发帧的ser.write
+#   end_to_end 字节到达到界面刷新完成
+STAGES = ('queue', 'parse', 'predict', 'ui', 'write', 'end_to_end')
+
+
+class LatencyHistogram:
+    """HDR风格的对数-线性直方图，固定内存、O(1)记录，单位纳秒"""
+
+    def __init__(self):
+        self.counts = [0] * ((MAX_EXPONENT + 1) * SUB_BUCKETS)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    @staticmethod
+    def _index(value):
+        exponent = max(0, value.bit_length() - SUB_BUCKET_BITS)
+        return exponent * SUB_BUCKETS + (value >> exponent)
+
+    @staticmethod
+    def _value(index):
+        """桶的中点值"""
+        exponent, sub = divmod(index, SUB_BUCKETS)
+        return (sub << exponent) + ((1 << exponent) >> 1)
+
+    def record(self, value):
+        value = max(0, int(value))
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        if self.count == 0:
+            return 0
+        target = max(1, int(round(self.count * p / 100.0)))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n:
+                seen += n
+                if seen >= target:
+                    return min(self._value(index), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'min': self.min or 0,
+            'mean': self.total / self.count if self.count else 0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+class LatencyTracker:
+    """按阶段记录延迟的线程安全直方图集合"""
+
+    def __init__(self, stages=STAGES):
+        self._lock = threading.Lock()
+        self.histograms = {stage: LatencyHistogram() for stage in stages}
+
+    def record(self, stage, elapsed_ns):
+        with self._lock:
+            hist = self.histograms.get(stage)
+            if hist is None:
+                hist = self.histograms[stage] = LatencyHistogram()
+            hist.record(elapsed_ns)
+
+    def record_since(self, stage, start_ns):
+        """记录从start_ns(perf_counter_ns)到现在的耗时"""
+        self.record(stage, time.perf_counter_ns() - start_ns)
+
+    def reset(self):
+        with self._lock:
+            for stage in list(self.histograms):
+                self.histograms[stage] = LatencyHistogram()
+
+    def dump(self):
+        """返回各阶段的统计摘要（纳秒）"""
+        with self._lock:
+            return {stage: hist.summary() for stage, hist in self.histograms.items()}
+
+    def export(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'time': time.time(), 'unit': 'ns', 'stages': self.dump()}, f, indent=2)
+
+    def format_report(self):
+        return format_report(self.dump())
+
+
+def format_report(stages):
+    lines = [f"{'阶段':<12}{'次数':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}"]
+    for stage, s in stages.items():
+        if not s['count']:
+            continue
+        lines.append(f"{stage:<12}{s['count']:>8}{s['p50'] / 1e6:>10.3f}{s['p95'] / 1e6:>10.3f}"
+                     f"{s['p99'] / 1e6:>10.3f}{s['max'] / 1e6:>10.3f}")
+    return "\n".join(lines)
+
+
+# 进程内共享的全局记录器
+tracker = LatencyTracker()
+
+
+if __name__ == "__main__":
+    # 用法: python latency.py latency.json  打印导出文件中的延迟统计
+    if len(sys.argv) != 2:
+        print("用法: python latency.py <导出的JSON文件>")
+        sys.exit(1)
+    with open(sys.argv[1], encoding='utf-8') as f:
+        print(format_report(json.load(f)['stages']))
@@ -1,202 +1,226 @@
-import tkinter as tk
-from network import load_model, load_sign_mapping, train_model, save_model, save_sign_mapping
-from ui import SignLanguageDisplay
-import serial
 import time
-import os
-import numpy as np
+BOOT_TIME = time.perf_counter()  # 进程开始导入main.py的时间，启动分析以此为起点
+
+import argparse
+import signal
 import threading
+from scheduler import PeriodicSender
+from protocol import DownlinkEncoder
+from filters import make_stabilizer
+from latency import tracker
+from network import REJECT_THRESHOLD, CACHE_BUCKET
+# tkinter/ui、sensor_stream(pyserial) 和 online(模型加载) 在main()中按需导入，
+# 模型加载与串口打开、界面创建并行进行
 
 SERIAL_PORT = '/dev/ttyS1'
 BAUD_RATE = 9600
-ser = None
-last_sensor_data = None  # 存储最新的传感器数据
-sensor_data_lock = threading.Lock()  # 用于线程安全的锁
+STALE_TIMEOUT = 0.5  # 超过该时间(秒)未更新的样本视为过期，不再分类
+SEND_INTERVAL = 0.8  # 舵机数据下发周期(秒)，可降到0.01~0.02(50~100Hz)
+SEND_VERBOSE = False  # 是否打印每一帧下发数据（--verbose-send），高频发送时打印会拖慢下发并影响延迟统计
+reader = None  # 后台串口采集线程
+sender = None  # 周期下发线程
+downlink_encoder = DownlinkEncoder()  # 查表转换 + 帧编码
+
+# 分类前后的流式滤波：FILTER_KIND可选 'ema' / 'mean' / 'median' / None
+FILTER_KIND = 'ema'
+FILTER_OPTIONS = {'alpha': 0.3}
+VOTE_WINDOW = 5  # 表决窗口（分类次数）
+VOTE_MIN_COUNT = 4  # 窗口内出现次数达到该值才认为手势稳定
+stabilizer = make_stabilizer(FILTER_KIND, VOTE_WINDOW, VOTE_MIN_COUNT, **FILTER_OPTIONS)
+LATENCY_FILE = 'latency.json'  # 延迟统计导出文件
+CALIBRATION_SECONDS = 3.0  # 标定模式每次采集的时长(秒)
+RECOGNIZE_INTERVAL = 0.1  # 后台识别周期(秒)，与表决窗口配合决定手势确认时间
+LOG_DIR = 'logs'  # 识别事件和保存的序列写入该目录下的轮转日志，见datalog.py
+STARTUP_TARGET = 2.0  # 启动到首个手势可识别的目标耗时(秒)，--profile-startup时检查
 send_enabled = True  # 控制发送是否启用
 
-def init_serial():
-    global ser
-    try:
-        ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
-        print(f"串口已连接: {SERIAL_PORT} @ {BAUD_RATE} bps")
-        return True
-    except Exception as e:
-        print(f"串口连接失败: {str(e)}")
-        return False
+class StartupProfile:
+    """记录启动各阶段的耗时，时间起点为BOOT_TIME"""
 
-def read_serial_data():
-    """从串口读取传感器数据，只返回最新数据"""
-    global last_sensor_data
-    if ser is None:
-        if not init_serial():
-            return None
-    
-    try:
-        # 读取所有可用的行，只保留最后一行
-        while ser.in_waiting > 0:
-            line = ser.readline().decode().strip()
-            if line:
-                values = line.split(',')
-                if len(values) == 5:
-                    # 只取后4个值(A1-A4)，忽略A0
-                    sensor_data = [int(val) for val in values[1:]]
-                    with sensor_data_lock:
-                        last_sensor_data = sensor_data
-                    return sensor_data
-        
-        # 如果没有新数据，返回上次读取的数据
-        with sensor_data_lock:
-            return last_sensor_data
-    except Exception as e:
-        print(f"读取串口数据错误: {str(e)}")
-        return None
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.phases = []  # (阶段名, 距BOOT_TIME的秒数)
+        self._lock = threading.Lock()
 
-def transform_sensor_values(sensor_data):
-    """将原始ADC值转换为舵机控制值（根据拟合公式）"""
-    if sensor_data is None or len(sensor_data) < 4:
-        return None
-    
-    # 原始ADC值
-    a1, a2, a3, a4 = sensor_data
-    
-    # 应用拟合公式转换
-    # 通道1 (A1): y = 4.5x - 440
-    
-    transformed_a1 = int(-3.9130 * a1 +3073.913)
-    
-    # 通道2 (A2): y = 1.9565x + 373.913
-    transformed_a2 = int(-2 * a2 + 2500)
-    
-    # 通道3 (A3): y = 2.8125x + 100
-    transformed_a3 = int(-3.333 * a3 + 2866.667)
-    
-    # 通道4 (A4): y = -1.2784x + 2310.088
-    transformed_a4 = int(1.4286 * a4 + 514.286)
-    
-    # 确保值在有效范围内 (1000-1900)
-    transformed_a1 = max(1000, min(1900, transformed_a1))
-    transformed_a2 = max(1000, min(1900, transformed_a2))
-    transformed_a3 = max(1000, min(1900, transformed_a3))
-    transformed_a4 = max(1000, min(1900, transformed_a4))
-    
-    return [transformed_a1, transformed_a2, transformed_a3, transformed_a4]
+    def mark(self, phase):
+        if self.enabled:
+            with self._lock:
+                self.phases.append((phase, time.perf_counter() - BOOT_TIME))
 
-def format_sensor_data(sensor_data):
-    """格式化传感器数据为协议帧:
-       A5 5A 0A + [5x uint16 小端序] + SUM8(payload)
-       顺序: A4, A3, A2, A0(与A2相同), A1
-    """
-    if sensor_data is None or len(sensor_data) < 4:
-        return None
+    def mark_once(self, phase):
+        if self.enabled and phase not in dict(self.phases):
+            self.mark(phase)
 
-    # 提取转换后的值
-    transformed_a1, transformed_a2, transformed_a3, transformed_a4 = sensor_data
-    
-    # 按顺序创建值列表: A4, A3, A2, A0(等于A2), A1
-    values = [
-        transformed_a4,  # A4
-        transformed_a3,  # A3
-        transformed_a2,  # A2
-        transformed_a2,  # A0 (与A2相同)
-        transformed_a1   # A1
-    ]
+    def report(self, target=STARTUP_TARGET):
+        lines = [f"{'阶段':<24}{'完成时刻(ms)':>14}"]
+        for phase, t in sorted(self.phases, key=lambda p: p[1]):
+            lines.append(f"{phase:<24}{t * 1000:>14.1f}")
+        ready = dict(self.phases).get('首个手势可识别')
+        if ready is not None:
+            verdict = "达标" if ready <= target else "超出目标"
+            lines.append(f"首个手势可识别 {ready:.3f}s，目标 {target:.1f}s: {verdict}")
+        return "\n".join(lines)
 
-    # 帧头
-    frame = bytearray([0xA5, 0x5A, 0x0A])
 
-    # 负载（10字节）：每个uint16"小端序"：低字节在前，高字节在后
-    payload = bytearray()
-    for v in values:
-        # 确保值在0-65535范围内
-        v = max(0, min(int(v), 65535))
-        # 小端序：先低字节，后高字节
-        payload.append(v & 0xFF)        # 低8位
-        payload.append((v >> 8) & 0xFF) # 高8位
+profile = StartupProfile()
 
-    # SUM8：对10个负载字节求和，取低8位
-    sum8 = sum(payload) & 0xFF
+def init_serial():
+    """启动后台串口采集线程（串口由该线程独占）"""
+    global reader
+    if reader is None or not reader.is_alive():
+        from sensor_stream import SerialReader
+        reader = SerialReader(SERIAL_PORT, BAUD_RATE)
+        reader.start()
+    return reader
 
-    # 组帧：帧头 + 负载 + 校验
-    frame += payload
-    frame.append(sum8)
+def read_serial_data():
+    """返回最新的传感器数据(A1-A4)，不阻塞；无数据或数据过期时返回None"""
+    if reader is None:
+        return None
+    latest = reader.latest(STALE_TIMEOUT)
+    if latest is None:
+        return None
+    return latest[0].tolist()
 
-    return bytes(frame)
+def dump_latency(*_):
+    """导出各阶段延迟统计到LATENCY_FILE并打印（也可通过SIGUSR1触发）"""
+    tracker.export(LATENCY_FILE)
+    print(tracker.format_report())
+    print(f"延迟统计已导出: {LATENCY_FILE}")
 
 def send_sensor_data():
-    """定时发送传感器数据到串口（十六进制格式）"""
-    global ser, last_sensor_data, send_enabled
-    
+    """发送一帧最新的传感器数据到串口（十六进制格式），由周期发送线程调用"""
     if not send_enabled:
-        # 800ms后再次尝试
-        threading.Timer(0.8, send_sensor_data).start()
         return
     
+    ser = reader.ser if reader is not None else None
     if ser is None:
-        if not init_serial():
-            # 800ms后再次尝试
-            threading.Timer(0.8, send_sensor_data).start()
-            return
+        # 串口尚未连接，等待下一个周期
+        return
     
     try:
         # 获取最新的传感器数据
-        with sensor_data_lock:
-            sensor_data = last_sensor_data
-        
+        sensor_data = read_serial_data()
         if sensor_data is None:
-            # 800ms后再次尝试
-            threading.Timer(0.8, send_sensor_data).start()
             return
         
-        # 转换原始ADC值为舵机控制值
-        transformed_data = transform_sensor_values(sensor_data)
-        
-        # 格式化数据为十六进制字节流
-        hex_data = format_sensor_data(transformed_data)
-        if hex_data is None:
-            # 800ms后再次尝试
-            threading.Timer(0.8, send_sensor_data).start()
-            return
+        # 查表转换为舵机控制值并编码为协议帧（复用预分配缓冲区）
+        hex_data = downlink_encoder.encode(sensor_data)
         
         # 发送十六进制数据
+        write_start = time.perf_counter_ns()
         ser.write(hex_data)
-        print(f"已发送传感器数据: {hex_data.hex().upper()}")
+        tracker.record_since('write', write_start)
+        if SEND_VERBOSE:
+            print(f"已发送传感器数据: {hex_data.hex().upper()}")
     except Exception as e:
         print(f"发送传感器数据失败: {str(e)}")
-    
-    # 800ms后再次发送
-    threading.Timer(0.8, send_sensor_data).start()
+
+def _load_model(result):
+    """后台线程：导入online并加载模型，结果放入result"""
+    from online import start_online_learning
+    profile.mark('导入online')
+    result['online'] = start_online_learning('model.npz', 'sign_mapping.json')
+    profile.mark('模型加载完成')
 
 def main():
-    global ser, send_enabled
-    model_file = 'model.joblib'
-    mapping_file = 'sign_mapping.json'
-    
-    if not os.path.exists(model_file) or not os.path.exists(mapping_file):
-        print("训练模型...")
-        model, sign_mapping = train_model()
-        save_model(model, model_file)
-        save_sign_mapping(sign_mapping, mapping_file)
-        print("模型训练完成并已保存")
-    else:
-        print("加载现有模型...")
-        model = load_model(model_file)
-        sign_mapping = load_sign_mapping(mapping_file)
-    
-    # 初始化串口
+    global send_enabled, sender, SEND_VERBOSE
+    parser = argparse.ArgumentParser(description="手语翻译系统")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="打印启动各阶段耗时（导入明细可配合 python -X importtime 查看）")
+    parser.add_argument('--no-log', action='store_true', help="不记录识别日志")
+    parser.add_argument('--log-raw', action='store_true', help="同时记录全部原始传感器样本")
+    parser.add_argument('--verbose-send', action='store_true', help="打印每一帧下发数据")
+    args = parser.parse_args()
+    profile.enabled = args.profile_startup
+    SEND_VERBOSE = args.verbose_send
+    profile.mark('模块导入完成')
+    
+    # 立即加载已有模型（或后备模型），训练和增量更新都在后台线程进行；
+    # 模型加载与串口打开、界面创建同时进行
+    loaded = {}
+    loader = threading.Thread(target=_load_model, args=(loaded,), name="ModelLoader", daemon=True)
+    loader.start()
+    
+    # 启动串口采集线程（在采集线程中打开串口）
     init_serial()
+    profile.mark('串口线程已启动')
     
-    # 启动传感器数据发送线程
-    threading.Timer(0.8, send_sensor_data).start()
-    
+    import tkinter as tk
+    from ui import SignLanguageDisplay
     root = tk.Tk()
-    app = SignLanguageDisplay(root, model, sign_mapping, read_serial_data, None)
+    profile.mark('Tk初始化完成')
+    
+    loader.join()
+    holder, store, trainer = loaded['online']
+    from online import Calibrator, build_recognizer
+    from network import CachedPredictor
+    calibrator = Calibrator(reader, store, trainer, holder, CALIBRATION_SECONDS)
+    
+    # 先用类中心距离预检，再运行MLP并按（温度标定后的）置信度拒识；静止时读数几乎不变，
+    # 量化后命中缓存即可跳过推理。模型更新后重建类中心、重新标定并清空缓存
+    recognizer, _ = build_recognizer(holder, store, REJECT_THRESHOLD, CACHE_BUCKET)
+    
+    # 启动传感器数据发送线程（单个长期运行的线程，按固定截止时间发送）
+    sender = PeriodicSender(SEND_INTERVAL, send_sensor_data)
+    sender.start()
+    
+    # 识别事件、保存的序列（以及可选的原始样本）由后台线程批量写入日志
+    logger = None
+    if not args.no_log:
+        from datalog import LogWriter
+        logger = LogWriter(LOG_DIR)
+        logger.start()
+        if args.log_raw and reader is not None:
+            logger.attach_reader(reader)
+    
+    # 识别由RecognitionService在后台线程中完成（与service.py同一条滤波/推理/表决流程），
+    # 界面和日志作为订阅者，界面只在有事件时被唤醒刷新
+    from service import RecognitionService, QueueSubscriber, ReaderDriver
+    service = RecognitionService(recognizer, holder.sign_mapping, stabilizer=stabilizer)
+    ui_events = service.subscribe(QueueSubscriber())
+    if logger is not None:
+        service.subscribe(logger.log_event)
+    worker = ReaderDriver(service, reader, RECOGNIZE_INTERVAL, STALE_TIMEOUT, on_status=ui_events,
+                          on_samples=lambda: profile.mark_once('首个手势可识别'))
+    worker.start()
+    app = SignLanguageDisplay(root, recognizer, holder.sign_mapping, None, None,
+                              event_queue=ui_events.queue, calibrator=calibrator,
+                              on_clear=worker.request_reset, logger=logger)
+    ui_events.notify = app.wakeup
+    profile.mark('界面创建完成')
+    if profile.enabled:
+        root.after(0, lambda: profile.mark('首次进入事件循环'))
+    
+    # kill -USR1 <pid> 随时导出延迟统计
+    if hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, dump_latency)
     root.mainloop()
     
+    worker.stop()
+    if logger is not None:
+        logger.stop()
+        print(f"日志: {logger.gestures}个手势事件, {logger.samples}个原始样本, {logger.files}个文件")
+    
     # 停止发送
     send_enabled = False
-    
-    if ser and ser.is_open:
-        ser.close()
+    sender.stop()
+    stats = sender.stats()
+    print(f"下发统计: {stats['ticks']}帧, 错过{stats['missed']}个周期, "
+          f"平均抖动{stats['mean_jitter'] * 1000:.2f}ms, 最大抖动{stats['max_jitter'] * 1000:.2f}ms")
+    
+    trainer.stop()
+    
+    # 停止采集线程并关闭串口
+    if reader is not None:
+        reader.stop()
+    
+    dump_latency()
+    if isinstance(recognizer, CachedPredictor):
+        cache = recognizer.stats()
+        print(f"预测缓存: 命中{cache['hits']}次, 未命中{cache['misses']}次, 命中率{cache['hit_rate']:.1%}")
+    if profile.enabled:
+        print(profile.report())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
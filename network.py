@@ -1,129 +1,931 @@
-import numpy as np
-from sklearn.neural_network import MLPClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.pipeline import make_pipeline
-import joblib
-import json
-
-# 使用新数据（data1.xlsx）并移除"喜欢"手势
-data = {
-    "手势": [
-        "OK", "", "", "", "",
-        "你", "", "", "", "",
-        "谢谢", "", "", "", "",
-        "明天见", "", "", "", "",
-        "好", "", "", "", "",
-        "对不起", "", "", "", "",
-        "没关系", "", "", "", ""
-    ],
-    "编号": [
-        1, 1, 1, 1, 1,
-        2, 2, 2, 2, 2,
-        3, 3, 3, 3, 3,
-        4, 4, 4, 4, 4,
-        5, 5, 5, 5, 5,
-        6, 6, 6, 6, 6,
-        7, 7, 7, 7, 7
-    ],
-    "A1": [
-        331, 332, 352, 355, 351,
-        636, 346, 652, 647, 670,
-        635, 632, 628, 625, 635,
-        314, 311, 310, 311, 312,
-        502, 501, 500, 499, 496,
-        312, 311, 310, 312, 312,
-        324, 326, 327, 326, 338
-    ],
-    "A2": [
-        303, 310, 328, 333, 326,
-        865, 855, 893, 889, 902,
-        835, 834, 830, 831, 835,
-        272, 271, 269, 268, 269,
-        822, 819, 820, 817, 820,
-        793, 781, 791, 785, 783,
-        339, 339, 338, 342, 338
-    ],
-    "A3": [
-        479, 480, 444, 447, 438,
-        336, 330, 336, 338, 338,
-        593, 593, 592, 593, 591,
-        324, 327, 326, 324, 325,
-        585, 582, 584, 584, 583,
-        566, 567, 565, 564, 562,
-        418, 423, 417, 414, 415
-    ],
-    "A4": [
-        959, 960, 979, 979, 978,
-        973, 927, 976, 974, 975,
-        975, 975, 975, 976, 975,
-        346, 346, 345, 345, 346,
-        346, 345, 346, 347, 345,
-        969, 970, 971, 971, 972,
-        975, 975, 975, 977, 977
-    ]
-}
-
-def get_features_and_labels():
-    """提取特征和标签，只使用A1-A4特征"""
-    # 特征矩阵：只包含A1-A4四列
-    features = np.array([data['A1'], data['A2'], data['A3'], data['A4']]).T
-    
-    # 标签向量
-    labels = np.array(data['编号'])
-    
-    # 创建手势名称映射（移除了"喜欢"）
-    sign_names = {}
-    for i, gesture in enumerate(data['手势']):
-        if gesture.strip():
-            sign_names[data['编号'][i]] = gesture
-    
-    return features, labels, sign_names
-
-def train_model():
-    """训练神经网络模型"""
-    X, y, sign_names = get_features_and_labels()
-    
-    # 创建预处理和模型管道
-    model = make_pipeline(
-        StandardScaler(),
-        MLPClassifier(
-            hidden_layer_sizes=(64, 32),
-            activation='relu',
-            solver='adam',
-            max_iter=1000,
-            random_state=42
-        )
-    )
-    
-    # 训练模型
-    model.fit(X, y)
-    return model, sign_names
-
-def save_model(model, model_path='model.joblib'):
-    joblib.dump(model, model_path)
-
-def load_model(model_path='model.joblib'):
-    return joblib.load(model_path)
-
-def save_sign_mapping(sign_names, mapping_path='sign_mapping.json'):
-    with open(mapping_path, 'w', encoding='utf-8') as f:
-        json.dump(sign_names, f, ensure_ascii=False)
-
-def load_sign_mapping(mapping_path='sign_mapping.json'):
-    with open(mapping_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def predict_gesture(model, sample):
-    sample = np.array(sample).reshape(1, -1)
-    return model.predict(sample)[0]
-
-if __name__ == "__main__":
-    # 训练并保存模型
-    model, sign_names = train_model()
-    save_model(model)
-    save_sign_mapping(sign_names)
-    
-    # 测试模型
-    test_sample = [331, 303, 479, 959]  # OK手势的A1-A4
-    prediction = predict_gesture(model, test_sample)
-    print(f"预测结果: {prediction} -> {sign_names[prediction]}")
\ No newline at end of file
+import numpy as np
+import hashlib
+import threading
+from collections import OrderedDict
+import json
+import os
+import time
+
+# sklearn/joblib只在训练和读写joblib模型时才导入，推理和加载.npz模型只需要NumPy
+
+ARTIFACT_VERSION = 1  # .npz模型文件格式版本
+
+UNKNOWN = -1  # 拒识：置信度不足或输入不像任何已知手势
+REJECT_THRESHOLD = 0.6  # 最大类别概率低于该值时拒识
+CACHE_BUCKET = 4  # 预测缓存的ADC量化步长
+CACHE_SIZE = 1024  # 预测缓存最多保存的条目数
+OOD_FACTOR = 4.0  # 到最近类中心的距离超过训练样本典型距离(95%分位)的该倍数时，不运行MLP直接拒识
+CALIBRATION_SAMPLES = 2000  # 温度标定使用的增强样本数
+
+# 使用新数据（data1.xlsx）并移除"喜欢"手势
+data = {
+    "手势": [
+        "OK", "", "", "", "",
+        "你", "", "", "", "",
+        "谢谢", "", "", "", "",
+        "明天见", "", "", "", "",
+        "好", "", "", "", "",
+        "对不起", "", "", "", "",
+        "没关系", "", "", "", ""
+    ],
+    "编号": [
+        1, 1, 1, 1, 1,
+        2, 2, 2, 2, 2,
+        3, 3, 3, 3, 3,
+        4, 4, 4, 4, 4,
+        5, 5, 5, 5, 5,
+        6, 6, 6, 6, 6,
+        7, 7, 7, 7, 7
+    ],
+    "A1": [
+        331, 332, 352, 355, 351,
+        636, 346, 652, 647, 670,
+        635, 632, 628, 625, 635,
+        314, 311, 310, 311, 312,
+        502, 501, 500, 499, 496,
+        312, 311, 310, 312, 312,
+        324, 326, 327, 326, 338
+    ],
+    "A2": [
+        303, 310, 328, 333, 326,
+        865, 855, 893, 889, 902,
+        835, 834, 830, 831, 835,
+        272, 271, 269, 268, 269,
+        822, 819, 820, 817, 820,
+        793, 781, 791, 785, 783,
+        339, 339, 338, 342, 338
+    ],
+    "A3": [
+        479, 480, 444, 447, 438,
+        336, 330, 336, 338, 338,
+        593, 593, 592, 593, 591,
+        324, 327, 326, 324, 325,
+        585, 582, 584, 584, 583,
+        566, 567, 565, 564, 562,
+        418, 423, 417, 414, 415
+    ],
+    "A4": [
+        959, 960, 979, 979, 978,
+        973, 927, 976, 974, 975,
+        975, 975, 975, 976, 975,
+        346, 346, 345, 345, 346,
+        346, 345, 346, 347, 345,
+        969, 970, 971, 971, 972,
+        975, 975, 975, 977, 977
+    ]
+}
+
+def get_features_and_labels():
+    """提取特征和标签，只使用A1-A4特征"""
+    # 特征矩阵：只包含A1-A4四列
+    features = np.array([data['A1'], data['A2'], data['A3'], data['A4']]).T
+    
+    # 标签向量
+    labels = np.array(data['编号'])
+    
+    # 创建手势名称映射（移除了"喜欢"）
+    sign_names = {}
+    for i, gesture in enumerate(data['手势']):
+        if gesture.strip():
+            sign_names[data['编号'][i]] = gesture
+    
+    return features, labels, sign_names
+
+def train_model(X=None, y=None):
+    """训练神经网络模型，X/y为None时使用内置数据"""
+    from sklearn.neural_network import MLPClassifier
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.pipeline import make_pipeline
+    
+    base_X, base_y, sign_names = get_features_and_labels()
+    if X is None:
+        X, y = base_X, base_y
+    
+    # 创建预处理和模型管道
+    model = make_pipeline(
+        StandardScaler(),
+        MLPClassifier(
+            hidden_layer_sizes=(64, 32),
+            activation='relu',
+            solver='adam',
+            max_iter=1000,
+            random_state=42
+        )
+    )
+    
+    # 训练模型
+    model.fit(X, y)
+    return model, sign_names
+
+def restore_pipeline(predictor, alpha=0.0001):
+    """由FastPredictor的参数重建 StandardScaler + MLPClassifier 管道，用于partial_fit增量训练
+
+    先用每类一个样本调用一次partial_fit初始化sklearn的内部状态（类别编码、优化器），
+    再写入原有参数，重建的管道与predictor的预测一致。alpha为L2正则系数，应与训练时相同。
+    """
+    from sklearn.neural_network import MLPClassifier
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.pipeline import make_pipeline
+
+    width = len(predictor.mean)
+    scaler = StandardScaler().fit(np.zeros((2, width)))
+    scaler.mean_ = predictor.mean.copy()
+    scaler.scale_ = predictor.scale.copy()
+    scaler.var_ = predictor.scale ** 2
+    mlp = MLPClassifier(
+        hidden_layer_sizes=tuple(w.shape[1] for w in predictor.coefs[:-1]),
+        activation=predictor.activation,
+        solver='adam',
+        alpha=alpha,
+        max_iter=1000,
+        random_state=42
+    )
+    classes = predictor.classes
+    mlp.partial_fit(np.zeros((len(classes), width)), classes, classes=classes)
+    if mlp.out_activation_ != predictor.out_activation:
+        raise ValueError(f"输出层激活函数不一致: {mlp.out_activation_}/{predictor.out_activation}")
+    for param, value in zip(mlp.coefs_ + mlp.intercepts_, predictor.coefs + predictor.intercepts):
+        param[...] = value
+    return make_pipeline(scaler, mlp)
+
+def _atomic_write(path, write):
+    """先写临时文件再替换，其他进程/线程不会读到写了一半的文件"""
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+def save_model(model, model_path='model.joblib'):
+    import joblib
+    _atomic_write(model_path, lambda p: joblib.dump(model, p))
+
+def load_model(model_path='model.joblib'):
+    import joblib
+    return joblib.load(model_path)
+
+def save_sign_mapping(sign_names, mapping_path='sign_mapping.json'):
+    def write(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(sign_names, f, ensure_ascii=False)
+    _atomic_write(mapping_path, write)
+
+def load_sign_mapping(mapping_path='sign_mapping.json'):
+    with open(mapping_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_or_train(model_path='model.joblib', mapping_path='sign_mapping.json'):
+    """加载模型和手势映射，文件不存在时重新训练并保存"""
+    if not os.path.exists(model_path) or not os.path.exists(mapping_path):
+        print("训练模型...")
+        model, sign_mapping = train_model()
+        save_model(model, model_path)
+        save_sign_mapping(sign_mapping, mapping_path)
+        print("模型训练完成并已保存")
+        # 与从JSON加载的映射保持一致（键为字符串）
+        sign_mapping = {str(k): v for k, v in sign_mapping.items()}
+    else:
+        print("加载现有模型...")
+        model = load_model(model_path)
+        sign_mapping = load_sign_mapping(mapping_path)
+    return model, sign_mapping
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+def _logistic(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+def _softmax(x):
+    x = x - x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+ACTIVATIONS = {
+    'identity': lambda x: x,
+    'relu': _relu,
+    'tanh': np.tanh,
+    'logistic': _logistic,
+    'softmax': _softmax,
+}
+
+class FastPredictor:
+    """从 StandardScaler + MLPClassifier 管道中提取参数，
+    用纯NumPy矩阵运算做批量推理，跳过sklearn每次调用的输入校验"""
+
+    def __init__(self, model):
+        scaler, mlp = model[0], model[-1]
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64)
+        self.coefs = [np.asarray(w, dtype=np.float64) for w in mlp.coefs_]
+        self.intercepts = [np.asarray(b, dtype=np.float64) for b in mlp.intercepts_]
+        self.activation = mlp.activation
+        self.out_activation = mlp.out_activation_
+        self.classes = np.asarray(mlp.classes_)
+
+    @classmethod
+    def from_params(cls, mean, scale, coefs, intercepts, activation, out_activation, classes):
+        """直接由参数数组构造（用于从.npz模型文件加载）"""
+        self = cls.__new__(cls)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.coefs = [np.asarray(w, dtype=np.float64) for w in coefs]
+        self.intercepts = [np.asarray(b, dtype=np.float64) for b in intercepts]
+        self.activation = activation
+        self.out_activation = out_activation
+        self.classes = np.asarray(classes)
+        return self
+
+    def predict_proba(self, X):
+        """X: (N, 4) 原始ADC值，返回 (N, 类别数) 概率"""
+        x = np.array(X, dtype=np.float64, ndmin=2)
+        x -= self.mean
+        x /= self.scale
+        hidden = ACTIVATIONS[self.activation]
+        last = len(self.coefs) - 1
+        for i, (w, b) in enumerate(zip(self.coefs, self.intercepts)):
+            x = x @ w
+            x += b
+            if i != last:
+                x = hidden(x)
+        x = ACTIVATIONS[self.out_activation](x)
+        if x.shape[1] == 1:
+            # 二分类时输出层只有一个logistic单元
+            x = np.hstack([1 - x, x])
+        return x
+
+    def predict_batch(self, X):
+        """返回 (标签[N], 概率[N, 类别数])"""
+        proba = self.predict_proba(X)
+        return self.classes[proba.argmax(axis=1)], proba
+
+    def predict(self, X):
+        return self.predict_batch(X)[0]
+
+class CentroidPredictor:
+    """最近类中心分类器：标准化后按到各类均值的距离分类
+
+    无需迭代训练、构造即可使用，作为MLP训练完成前的后备模型。
+    """
+
+    def __init__(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y)
+        self.mean = X.mean(axis=0)
+        self.scale = X.std(axis=0)
+        self.scale[self.scale == 0] = 1.0
+        self.classes = np.unique(y)
+        Z = (X - self.mean) / self.scale
+        self.centroids = np.array([Z[y == c].mean(axis=0) for c in self.classes])
+
+    @classmethod
+    def from_params(cls, mean, scale, centroids, classes):
+        """直接由参数数组构造（用于从.npz模型文件加载）"""
+        self = cls.__new__(cls)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.centroids = np.asarray(centroids, dtype=np.float64)
+        self.classes = np.asarray(classes)
+        return self
+
+    def distances(self, X):
+        """到各类中心的平方距离 (N, 类别数)"""
+        Z = (np.array(X, dtype=np.float64, ndmin=2) - self.mean) / self.scale
+        return ((Z[:, None, :] - self.centroids[None, :, :]) ** 2).sum(axis=2)
+
+    def predict_proba(self, X):
+        return _softmax(-self.distances(X))
+
+    def predict_batch(self, X):
+        proba = self.predict_proba(X)
+        return self.classes[proba.argmax(axis=1)], proba
+
+    def predict(self, X):
+        return self.classes[self.distances(X).argmin(axis=1)]
+
+class TreeEnsemblePredictor:
+    """随机森林/梯度提升树的NumPy推理：所有树的节点展开成扁平数组，
+    所有样本在所有树上同时逐层下降，固定走max_depth步（叶节点指向自身）
+
+    value[节点]为该叶节点对各类别输出的贡献：随机森林为归一化的类别比例
+    （output='mean'，取平均即为概率），梯度提升为已乘学习率的叶节点值
+    （output='boosting'，累加init后经softmax/logistic得到概率）。
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, depth, classes,
+                 output='mean', init=None):
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.intp)
+        self.right = np.asarray(right, dtype=np.intp)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.depth = int(depth)
+        self.classes = np.asarray(classes)
+        self.output = output
+        self.init = None if init is None else np.asarray(init, dtype=np.float64)
+
+    @classmethod
+    def from_model(cls, model):
+        """由RandomForestClassifier或GradientBoostingClassifier构造"""
+        boosting = hasattr(model, 'learning_rate')
+        if boosting:
+            # estimators_[级, 输出]，多分类时每级每个类别一棵回归树
+            trees = [(tree, k) for stage in model.estimators_ for k, tree in enumerate(stage)]
+            n_outputs = model.estimators_.shape[1]
+        else:
+            trees = [(tree, None) for tree in model.estimators_]
+            n_outputs = len(model.classes_)
+        feature, threshold, left, right, value, roots = [], [], [], [], [], []
+        offset, depth = 0, 0
+        for estimator, k in trees:
+            t = estimator.tree_
+            n = t.node_count
+            leaf = t.children_left < 0
+            ids = np.arange(offset, offset + n)
+            feature.append(np.where(leaf, 0, t.feature))
+            threshold.append(np.where(leaf, np.inf, t.threshold))
+            left.append(np.where(leaf, ids, t.children_left + offset))
+            right.append(np.where(leaf, ids, t.children_right + offset))
+            v = np.zeros((n, n_outputs))
+            if boosting:
+                v[:, k] = t.value[:, 0, 0] * model.learning_rate
+            else:
+                counts = t.value[:, 0, :]
+                v[:] = counts / np.maximum(counts.sum(axis=1, keepdims=True), 1e-300)
+            value.append(v)
+            roots.append(offset)
+            offset += n
+            depth = max(depth, t.max_depth)
+        self = cls(np.concatenate(feature), np.concatenate(threshold), np.concatenate(left),
+                   np.concatenate(right), np.concatenate(value), roots, depth, model.classes_,
+                   'boosting' if boosting else 'mean')
+        if boosting:
+            # 初始估计对所有样本相同，由decision_function减去各树贡献得到
+            x0 = np.zeros((1, model.n_features_in_))
+            raw = np.asarray(model.decision_function(x0), dtype=np.float64).reshape(1, -1)
+            self.init = raw[0] - self._raw(x0)[0]
+        return self
+
+    def _raw(self, X):
+        # sklearn的树以float32比较特征，这里保持一致以得到完全相同的分支
+        x = np.array(X, dtype=np.float32, ndmin=2)
+        rows = np.arange(len(x))[:, None]
+        node = np.broadcast_to(self.roots, (len(x), len(self.roots)))
+        for _ in range(self.depth):
+            go_left = x[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.value[node].sum(axis=1)
+
+    def predict_proba(self, X):
+        raw = self._raw(X)
+        if self.output == 'mean':
+            return raw / len(self.roots)
+        raw += self.init
+        if raw.shape[1] == 1:
+            p = _logistic(raw)
+            return np.hstack([1 - p, p])
+        return _softmax(raw)
+
+    def predict_batch(self, X):
+        proba = self.predict_proba(X)
+        return self.classes[proba.argmax(axis=1)], proba
+
+    def predict(self, X):
+        return self.predict_batch(X)[0]
+
+    @property
+    def node_count(self):
+        return len(self.feature)
+
+def compile_model(model):
+    """把训练好的模型转换为纯NumPy推理对象：
+    StandardScaler+MLP管道 -> FastPredictor，随机森林/梯度提升 -> TreeEnsemblePredictor，
+    已是NumPy推理对象（如CentroidPredictor）的原样返回"""
+    if hasattr(model, 'predict_batch'):
+        return model
+    if hasattr(model, 'estimators_'):
+        return TreeEnsemblePredictor.from_model(model)
+    return FastPredictor(model)
+
+def calibration_metrics(proba, classes, y, threshold=REJECT_THRESHOLD, bins=10):
+    """概率校准指标：负对数似然(NLL)、期望校准误差(ECE，按最大概率等宽分箱，
+    各箱|准确率-平均置信度|按样本数加权)，以及最大概率低于threshold的比例"""
+    proba = np.asarray(proba)
+    y = np.asarray(y)
+    nll = -np.log(np.maximum(proba[np.arange(len(y)), np.searchsorted(classes, y)], 1e-12)).mean()
+    confidence = proba.max(axis=1)
+    correct = np.asarray(classes)[proba.argmax(axis=1)] == y
+    bin_idx = np.minimum((confidence * bins).astype(int), bins - 1)
+    ece = 0.0
+    for b in np.unique(bin_idx):
+        in_bin = bin_idx == b
+        ece += in_bin.mean() * abs(correct[in_bin].mean() - confidence[in_bin].mean())
+    return {'nll': float(nll), 'ece': float(ece), 'rejected': float((confidence < threshold).mean())}
+
+def format_calibration(calibration):
+    if calibration is None:
+        return "置信度未标定"
+    before, after = calibration['before'], calibration['after']
+    return (f"置信度温度标定: T={calibration['temperature']:.2f} ({calibration['samples']}个增强样本), "
+            f"NLL {before['nll']:.3f}->{after['nll']:.3f}, ECE {before['ece']:.3f}->{after['ece']:.3f}, "
+            f"拒识比例 {before['rejected']:.1%}->{after['rejected']:.1%}")
+
+class RejectingPredictor:
+    """带拒识的识别：先用最近类中心距离做廉价预检，离所有类中心都太远
+    （手放松、传感器异常等）的样本直接判为UNKNOWN，不运行MLP；
+    其余样本运行MLP，最大概率（经温度缩放校准）低于threshold时也判为UNKNOWN。
+    
+    model可以是FastPredictor或online.ModelHolder等提供predict_batch的对象。
+    """
+
+    def __init__(self, model, X, y, threshold=REJECT_THRESHOLD, ood_factor=OOD_FACTOR, temperature=1.0):
+        self.model = model
+        self.threshold = threshold
+        self.ood_factor = ood_factor
+        self.temperature = temperature
+        self.checked = 0  # 经过预检的样本数
+        self.skipped = 0  # 预检拒识、跳过MLP的样本数
+        self.calibration = None
+        self.refit(X, y)
+
+    def refit(self, X, y):
+        """用（新的）训练数据重建类中心和距离上限，模型替换后调用"""
+        centroids = CentroidPredictor(X, y)
+        distances = centroids.distances(X)
+        own = distances[np.arange(len(y)), np.searchsorted(centroids.classes, y)]
+        # distances为平方距离，阈值按距离的倍数换算；用分位数避免个别离群样本放宽阈值
+        max_distance = float(np.percentile(own, 95)) * self.ood_factor ** 2
+        # 类中心和距离上限作为一个元组整体替换，识别线程不会看到新旧混合的一对
+        self._precheck = (centroids, max_distance)
+
+    @property
+    def centroids(self):
+        return self._precheck[0]
+
+    @property
+    def max_distance(self):
+        return self._precheck[1]
+
+    def recognize(self, X):
+        """返回 (标签[N]，拒识为UNKNOWN, 置信度[N], 各类别概率[N, 类别数])"""
+        X = np.array(X, dtype=np.float64, ndmin=2)
+        n = len(X)
+        centroids, max_distance = self._precheck
+        near = centroids.distances(X).min(axis=1) <= max_distance
+        self.checked += n
+        self.skipped += n - int(near.sum())
+        labels = np.full(n, UNKNOWN)
+        confidence = np.zeros(n)
+        if not near.any():
+            return labels, confidence, np.zeros((n, len(centroids.classes)))
+        near_labels, near_proba = self.model.predict_batch(X[near])
+        near_proba = self.scale_proba(near_proba)
+        proba = np.zeros((n, near_proba.shape[1]))
+        proba[near] = near_proba
+        confidence[near] = near_proba.max(axis=1)
+        labels[near] = np.where(confidence[near] >= self.threshold, near_labels, UNKNOWN)
+        return labels, confidence, proba
+
+    def scale_proba(self, proba):
+        """温度缩放后的概率，等价于softmax输出层的logits除以温度（固件中的NN_TEMPERATURE）"""
+        if self.temperature == 1.0:
+            return proba
+        return _softmax(np.log(np.maximum(proba, 1e-12)) / self.temperature)
+
+    def fit_temperature(self, X, y, grid=np.linspace(0.25, 5.0, 39)):
+        """在验证集上选择使负对数似然最小的温度（只影响置信度，不改变类别）
+
+        只使用通过类中心预检、且类别为模型已知的样本，阈值只作用于这些样本的置信度。
+        校准前后的NLL/ECE及拒识比例保存在self.calibration。
+        """
+        X = np.array(X, dtype=np.float64, ndmin=2)
+        y = np.asarray(y)
+        classes = self.model.classes
+        centroids, max_distance = self._precheck
+        keep = (centroids.distances(X).min(axis=1) <= max_distance) & np.isin(y, classes)
+        X, y = X[keep], y[keep]
+        if not len(y):
+            return self.temperature
+        _, proba = self.model.predict_batch(X)
+        rows = np.arange(len(y))
+        cols = np.searchsorted(classes, y)
+        logp = np.log(np.maximum(proba, 1e-12))
+
+        def nll(t):
+            return -np.log(np.maximum(_softmax(logp / t)[rows, cols], 1e-12)).mean()
+
+        self.temperature = float(min(grid, key=nll))
+        self.calibration = {
+            'temperature': self.temperature,
+            'samples': len(y),
+            'before': calibration_metrics(proba, classes, y, self.threshold),
+            'after': calibration_metrics(_softmax(logp / self.temperature), classes, y, self.threshold),
+        }
+        return self.temperature
+
+    def calibrate(self, X, y, n=CALIBRATION_SAMPLES, seed=0):
+        """用训练数据的增强样本（漂移、抖动、姿态插值，近似未见过的读数）拟合温度，
+        返回self.calibration；模型替换后应与refit一起重新调用"""
+        from dataset import augment
+        X_cal, y_cal = augment(X, y, n, np.random.default_rng(seed))
+        self.fit_temperature(X_cal, y_cal)
+        return self.calibration
+
+    def predict_batch(self, X):
+        labels, _, proba = self.recognize(X)
+        return labels, proba
+
+    def predict(self, X):
+        return self.recognize(X)[0]
+
+class CachedPredictor:
+    """以量化后的传感器向量为键的LRU预测缓存
+
+    手套静止时连续读数几乎相同，按bucket(ADC值)量化后落在同一格的样本
+    直接复用上次的识别结果。模型替换后需调用invalidate()（通过
+    ModelHolder.add_listener自动完成）。model可以带recognize（拒识）。
+    """
+
+    def __init__(self, model, bucket=CACHE_BUCKET, maxsize=CACHE_SIZE):
+        self.model = model
+        self.bucket = bucket
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._generation = 0  # invalidate()时加1，推理期间被清空的结果不再写回
+
+    def invalidate(self, *_):
+        with self._lock:
+            self._cache.clear()
+            self.invalidations += 1
+            self._generation += 1
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            size, invalidations = len(self._cache), self.invalidations
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+            'size': size,
+            'invalidations': invalidations,
+        }
+
+    def _compute(self, X):
+        if hasattr(self.model, 'recognize'):
+            return self.model.recognize(X)
+        labels, proba = self.model.predict_batch(X)
+        return labels, proba.max(axis=1), proba
+
+    def recognize(self, X):
+        """返回 (标签[N], 置信度[N], 概率[N, 类别数])，未命中的样本合并成一批推理"""
+        X = np.array(X, dtype=np.float64, ndmin=2)
+        keys = (X // self.bucket).astype(np.int32)
+        keys = [keys[i].tobytes() for i in range(len(keys))]
+        results = [None] * len(keys)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                hit = self._cache.get(key)
+                if hit is None:
+                    missing.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    results[i] = hit
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+            generation = self._generation
+        if missing:
+            labels, confidence, proba = self._compute(X[missing])
+            with self._lock:
+                # 推理期间模型被替换时，结果来自旧模型，只返回给本次调用、不写入缓存
+                store = generation == self._generation
+                for j, i in enumerate(missing):
+                    results[i] = (labels[j], confidence[j], proba[j])
+                    if store:
+                        self._cache[keys[i]] = results[i]
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+        if len(results) == 1:
+            label, confidence, proba = results[0]
+            return np.array([label]), np.array([confidence]), proba[None, :]
+        labels, confidence, proba = zip(*results)
+        return np.array(labels), np.array(confidence), np.array(proba)
+
+    def predict_batch(self, X):
+        labels, _, proba = self.recognize(X)
+        return labels, proba
+
+    def predict(self, X):
+        return self.recognize(X)[0]
+
+def predict_batch(model, samples):
+    """对 (N, 4) 的缓冲样本批量推理，返回 (标签[N], 概率[N, 类别数])"""
+    samples = np.asarray(samples).reshape(-1, 4)
+    if hasattr(model, 'predict_batch'):
+        return model.predict_batch(samples)
+    proba = model.predict_proba(samples)
+    return model.classes_[proba.argmax(axis=1)], proba
+
+def verify_fast_predictor(model, X=None):
+    """检查FastPredictor与model.predict在训练数据上的结果完全一致"""
+    if X is None:
+        X, _, _ = get_features_and_labels()
+    fast = FastPredictor(model)
+    labels, proba = fast.predict_batch(X)
+    return (np.array_equal(labels, model.predict(X))
+            and np.allclose(proba, model.predict_proba(X), rtol=0, atol=1e-12))
+
+def data_hash(X, y):
+    """训练数据的SHA-256，用于判断模型是否由当前数据训练"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(X, dtype='<f8').tobytes())
+    digest.update(np.ascontiguousarray(y, dtype='<i8').tobytes())
+    return digest.hexdigest()
+
+def _artifact_arrays(model):
+    """返回 (模型类型相关的header字段, 参数数组)"""
+    predictor = compile_model(model)
+    if isinstance(predictor, CentroidPredictor):
+        return {'kind': 'centroid'}, {
+            'mean': predictor.mean, 'scale': predictor.scale,
+            'centroids': predictor.centroids, 'classes': predictor.classes,
+        }
+    if isinstance(predictor, TreeEnsemblePredictor):
+        arrays = {
+            'feature': predictor.feature.astype(np.int32),
+            'threshold': predictor.threshold,
+            'left': predictor.left.astype(np.int32),
+            'right': predictor.right.astype(np.int32),
+            'value': predictor.value,
+            'roots': predictor.roots.astype(np.int32),
+            'classes': predictor.classes,
+        }
+        if predictor.init is not None:
+            arrays['init'] = predictor.init
+        return {'kind': 'trees', 'output': predictor.output, 'depth': predictor.depth}, arrays
+    fields = {
+        'kind': 'mlp',
+        'activation': predictor.activation,
+        'out_activation': predictor.out_activation,
+        'layers': len(predictor.coefs),
+    }
+    arrays = {'mean': predictor.mean, 'scale': predictor.scale, 'classes': predictor.classes}
+    for i, (w, b) in enumerate(zip(predictor.coefs, predictor.intercepts)):
+        arrays[f'W{i}'] = w
+        arrays[f'b{i}'] = b
+    return fields, arrays
+
+def save_artifact(model, sign_mapping, path='model.npz', X=None, y=None, meta=None):
+    """把模型保存为 .npz
+    
+    model可以是 StandardScaler + MLPClassifier 管道或FastPredictor（数组: mean, scale,
+    classes, W0..Wn, b0..bn）、随机森林/梯度提升（展开后的树节点数组）或CentroidPredictor。
+    header为UTF-8编码的JSON，包含格式版本、模型类型(kind)、训练数据哈希和
+    手势映射。X/y为训练数据，为None时使用内置数据；meta中的字段会合并进header。
+    """
+    try:
+        import sklearn
+        sklearn_version = sklearn.__version__
+    except ImportError:
+        # FastPredictor/CentroidPredictor不依赖sklearn，未安装时照常保存
+        sklearn_version = None
+    if X is None:
+        X, y, _ = get_features_and_labels()
+    fields, arrays = _artifact_arrays(model)
+    header = {
+        'version': ARTIFACT_VERSION,
+        **fields,
+        'data_hash': data_hash(X, y),
+        'sign_mapping': {str(k): v for k, v in sign_mapping.items()},
+        'sklearn_version': sklearn_version,
+        'created': time.time(),
+        **(meta or {}),
+    }
+    arrays['header'] = np.frombuffer(json.dumps(header, ensure_ascii=False).encode('utf-8'), dtype=np.uint8)
+    
+    def write(tmp_path):
+        # 传入文件对象，避免np.savez给临时文件名追加.npz后缀
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+    _atomic_write(path, write)
+
+def _load_trees(f, header):
+    arrays = {name: f[name] for name in ('feature', 'threshold', 'left', 'right', 'value', 'roots', 'classes')}
+    n = len(arrays['feature'])
+    if not all(len(arrays[name]) == n for name in ('threshold', 'left', 'right', 'value')):
+        raise ValueError("模型文件树节点数组长度不一致")
+    if n and (arrays['left'].min() < 0 or max(arrays['left'].max(), arrays['right'].max()) >= n):
+        raise ValueError("模型文件树节点索引越界")
+    init = f['init'] if 'init' in f.files else None
+    return TreeEnsemblePredictor(init=init, depth=header['depth'], output=header['output'], **arrays)
+
+def _load_mlp(f, header):
+    if header['activation'] not in ACTIVATIONS or header['out_activation'] not in ACTIVATIONS:
+        raise ValueError(f"不支持的激活函数: {header['activation']}/{header['out_activation']}")
+    coefs = [f[f'W{i}'] for i in range(header['layers'])]
+    intercepts = [f[f'b{i}'] for i in range(header['layers'])]
+    mean, scale, classes = f['mean'], f['scale'], f['classes']
+    width = len(mean)
+    for w, b in zip(coefs, intercepts):
+        if w.ndim != 2 or w.shape[0] != width or b.shape != (w.shape[1],):
+            raise ValueError(f"模型文件层形状不匹配: {w.shape} / {b.shape}")
+        width = w.shape[1]
+    if width not in (len(classes), 1) or scale.shape != mean.shape:
+        raise ValueError("模型文件输出层与类别数不匹配")
+    return FastPredictor.from_params(mean, scale, coefs, intercepts, header['activation'],
+                                     header['out_activation'], classes)
+
+def load_artifact_header(path='model.npz'):
+    """只读取 .npz 模型的header"""
+    with np.load(path, allow_pickle=False) as f:
+        return json.loads(f['header'].tobytes().decode('utf-8'))
+
+def load_artifact(path='model.npz'):
+    """加载 .npz 模型，返回 (推理对象, 手势映射, header)，不导入sklearn
+    
+    推理对象按header中的kind为FastPredictor、TreeEnsemblePredictor或
+    CentroidPredictor（早期文件没有kind字段，均为MLP）。
+    格式版本不支持或数组形状不匹配时抛出ValueError。
+    """
+    with np.load(path, allow_pickle=False) as f:
+        header = json.loads(f['header'].tobytes().decode('utf-8'))
+        if header.get('version') != ARTIFACT_VERSION:
+            raise ValueError(f"不支持的模型文件版本: {header.get('version')}")
+        kind = header.get('kind', 'mlp')
+        if kind == 'mlp':
+            predictor = _load_mlp(f, header)
+        elif kind == 'trees':
+            predictor = _load_trees(f, header)
+        elif kind == 'centroid':
+            predictor = CentroidPredictor.from_params(f['mean'], f['scale'], f['centroids'], f['classes'])
+        else:
+            raise ValueError(f"不支持的模型类型: {kind}")
+    return predictor, header['sign_mapping'], header
+
+def fold_scaler(model):
+    """把StandardScaler折叠进第一层: W' = W / scale, b' = b - (mean / scale) @ W
+    返回每层的 (权重[in, out], 偏置[out])，可直接输入原始ADC值"""
+    scaler, mlp = model[0], model[-1]
+    coefs = [np.asarray(w, dtype=np.float64) for w in mlp.coefs_]
+    intercepts = [np.asarray(b, dtype=np.float64) for b in mlp.intercepts_]
+    scale = np.asarray(scaler.scale_, dtype=np.float64)
+    mean = np.asarray(scaler.mean_, dtype=np.float64)
+    intercepts[0] = intercepts[0] - (mean / scale) @ coefs[0]
+    coefs[0] = coefs[0] / scale[:, None]
+    return list(zip(coefs, intercepts))
+
+def _fixed_point_multiplier(m):
+    """把正实数倍率表示为 (int32乘数, 右移位数)，乘数落在[2^30, 2^31)"""
+    shift = 30
+    while m * (1 << shift) < (1 << 30) and shift < 62:
+        shift += 1
+    while m * (1 << shift) >= (1 << 31):
+        shift -= 1
+    return int(round(m * (1 << shift))), shift
+
+class QuantizedMLP:
+    """int8对称量化的MLP：原始ADC值(int16)输入，int8权重、int32累加、
+    每层一个定点重缩放(乘数+右移)，全程只有整数运算
+
+    隐藏层激活量化到[0, 127]（仅支持ReLU），输出层返回int32 logits，
+    其argmax即为预测类别。
+    """
+
+    def __init__(self, weights, biases, multipliers, shifts, classes, logit_scale):
+        self.weights = weights          # 每层int8权重 [in, out]
+        self.biases = biases            # 每层int32偏置
+        self.multipliers = multipliers  # 隐藏层重缩放乘数
+        self.shifts = shifts            # 隐藏层重缩放右移位数
+        self.classes = np.asarray(classes)
+        self.logit_scale = logit_scale  # 输出logits的实数刻度，仅用于计算概率
+
+    @classmethod
+    def from_model(cls, model, X_calib=None):
+        """由训练好的管道量化生成，X_calib用于校准各隐藏层激活的范围"""
+        mlp = model[-1]
+        if mlp.activation != 'relu':
+            raise ValueError(f"整数推理只支持relu隐藏层，当前为{mlp.activation}")
+        if X_calib is None:
+            X_calib, _, _ = get_features_and_labels()
+        layers = fold_scaler(model)
+        x = np.asarray(X_calib, dtype=np.float64)
+        in_scale = 1.0  # 原始ADC值本身就是整数
+        weights, biases, multipliers, shifts = [], [], [], []
+        for i, (w, b) in enumerate(layers):
+            w_scale = np.abs(w).max() / 127 or 1.0
+            acc_scale = in_scale * w_scale
+            weights.append(np.clip(np.round(w / w_scale), -127, 127).astype(np.int8))
+            biases.append(np.round(b / acc_scale).astype(np.int32))
+            x = x @ w + b
+            if i == len(layers) - 1:
+                break
+            x = np.maximum(x, 0)
+            out_scale = x.max() / 127 or 1.0
+            multiplier, shift = _fixed_point_multiplier(acc_scale / out_scale)
+            multipliers.append(multiplier)
+            shifts.append(shift)
+            in_scale = out_scale
+        return cls(weights, biases, multipliers, shifts, mlp.classes_, acc_scale)
+
+    def predict_logits(self, X):
+        """整数推理，返回 (N, 类别数) 的int64 logits"""
+        x = np.array(X, dtype=np.int64, ndmin=2)
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            acc = x @ w.astype(np.int64)
+            acc += b
+            if i == last:
+                return acc
+            np.maximum(acc, 0, out=acc)
+            shift = self.shifts[i]
+            acc = (acc * self.multipliers[i] + (1 << (shift - 1))) >> shift
+            x = np.minimum(acc, 127, out=acc)
+
+    def predict_proba(self, X):
+        return _softmax(self.predict_logits(X) * self.logit_scale)
+
+    def predict_batch(self, X):
+        logits = self.predict_logits(X)
+        return self.classes[logits.argmax(axis=1)], _softmax(logits * self.logit_scale)
+
+    def predict(self, X):
+        return self.classes[self.predict_logits(X).argmax(axis=1)]
+
+    def nbytes(self):
+        return (sum(w.nbytes for w in self.weights) + sum(b.nbytes for b in self.biases)
+                + 8 * len(self.multipliers))
+
+def quantize_model(model, X_calib=None):
+    return QuantizedMLP.from_model(model, X_calib)
+
+def quantization_report(model, qmodel=None, X=None, y=None, repeat=2000):
+    """比较float模型与int8模型的准确率、一致率、推理耗时和参数大小
+
+    float_bytes为FastPredictor实际占用（float64），float32_bytes为固件中float32参数的大小，
+    与int8_bytes对比的是后者。
+    """
+    if X is None:
+        X, y, _ = get_features_and_labels()
+    if qmodel is None:
+        qmodel = quantize_model(model, X)
+    fast = FastPredictor(model)
+    float_pred = fast.predict(X)
+    int_pred = qmodel.predict(X)
+
+    def per_sample_us(predictor):
+        sample = X[:1]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            predictor.predict(sample)
+        return (time.perf_counter() - start) / repeat * 1e6
+
+    return {
+        'float_accuracy': float(np.mean(float_pred == y)),
+        'int8_accuracy': float(np.mean(int_pred == y)),
+        'agreement': float(np.mean(float_pred == int_pred)),
+        'float_us': per_sample_us(fast),
+        'int8_us': per_sample_us(qmodel),
+        'float_bytes': sum(w.nbytes + b.nbytes for w, b in zip(fast.coefs, fast.intercepts)),
+        'float32_bytes': sum(w.size + b.size for w, b in zip(fast.coefs, fast.intercepts)) * 4,
+        'int8_bytes': qmodel.nbytes(),
+    }
+
+def predict_gesture(model, sample):
+    return predict_batch(model, sample)[0][0]
+
+if __name__ == "__main__":
+    # 训练并保存模型
+    model, sign_names = train_model()
+    save_model(model)
+    save_sign_mapping(sign_names)
+    save_artifact(model, sign_names)
+    
+    # 测试模型
+    test_sample = [331, 303, 479, 959]  # OK手势的A1-A4
+    prediction = predict_gesture(model, test_sample)
+    print(f"预测结果: {prediction} -> {sign_names[prediction]}")
+    
+    # 验证快速推理路径与sklearn一致，并比较单样本推理耗时
+    fast = FastPredictor(model)
+    print(f"快速推理结果一致: {verify_fast_predictor(model)}")
+    artifact, _, _ = load_artifact()
+    X, _, _ = get_features_and_labels()
+    print(f".npz模型结果一致: {np.array_equal(artifact.predict_proba(X), fast.predict_proba(X))}")
+    for name, predictor in (("sklearn", model), ("FastPredictor", fast)):
+        start = time.perf_counter()
+        for _ in range(1000):
+            predictor.predict([test_sample])
+        print(f"{name}: {(time.perf_counter() - start) * 1000:.3f}us/次")
+    
+    # int8量化模型的准确率损失与加速比
+    report = quantization_report(model)
+    print(f"float准确率: {report['float_accuracy']:.3f}, int8准确率: {report['int8_accuracy']:.3f}, "
+          f"一致率: {report['agreement']:.3f}")
+    print(f"float: {report['float_us']:.1f}us/次 {report['float_bytes']}字节(float32 {report['float32_bytes']}字节), "
+          f"int8: {report['int8_us']:.1f}us/次 {report['int8_bytes']}字节")
\ No newline at end of file
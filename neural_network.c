@@ -1,52 +1,200 @@
-#include "bsp/neural_network.h"
-#define INPUT_NODES 5
-#define HIDDEN_NODES 8
-#define OUTPUT_NODES 12
-
-const float weights_input_hidden[INPUT_NODES][HIDDEN_NODES] = {0,
-};
-
-const float weights_hidden_output[HIDDEN_NODES][OUTPUT_NODES] = {0
-};
-
-float sigmoid(float x) {
-    return 1.0f / (1.0f + expf(-x));
-}
-
-void nn_init() {
-}
-
-int nn_inference(const float *input, float *output) {
-    float hidden[HIDDEN_NODES] = {0};
-    
-    for (int j = 0; j < HIDDEN_NODES; j++) {
-        for (int i = 0; i < INPUT_NODES; i++) {
-            hidden[j] += input[i] * weights_input_hidden[i][j];
-        }
-        hidden[j] = sigmoid(hidden[j]);
-    }
-    
-    for (int k = 0; k < OUTPUT_NODES; k++) {
-        output[k] = 0;
-        for (int j = 0; j < HIDDEN_NODES; j++) {
-            output[k] += hidden[j] * weights_hidden_output[j][k];
-        }
-        output[k] = sigmoid(output[k]);
-    }
-    
-    return 0;
-}
-
-int nn_get_best_match(const float *output) {
-    int best_index = 0;
-    float best_value = output[0];
-    
-    for (int i = 1; i < OUTPUT_NODES; i++) {
-        if (output[i] > best_value) {
-            best_value = output[i];
-            best_index = i;
-        }
-    }
-    
-    return best_index;
-}
\ No newline at end of file
+#include "bsp/neural_network.h"
+#include "bsp/nn_model.h"
+#include <math.h>
+
+_Static_assert(NN_INPUT_NODES <= NN_MAX_INPUTS, "NN_MAX_INPUTS too small");
+_Static_assert(NN_OUTPUT_NODES <= NN_MAX_OUTPUTS, "NN_MAX_OUTPUTS too small");
+
+#ifndef NN_TEMPERATURE
+#define NN_TEMPERATURE 1.0f  // 不含温度标定的nn_model.h
+#endif
+
+static void apply_activation(uint8_t activation, float *x, int n) {
+    switch (activation) {
+        case NN_ACT_RELU:
+            for (int i = 0; i < n; i++) {
+                if (x[i] < 0) x[i] = 0;
+            }
+            break;
+        case NN_ACT_TANH:
+            for (int i = 0; i < n; i++) {
+                x[i] = tanhf(x[i]);
+            }
+            break;
+        case NN_ACT_LOGISTIC:
+            for (int i = 0; i < n; i++) {
+                x[i] = 1.0f / (1.0f + expf(-x[i]));
+            }
+            break;
+        case NN_ACT_SOFTMAX: {
+            float max_value = x[0];
+            float sum = 0;
+            for (int i = 1; i < n; i++) {
+                if (x[i] > max_value) max_value = x[i];
+            }
+            for (int i = 0; i < n; i++) {
+                x[i] = expf(x[i] - max_value);
+                sum += x[i];
+            }
+            for (int i = 0; i < n; i++) {
+                x[i] /= sum;
+            }
+            break;
+        }
+        default:
+            break;
+    }
+}
+
+void nn_init() {
+}
+
+int nn_inference(const float *input, float *output) {
+    float buffers[2][NN_MAX_NODES];
+    const float *x = input;
+    float *y = buffers[0];
+
+    for (int layer = 0; layer < NN_NUM_LAYERS; layer++) {
+        const int n_in = nn_layer_sizes[layer];
+        const int n_out = nn_layer_sizes[layer + 1];
+        const float *w = nn_weights[layer];
+
+        for (int j = 0; j < n_out; j++) {
+            y[j] = nn_biases[layer][j];
+        }
+        for (int i = 0; i < n_in; i++) {
+            const float xi = x[i];
+            const float *row = w + i * n_out;
+            for (int j = 0; j < n_out; j++) {
+                y[j] += xi * row[j];
+            }
+        }
+        if (layer == NN_NUM_LAYERS - 1 && nn_layer_activations[layer] == NN_ACT_SOFTMAX) {
+            // 温度缩放：只改变概率（置信度），不改变最佳匹配
+            for (int j = 0; j < n_out; j++) {
+                y[j] /= NN_TEMPERATURE;
+            }
+        }
+        apply_activation(nn_layer_activations[layer], y, n_out);
+
+        x = y;
+        y = (y == buffers[0]) ? buffers[1] : buffers[0];
+    }
+
+    for (int k = 0; k < NN_OUTPUT_NODES; k++) {
+        output[k] = x[k];
+    }
+
+    return 0;
+}
+
+int nn_get_best_match(const float *output) {
+    int best_index = 0;
+    float best_value = output[0];
+    
+    for (int i = 1; i < NN_OUTPUT_NODES; i++) {
+        if (output[i] > best_value) {
+            best_value = output[i];
+            best_index = i;
+        }
+    }
+    
+    return best_index;
+}
+
+int nn_get_best_match_threshold(const float *output, float min_confidence) {
+    int best_index = nn_get_best_match(output);
+    return output[best_index] >= min_confidence ? best_index : -1;
+}
+
+int nn_precheck(const float *input) {
+#ifdef NN_HAS_PRECHECK
+    for (int k = 0; k < NN_PRECHECK_CLASSES; k++) {
+        const float *centroid = nn_pre_centroids + k * NN_INPUT_NODES;
+        float distance = 0;
+        for (int i = 0; i < NN_INPUT_NODES; i++) {
+            const float d = (input[i] - nn_pre_mean[i]) * nn_pre_inv_scale[i] - centroid[i];
+            distance += d * d;
+        }
+        if (distance <= nn_pre_max_distance) {
+            return 1;
+        }
+    }
+    return 0;
+#else
+    (void)input;
+    return 1;
+#endif
+}
+
+#ifdef NN_HAS_QUANTIZED
+int nn_inference_q(const int16_t *input, int32_t *logits) {
+    int32_t acc[NN_MAX_NODES];
+    int32_t x[NN_MAX_NODES];
+    int n_in = NN_INPUT_NODES;
+
+    for (int i = 0; i < n_in; i++) {
+        x[i] = input[i];
+    }
+
+    for (int layer = 0; layer < NN_NUM_LAYERS; layer++) {
+        const int n_out = nn_layer_sizes[layer + 1];
+        const int8_t *w = nn_q_weights[layer];
+
+        for (int j = 0; j < n_out; j++) {
+            acc[j] = nn_q_biases[layer][j];
+        }
+        for (int i = 0; i < n_in; i++) {
+            const int32_t xi = x[i];
+            const int8_t *row = w + i * n_out;
+            for (int j = 0; j < n_out; j++) {
+                acc[j] += xi * row[j];
+            }
+        }
+
+        if (layer == NN_NUM_LAYERS - 1) {
+            for (int k = 0; k < n_out; k++) {
+                logits[k] = acc[k];
+            }
+            break;
+        }
+
+        // ReLU + 定点重缩放到[0, 127]
+        const int64_t multiplier = nn_q_multipliers[layer];
+        const uint8_t shift = nn_q_shifts[layer];
+        for (int j = 0; j < n_out; j++) {
+            int64_t v = acc[j] > 0 ? acc[j] : 0;
+            v = (v * multiplier + ((int64_t)1 << (shift - 1))) >> shift;
+            x[j] = (int32_t)(v > 127 ? 127 : v);
+        }
+        n_in = n_out;
+    }
+
+    return 0;
+}
+
+int nn_get_best_match_q(const int32_t *logits) {
+    int best_index = 0;
+
+    for (int i = 1; i < NN_OUTPUT_NODES; i++) {
+        if (logits[i] > logits[best_index]) {
+            best_index = i;
+        }
+    }
+
+    return best_index;
+}
+#endif
+
+int nn_input_count(void) {
+    return NN_INPUT_NODES;
+}
+
+int nn_output_count(void) {
+    return NN_OUTPUT_NODES;
+}
+
+int nn_class_id(int index) {
+    if (index < 0 || index >= NN_OUTPUT_NODES) return -1;
+    return nn_class_ids[index];
+}
@@ -1,15 +1,48 @@
-#ifndef __NEURAL_NETWORK_H__
-#define __NEURAL_NETWORK_H__
-
-#include <stdint.h>
-
-// 神经网络初始化
-void nn_init();
-
-// 执行神经网络推理
-int nn_inference(const float *input, float *output);
-
-// 获取最佳匹配手势ID
-int nn_get_best_match(const float *output);
-
-#endif
\ No newline at end of file
+#ifndef __NEURAL_NETWORK_H__
+#define __NEURAL_NETWORK_H__
+
+#include <stdint.h>
+
+// 激活函数类型（与export_c.py生成的nn_model.h对应）
+#define NN_ACT_IDENTITY 0
+#define NN_ACT_RELU     1
+#define NN_ACT_TANH     2
+#define NN_ACT_LOGISTIC 3
+#define NN_ACT_SOFTMAX  4
+
+// 调用方缓冲区大小上限
+#define NN_MAX_INPUTS  16
+#define NN_MAX_OUTPUTS 32
+
+// 神经网络初始化
+void nn_init();
+
+// 执行神经网络推理：input为原始ADC值(A1-A4)，output为各类别概率
+// （已按nn_model.h中的NN_TEMPERATURE温度标定，可直接与上位机的拒识阈值比较）
+int nn_inference(const float *input, float *output);
+
+// 获取最佳匹配的输出下标
+int nn_get_best_match(const float *output);
+
+// 带拒识的最佳匹配：最大概率低于min_confidence时返回-1
+int nn_get_best_match_threshold(const float *output, float min_confidence);
+
+// 最近类中心预检：输入离所有类中心都太远（手放松、传感器异常）时返回0，
+// 可跳过nn_inference；nn_model.h不含预检表时总是返回1
+int nn_precheck(const float *input);
+
+// int8量化模型推理：input为原始ADC值，logits为int32输出（需nn_model.h含量化表）；
+// logits未经温度缩放，只用于取最佳匹配，带拒识时使用nn_inference的概率
+int nn_inference_q(const int16_t *input, int32_t *logits);
+
+// 获取int8量化模型logits中的最佳匹配下标
+int nn_get_best_match_q(const int32_t *logits);
+
+// 输入/输出节点数
+int nn_input_count(void);
+int nn_output_count(void);
+
+// 输出下标对应的手势编号(sign_mapping.json中的编号)
+int nn_class_id(int index);
+
+#endif
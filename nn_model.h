@@ -0,0 +1,571 @@
+/* 由 export_c.py 根据训练好的模型自动生成，请勿手动修改 */
+#ifndef __NN_MODEL_H__
+#define __NN_MODEL_H__
+
+#include "bsp/neural_network.h"
+
+#define NN_NUM_LAYERS 3
+#define NN_INPUT_NODES 4
+#define NN_OUTPUT_NODES 7
+#define NN_MAX_NODES 64
+
+static const int nn_layer_sizes[NN_NUM_LAYERS + 1] = {4, 64, 32, 7};
+static const uint8_t nn_layer_activations[NN_NUM_LAYERS] = {NN_ACT_RELU, NN_ACT_RELU, NN_ACT_SOFTMAX};
+static const int nn_class_ids[NN_OUTPUT_NODES] = {1, 2, 3, 4, 5, 6, 7};
+
+/* 第0层 4x64 relu（已折叠StandardScaler），按[输入][输出]行优先存储 */
+static const float nn_layer0_weights[256] = {
+    -0.00155602592f, 0.00328510602f, 0.000623741979f, 0.000565722743f, -0.00258851505f, -0.00224569587f, -0.00275963572f, 0.002498522f,
+    -0.000181480193f, 0.00176995712f, -0.00303953922f, 0.00298058827f, 0.00244160512f, -0.0028559496f, -0.000845762285f, -0.00113669094f,
+    -0.00128334791f, -0.00093183124f, 0.00094551401f, -0.00190927583f, -0.000987359027f, -0.00277466561f, -4.16928208e-05f, -0.00112253133f,
+    -0.000301006368f, 0.00212163863f, -0.00122269362f, -0.000195745661f, 0.00114304913f, -0.00266464412f, 0.000346528886f, -0.00247696087f,
+    -0.00393678901f, 0.00204866407f, 0.00330664964f, 3.7026815e-05f, -0.000773417918f, -0.00167500781f, 0.000628459396f, -0.00184877246f,
+    -0.00252984629f, -0.00010757756f, -0.00305292563f, 0.00242059571f, -0.00102034785f, 0.000338655943f, -0.00185562107f, -0.000264233312f,
+    -0.000531562516f, -0.00042146648f, 0.00172728052f, 0.00200505929f, 0.00153521908f, 0.00194481164f, 0.00167974055f, 0.00262147812f,
+    -0.00384571699f, -0.00220459488f, -0.00198387268f, -0.000470846506f, -0.00124720464f, -0.0032849268f, 0.00145799042f, -0.00121441634f,
+    -0.000888545987f, 0.000695609087f, -0.00132719198f, 0.000855915341f, -0.00156642093f, 0.00153479689f, 0.000851381955f, -0.00162889508f,
+    -0.00121898823f, 0.0012707093f, 0.00105861365f, 0.00111022596f, 0.0011445888f, -0.000736844927f, -0.000325069713f, -0.00164508616f,
+    0.00123036491f, -1.45733261e-05f, -0.000684374439f, -0.00133356364f, -0.000863581693f, 0.000101682232f, 0.000262912564f, 0.000299617402f,
+    0.00130799247f, 0.000519234035f, -0.000910888162f, 0.00110575544f, 0.00112244286f, 0.000553330596f, 0.000679905294f, -0.000339012112f,
+    0.000284438165f, -0.000495495263f, -0.00168813954f, -6.84626011e-05f, -0.0011432011f, -0.000550455291f, -0.00051356783f, 0.000510274231f,
+    0.000615080319f, -0.00157143953f, -0.000562225813f, 0.0011111914f, -0.000608013124f, -0.00081440959f, -0.000966270907f, -0.00113443989f,
+    0.00108229466f, 0.000912185241f, 0.00079189108f, 0.00133595977f, 0.000983949886f, -0.000204107019f, 0.00132270961f, 0.000523315929f,
+    0.00149804623f, 0.00142276483f, 2.86819684e-06f, -0.00150627876f, -0.00150197594f, 0.000103525886f, 0.000788165351f, 0.00124863225f,
+    -0.00308027726f, 0.00139941355f, -0.00135510615f, -0.00197149898f, -0.00364001928f, -0.000333056735f, 0.00423657802f, 0.000849497751f,
+    -0.000885853197f, 0.00256389836f, -0.000307791778f, 0.00412650445f, 0.00383216567f, -0.00354362124f, 0.00157169425f, 0.000276713314f,
+    -8.26987109e-05f, -0.00459837041f, 0.00240097738f, -0.00207210135f, -0.00435695181f, -0.00366385916f, 0.00401581741f, -0.00307654552f,
+    -0.00426916404f, -0.00109595885f, 0.00488326103f, -0.00284622877f, -0.000251282055f, 0.00239722095f, -0.00270341116f, 0.000370334278f,
+    -0.00351579623f, 3.69558617e-05f, 0.00295719612f, -2.62625807e-13f, -0.0039299115f, 0.002293262f, -0.000782850275f, -0.00412152946f,
+    -0.00488678834f, 0.00363078947f, 0.00213514068f, -0.00375115835f, 9.82837316e-05f, -0.00299871616f, 0.00165434498f, -0.000870858672f,
+    0.000559385327f, 0.000767649466f, 0.00349320047f, -0.00276920734f, -0.00183765548f, -0.00471483462f, 0.00344756362f, 0.00339177468f,
+    -0.00421835834f, 0.000171551699f, 0.00335928186f, 0.000703944161f, 0.00235255332f, -0.00437470749f, -0.0029482516f, 0.00324460265f,
+    0.00135856597f, -0.000222827341f, -0.000708155807f, -0.00017410946f, 0.000935402956f, 0.00119662117f, 0.00137984783f, 0.00127763522f,
+    5.66793261e-05f, -0.0013291674f, -0.000651750317f, 0.000464413018f, -0.000274040092f, -0.0015135677f, -0.00139198152f, 0.000844516496f,
+    -0.00161717292f, -0.000860219427f, 0.000813245303f, 0.00110564326f, -4.99079687e-05f, -0.00104316097f, 0.000462583844f, -0.000342780181f,
+    -3.16244228e-05f, 0.00104680426f, 0.00069215094f, 0.00117402722f, 0.00085839671f, 0.000482745559f, -0.000491470876f, -0.000795416017f,
+    -0.00116102024f, -0.00111060306f, 0.00163354405f, -2.46941286e-11f, 0.00140422842f, 0.000540523472f, 0.000536644956f, -0.000508667588f,
+    -0.000142996952f, 0.000806346113f, -0.000278000622f, 0.00095775831f, -0.000448682591f, -0.00100336185f, 0.000635910736f, -0.00102784691f,
+    0.00140786411f, 0.00152144162f, 0.00104892802f, 0.000148313663f, -0.001656094f, 0.000830626283f, -5.38472724e-05f, 0.00142172433f,
+    0.00144276592f, 0.00101137737f, -0.00098385512f, 0.000160000382f, 0.00134506092f, -0.00103126521f, -0.000489954114f, -0.000207756279f
+};
+static const float nn_layer0_bias[64] = {
+    1.98876313f, -2.04693296f, 1.88480057f, 0.102166131f, 3.23247643f, -0.357582024f, -2.46124274f, -1.29494342f,
+    1.37226549f, -1.39207074f, 1.5021195f, -3.97846603f, -3.27165411f, 4.36768277f, 1.23862993f, 1.01606781f,
+    1.46864862f, 3.57585639f, -1.58923132f, 1.76013248f, 3.34194986f, 3.81979642f, -2.11297049f, 2.25121349f,
+    1.74757954f, -1.48786098f, -1.72091265f, -0.283067087f, -1.5492413f, -0.872498976f, 1.04643365f, 1.85903773f,
+    4.0112809f, 0.506057133f, -3.18429584f, -0.24925364f, 1.99700573f, -0.457817756f, -0.262752121f, 2.87141071f,
+    3.3941358f, -1.28295874f, 1.08088209f, -0.823665381f, 0.848725539f, 2.51455176f, 0.294937983f, 2.26594339f,
+    -1.47199295f, -1.51275754f, -3.55818319f, -0.471471471f, 1.22301847f, 0.699308355f, -3.02822127f, -4.28734501f,
+    1.47185703f, -0.545678434f, 0.365221011f, 0.789684426f, -0.602575754f, 4.09672327f, 0.449534295f, -1.62009948f
+};
+
+/* 第1层 64x32 relu，按[输入][输出]行优先存储 */
+static const float nn_layer1_weights[2048] = {
+    0.229926889f, 0.0401785429f, 0.170634376f, -0.181988957f, 0.349852846f, 0.275228691f, 0.0443487117f, -0.0383129814f,
+    -0.00189214993f, 0.0681266182f, -0.074569368f, 0.047358768f, -0.185629494f, -0.216276547f, -0.295886748f, -0.145811599f,
+    0.125944927f, 0.258472652f, 0.0909293727f, -0.213555089f, -0.0188660362f, 0.0213196909f, -0.00241167658f, -0.0643183741f,
+    -0.0211727152f, 0.230126688f, 0.0243360247f, -0.0557547488f, -0.128215618f, 0.0432834554f, 0.141790928f, 0.170979577f,
+    -0.0994163885f, -0.117110423f, -0.111963089f, 0.231655806f, -0.143271729f, -0.0504667327f, 0.315569731f, 0.15344472f,
+    -0.151672281f, -0.0093034842f, 0.0990999362f, 0.197480206f, 0.294406639f, -0.0731441882f, 0.340123759f, 0.344315912f,
+    -0.174806256f, -0.343943048f, -0.190755383f, -0.258416207f, -0.112086333f, -0.0178210858f, -0.0120157255f, -0.11004207f,
+    0.0839007641f, -0.108711016f, 0.27404986f, 0.0236069551f, -0.0226407878f, 0.0782406143f, 0.198725939f, 0.287233204f,
+    0.351332881f, 0.218943027f, -0.0690756635f, -0.185961824f, 0.0938319008f, 0.308315198f, 0.168094889f, -0.109474234f,
+    -0.196481584f, 0.151367283f, 0.00953693649f, 0.173886093f, 0.306864962f, -0.0628985214f, 0.174018649f, 0.258848459f,
+    -0.216940504f, 0.360095507f, 0.0926124414f, 0.239592435f, -0.102380999f, 0.138074388f, 1.81725342e-09f, -0.0219892022f,
+    0.351455644f, -0.223422712f, -0.156361793f, 0.189907526f, 0.175445583f, 0.0178259659f, 0.212495134f, 0.126611365f,
+    -0.321013596f, -0.0140165054f, 0.182971911f, 0.187069783f, 0.237411912f, -0.0096880174f, -0.142045734f, -0.157599937f,
+    0.298156447f, 0.234182623f, 0.0501845752f, 0.114979231f, -0.0155386809f, -0.00658166794f, -0.250090918f, -0.38812164f,
+    0.0361751201f, -0.00825727313f, 0.0576526714f, 0.125760461f, -0.198658493f, 0.128318423f, 2.11670582e-05f, -0.232395394f,
+    -0.0102025922f, 0.432528842f, 0.158764164f, 0.0502596768f, 0.304330735f, 0.203628354f, 0.0784813646f, 0.174447247f,
+    0.154554932f, -0.278145956f, 0.17748121f, -0.0320741051f, 0.0490421721f, 0.358389894f, -0.25847146f, 0.0171448028f,
+    -0.344373082f, 0.103812864f, -0.289011983f, -0.297818581f, -0.112941212f, 0.0485514974f, 0.0233926605f, 0.207643858f,
+    0.154914078f, 0.0482891536f, -0.0996372401f, 0.185242989f, -0.151449602f, 0.147769987f, -0.0217385719f, 0.202476417f,
+    -0.207026336f, 0.365033174f, -0.0721890302f, 0.417273453f, -0.277449498f, 0.00623700111f, 0.372652939f, 0.0380506865f,
+    0.162760013f, 0.184839351f, 0.088826514f, 0.00355557507f, 0.147929854f, 0.306010519f, -0.142123723f, 0.00625881584f,
+    0.343926004f, 0.361342157f, 0.100226329f, 0.150956096f, -0.0667812255f, -0.171623874f, 0.0548687111f, -0.0479725455f,
+    -0.011928909f, -0.125789307f, 0.377402751f, 0.411662238f, 0.0749486341f, 0.116286022f, -5.30254044e-06f, 0.130564174f,
+    -0.0174157668f, -0.0189044421f, 0.322349538f, 0.252236193f, 0.153847951f, 0.0922656272f, -0.0668013503f, -0.059570444f,
+    0.317819778f, 0.190468409f, -0.333937566f, -0.319209987f, -0.141550644f, 0.243776042f, 0.331892168f, -0.0178343153f,
+    0.160438283f, 0.0830362169f, 0.414300834f, 0.285023933f, 0.100411402f, -0.00632969042f, 0.0834429263f, -0.30460372f,
+    -0.0482028931f, 0.299829886f, 0.296007014f, 0.370913653f, 0.209394758f, 0.140246626f, 0.0004989877f, 0.19459958f,
+    0.125622164f, -0.203466758f, 0.100323323f, -0.255004342f, 0.139104649f, -1.46581465e-09f, -0.10326586f, -0.00427847508f,
+    0.295672649f, -0.195098845f, -0.104915163f, 0.167055876f, -0.266926191f, 0.339899225f, 0.103446803f, 0.347397465f,
+    -0.108073642f, 0.142666325f, 0.224453017f, 0.0678780661f, -0.182695349f, -0.254460553f, 0.391271513f, -0.172641648f,
+    0.0787880586f, 0.0748998598f, -0.305469175f, -0.418148028f, -0.0876409074f, -0.103238322f, 1.6887906e-09f, -0.0510007874f,
+    0.42149314f, 0.11529515f, 0.228007711f, 0.326428036f, -0.163731217f, 0.0431418834f, 0.337883059f, 0.0354238941f,
+    0.0255466388f, 0.148905372f, -0.066090368f, -0.187452179f, -0.0871259072f, 0.382824434f, -0.0700931409f, -0.0198565401f,
+    -0.0253379939f, -0.0500490143f, -0.278490842f, -0.17843637f, -0.108926656f, -0.198208341f, -0.0807867699f, 0.0726401446f,
+    -0.169083455f, 0.0885798977f, 0.152061834f, -0.0733343346f, 0.0711588974f, -0.243968985f, -0.00155192804f, -0.247542103f,
+    -0.0705937995f, 0.0341477277f, -0.222373228f, -0.0496764062f, -0.251585449f, -0.0310738391f, -0.00423876826f, -0.136475268f,
+    0.0194700335f, 0.0616851621f, -0.130944613f, 0.296167394f, 0.119299038f, -0.266560873f, 0.140249029f, 0.321128183f,
+    -0.297670194f, -0.158232882f, 0.226158721f, 0.258369112f, -0.145365393f, -0.161693786f, 0.0265656938f, 0.126570314f,
+    0.0356734474f, -0.151499353f, -0.00638482153f, 0.0776266663f, -0.268495233f, -0.208609857f, 3.50177357e-05f, 0.177919015f,
+    -0.0901194325f, -0.114393539f, -0.121777071f, 0.0860939073f, 0.167246518f, -0.15011122f, 0.0192127316f, 0.0722995444f,
+    -0.161142152f, -0.0046922724f, -0.0161123988f, -0.0304429643f, -0.0149974869f, 0.292973498f, -0.0220972005f, -0.123007161f,
+    0.277201835f, 0.0900096153f, -0.0805380142f, 0.132531794f, 0.154058672f, 0.0958056442f, -0.0815791602f, -0.0340278978f,
+    -0.178052272f, -0.0230957214f, 0.252455038f, 0.157263379f, -0.0963607787f, 0.279979241f, -1.39776646e-09f, -0.162349682f,
+    -0.427274641f, -0.244107048f, -0.0861041381f, -0.289739944f, -0.0979268204f, -0.127725843f, -0.0981946329f, 0.353768694f,
+    -0.17231586f, 0.0405368504f, 0.0602070582f, 0.379144015f, -0.151658804f, -0.111483576f, 0.345183124f, 0.295111178f,
+    0.0916357249f, -0.14478954f, -0.023116064f, 0.212718857f, 0.158107779f, 0.0127498427f, 0.139013079f, 0.00815625853f,
+    0.111015709f, -0.173252899f, -0.0540936985f, 0.0195682201f, -0.0329208173f, -0.155191146f, -0.00680250066f, 0.0358326155f,
+    -0.185424834f, -0.103075386f, -0.0636168364f, 0.109697677f, 0.121533635f, -0.243836997f, -0.0386262615f, -0.135886975f,
+    -0.248813175f, 0.180719245f, 0.0440972896f, 0.33233299f, -0.104584161f, 0.024677412f, 0.265127164f, 0.162030023f,
+    -0.101524397f, -0.110862197f, 0.0346146568f, 0.350357631f, 0.112320493f, 0.216478007f, -0.0815329277f, 0.254161185f,
+    0.192768035f, -0.258265616f, -0.229926664f, 0.0942416514f, 0.00301475683f, 0.0664048496f, -0.00457975106f, 0.128135712f,
+    -0.231257553f, -0.242842741f, -0.0619651661f, 0.284388433f, 0.250574666f, -0.0158095698f, 0.053244426f, 0.300227181f,
+    0.0244598656f, 0.291641502f, -0.152227021f, -0.0861632007f, 0.204287153f, 0.0292883761f, 0.051967665f, -0.218805833f,
+    -0.194177722f, 0.141834535f, 0.101847466f, -0.117113612f, 0.327783075f, 0.0320730109f, -0.495696262f, 0.388410094f,
+    -0.0360292568f, -0.393773218f, 0.0328251296f, 0.336841934f, 0.0460254863f, -0.0196716295f, 0.00770917281f, -0.0214088316f,
+    -0.464002692f, -0.181886769f, -0.355292756f, 0.0164961164f, -0.294480343f, -1.21165141e-10f, 0.234483019f, 0.370635553f,
+    0.050292619f, 0.163103297f, -0.275226313f, 0.279735241f, -0.288226834f, 0.0658648257f, 0.0709422229f, -0.308281181f,
+    -0.0214215993f, 0.0807383809f, 0.0968041423f, 0.236134192f, 0.21898293f, -0.00470969544f, -0.0196590664f, 0.0500999816f,
+    -0.213141873f, 0.327160271f, 0.187330908f, -0.0764574085f, -0.0351507677f, 0.149202745f, -0.00359124298f, 0.0140225479f,
+    0.115093829f, -0.0137345195f, -0.326496481f, 0.0528576801f, 0.331088763f, 0.0121450422f, 0.22084224f, 0.360909351f,
+    0.308244701f, -0.250247476f, 0.0100138948f, -0.0187313679f, -0.0899206882f, 0.265812909f, 0.160699239f, 0.354815779f,
+    -0.0706721726f, -0.0444908657f, 0.15941185f, 0.197585292f, -0.139906677f, 0.186004517f, 0.306749434f, 0.00166112043f,
+    -0.0164554992f, 0.143399212f, -0.208668963f, -0.145273974f, 0.136840567f, -0.197573731f, -3.28119471e-08f, -0.0808677997f,
+    0.122022773f, 0.372751038f, -0.112118293f, 0.0806566122f, 0.0524760608f, -0.0441887244f, 0.00748842447f, -0.0994019103f,
+    -0.1996115f, -0.0732507115f, 0.0889818519f, 0.0885246039f, 0.251043646f, -0.0559209894f, -0.0483168446f, -0.0945941343f,
+    -0.105293128f, 0.0489340695f, 0.0365957227f, 0.385866162f, -0.0492529069f, -0.0688565663f, -0.205900115f, 0.376429567f,
+    -0.0531075025f, 0.0514496465f, -0.0265894084f, 0.124252508f, -0.173734423f, 0.130291993f, -0.00110916712f, -0.185117829f,
+    -0.336356261f, -0.142077335f, 0.0517474962f, -0.36090732f, 0.277504154f, -0.0418888009f, 0.118157637f, 0.102269129f,
+    -0.0230892565f, 0.132591471f, -0.0703065517f, -0.092721833f, 0.346769948f, 0.364785613f, -0.128999242f, -0.247626222f,
+    0.0412195618f, 0.0332590088f, -0.125785325f, -0.287475405f, 0.21324496f, 0.0501656247f, -0.429221934f, 0.0100788877f,
+    -0.184243729f, -0.119569889f, -0.0181489657f, -0.0616124634f, 0.134920398f, -0.22633677f, -7.0675375e-08f, -0.162248742f,
+    -0.40108142f, -0.0816829028f, -0.031817897f, 0.250157206f, 0.19739548f, -0.0712971209f, 0.194365576f, -0.0190521075f,
+    0.0862364248f, 0.0983553134f, -0.271966126f, -0.284837486f, -0.352311696f, -0.084177046f, -0.0451497805f, 0.229944004f,
+    0.0447711989f, 0.379979259f, 0.195228135f, 0.131127659f, -0.243364335f, -0.078804649f, 0.295332543f, -0.359168625f,
+    4.82092448e-09f, 0.190999382f, -0.0162060041f, -0.180439806f, -0.119442383f, 0.354562965f, 0.00041207059f, -0.0971426598f,
+    0.451547397f, 0.149308677f, 0.403763199f, 0.321069331f, -0.205538631f, -0.0400472635f, 0.0809789685f, -0.159780841f,
+    0.298172343f, -0.205496637f, -0.215615438f, 0.0997864378f, 0.24939069f, 0.185881015f, -0.211191451f, -0.0205476336f,
+    -0.340795687f, 0.34494702f, -0.297109516f, -0.040339924f, -0.0963980174f, 0.00423022643f, 0.0349859667f, 0.181199994f,
+    -0.0791372232f, -0.110676714f, -0.255021036f, 0.148133387f, 0.17416323f, -0.0530550724f, -3.37970634e-10f, -0.0294254654f,
+    -0.0996294765f, 0.390522506f, -0.121733683f, 0.12395517f, -0.0493842329f, -0.0156405141f, -0.0102767641f, 0.0795939789f,
+    -0.0398190701f, 0.0547264192f, -0.0335799244f, -0.0601772888f, 0.130552942f, 0.0892270109f, 0.169222231f, -0.218648052f,
+    -0.0579500096f, 0.119894941f, 0.139547707f, 0.111138011f, 0.207947248f, -0.169158093f, -0.377512789f, 0.0793114219f,
+    0.00219499553f, -0.161917554f, 0.135539468f, 0.13791048f, -0.0965049738f, 0.0623427904f, -0.00765639896f, -0.243392342f,
+    0.0910424224f, 0.159882689f, 0.0110375076f, 0.113211072f, -0.184698113f, 0.140306886f, 0.28838774f, 0.279373719f,
+    -0.00561845039f, 0.0952576499f, 0.0613848011f, -0.203947715f, 0.489091973f, -0.0537915985f, 0.154119996f, -0.320383168f,
+    -0.204553844f, 0.0267419577f, 0.309417977f, 0.00148952102f, 0.274979218f, 0.0511471677f, -0.162112245f, 0.359563013f,
+    -0.199173286f, -0.324946752f, 0.0655150423f, 0.43044956f, 0.208350146f, -0.297656617f, 2.01271086e-05f, 0.179803087f,
+    -0.328325139f, 0.0385114644f, 0.0649750867f, -0.264162443f, 0.0693578938f, -0.121340645f, 0.317302229f, 0.447222828f,
+    0.313972581f, -0.0948371766f, 0.160470147f, 0.194884243f, -0.230600734f, 0.229386096f, -0.278591933f, 0.175369212f,
+    -0.0303857716f, -0.102973873f, -0.127740716f, 0.224157413f, -0.15342425f, 0.0961657198f, -0.0836625176f, -0.117960506f,
+    -0.0377973895f, 0.273035855f, -0.0220949209f, -0.0095654835f, 0.155360563f, 0.154808246f, -0.000466142308f, -0.25767187f,
+    0.221792979f, -0.309660605f, 0.30338731f, 0.0507653291f, 0.24932372f, 0.127129246f, 0.422364979f, -0.150611672f,
+    0.155979813f, 0.0555861838f, 0.112548141f, 0.122839651f, 0.373925905f, 0.384924692f, 0.0932661785f, -0.197739845f,
+    0.0438406349f, 0.222701294f, 2.11239288e-05f, -0.355461027f, 0.0332331536f, -0.134233662f, -0.31328855f, 0.0145042405f,
+    -0.284682206f, -0.44444001f, 0.470461346f, 0.0982344098f, -0.0733118345f, 0.0286897664f, -0.00075704939f, 0.193210379f,
+    -0.0680289229f, -0.130619324f, -0.190131965f, 0.286747181f, 0.244993509f, -0.0404096619f, 0.154722096f, -0.0356223675f,
+    0.195336564f, -0.0311364411f, 0.342074421f, 0.187413822f, 0.228349552f, 0.0326462226f, -0.0183542166f, -0.299353139f,
+    -0.00284017376f, 0.0156388949f, 0.268709157f, -0.193366494f, -0.120031839f, 0.209058913f, 0.00948173506f, 0.376555012f,
+    0.195297448f, -0.315572274f, 0.149568324f, 0.261867197f, 0.0746635333f, -0.229361763f, 0.0018867659f, -0.167036065f,
+    -0.40494061f, 0.102883094f, 0.118610408f, 0.144671273f, -0.112441198f, 0.165531474f, -0.0750536339f, -0.0538384443f,
+    -0.0158417429f, 0.326757388f, 0.31795746f, 0.298704565f, 0.208133797f, -0.134365009f, -0.0921874347f, 0.076938341f,
+    -0.168889309f, -0.112998955f, 0.249151962f, -0.0905556904f, -0.114289957f, -0.155815828f, 0.210697766f, -0.273646457f,
+    0.147314826f, -0.149483538f, 0.0589617083f, 0.168831747f, 0.00230356944f, -0.201806129f, 1.09809173e-06f, 0.012862885f,
+    -0.216224061f, 0.377625811f, 0.296761064f, 0.226631147f, 0.0170202828f, 0.152784225f, -0.197959642f, 0.124578678f,
+    0.254386622f, 0.0231430489f, -0.0707585521f, 0.0448931859f, -0.323727941f, 0.310963022f, 0.198198433f, 0.0467046191f,
+    0.290569169f, 0.0240797649f, -0.134271307f, 0.281662869f, -0.256832266f, 0.139501977f, 0.365370448f, -0.201883691f,
+    -0.0228470149f, 0.0960407723f, 0.157437443f, 0.0999037488f, 0.0470773103f, -0.0108965364f, 7.81162504e-09f, -0.0105910631f,
+    0.38415204f, -0.0742628266f, 0.341946059f, -0.0241712575f, 0.14632453f, 8.76015029e-08f, 0.220838448f, 0.081678025f,
+    -0.39457432f, 0.324215125f, 0.240158485f, -0.143021113f, 0.0206177465f, -0.11785713f, -0.140590737f, -0.133998317f,
+    0.362231978f, 0.283540474f, -0.0934753004f, 0.0912982237f, 0.325273628f, 0.136948642f, 0.0172035939f, -0.492246961f,
+    0.0876273542f, 0.30939576f, 0.0339331345f, -0.0803992805f, 0.000320233116f, 0.0538675476f, 2.32439043e-06f, -0.0585274132f,
+    -0.412155042f, 0.431196625f, 0.277128884f, 0.118858127f, 0.0630453113f, 0.123320292f, -0.108521718f, -0.0965670875f,
+    -0.18639069f, 0.203033543f, 0.21980814f, -0.0333185191f, 0.307821715f, -0.287461022f, 0.0923781693f, 0.336226756f,
+    0.0726179501f, 0.159656417f, 0.107299527f, -0.0162513516f, 0.35015727f, -0.0606080012f, 0.299147651f, -0.12418859f,
+    -0.19351334f, -0.189032894f, 0.204533592f, 0.0381197407f, 0.144094535f, 0.105131386f, 0.018169561f, -0.177908955f,
+    0.0987094085f, 0.0939112236f, 0.258281054f, 0.297196177f, 0.0712418855f, 0.0319837415f, -0.399292356f, -0.27430961f,
+    0.306001975f, 0.147661605f, -0.139368551f, -0.0833650132f, -0.225696294f, -0.1183914f, -0.164843913f, 0.106241527f,
+    -0.0136180268f, 0.224373812f, 0.189207784f, 0.127325984f, -0.122726184f, 0.170007436f, -0.0138207224f, -0.089537417f,
+    -0.0218400238f, -0.105080159f, 0.159286094f, 0.185667147f, 0.022135169f, 0.0210683138f, 8.26373762e-06f, 0.00457150154f,
+    0.0455635337f, -0.443311535f, 0.0934562408f, -0.463586937f, -0.188570709f, 0.0215146405f, -0.292140506f, -0.0398971486f,
+    -0.113432997f, 0.207135748f, 0.145252547f, -0.162180113f, 0.00369220129f, -0.0167419283f, -0.180299539f, -0.192048252f,
+    0.11375585f, -0.186850319f, 0.0868031599f, -0.192118745f, 0.134337367f, 0.0685120649f, 0.0410183695f, -0.0630382868f,
+    -0.210728439f, -0.243053201f, 0.266239973f, 0.114404644f, -0.22447195f, 0.16245226f, -0.014849191f, -0.0112360782f,
+    2.60257384e-05f, 0.107386462f, 0.190962332f, 0.114155602f, -0.00763884902f, 0.135526588f, -0.126404202f, 0.277364895f,
+    0.15555603f, 0.137850618f, -0.166570572f, 0.0779751278f, 0.0266668515f, 0.277669059f, -0.306991463f, -0.293836023f,
+    -0.0393127633f, -0.0242986391f, 0.150492672f, -0.0405844106f, 0.401098526f, -0.106130661f, -0.102558036f, 0.32059435f,
+    -0.0266400479f, 0.103889208f, 0.171750838f, 0.158958933f, -0.162179094f, 0.358194088f, 0.0193320011f, -0.0264826826f,
+    -0.169269187f, 0.119193243f, -0.186566018f, -0.334736768f, -0.0851896118f, -3.77212709e-11f, 0.345435673f, 0.25452201f,
+    -0.183063023f, 0.128811649f, 0.150346799f, -0.101019811f, 0.589999584f, -0.0718722101f, 0.103077939f, -0.28784324f,
+    0.472299239f, 0.0523090997f, 0.226425169f, -0.0692322496f, 0.362350368f, -0.0690515132f, -0.490872192f, 0.309655587f,
+    0.126304686f, -0.502162442f, 0.413391574f, 0.348222469f, 0.113673731f, -0.226663212f, 4.11951877e-05f, 0.169233529f,
+    -0.544113509f, -0.234353257f, -0.16390187f, -0.271242496f, 0.102208255f, -0.0238292532f, -0.0353659767f, 0.472058369f,
+    -0.216520759f, 0.0731961046f, 0.0212884714f, 0.181757112f, -0.0999090733f, -0.0861260204f, 0.1964497f, -0.0434937045f,
+    -0.00274093434f, -0.246129872f, 0.307349597f, -0.0546583829f, 0.41251588f, -0.0406222735f, -0.0815478241f, -0.0692025403f,
+    -0.187041221f, -0.0896021332f, -0.0333860832f, 0.136406304f, 8.99383819e-11f, -0.210543763f, -1.26488183e-10f, 0.0839914418f,
+    -0.216782922f, -0.361800647f, -0.171847172f, 0.189420416f, 0.22262098f, -0.0321400654f, 0.361635776f, 0.282542586f,
+    0.174222268f, 0.0128068903f, 0.0100922799f, -0.188340941f, -0.459981217f, -0.359750204f, 0.195007527f, 0.382301511f,
+    -0.37051085f, -0.268808967f, 0.128826732f, 0.449609506f, -0.201516029f, -0.0133563873f, 0.0445227142f, -0.490999617f,
+    0.0414988759f, 0.459387876f, -0.369824677f, -0.099273754f, 0.086480254f, -0.0561234511f, 6.31504406e-11f, -0.0122071356f,
+    0.283631918f, 0.242495886f, 0.0419317058f, -0.0674808605f, -0.20940338f, -0.036374094f, 0.137929034f, -0.148495362f,
+    0.0184687132f, -0.00909070174f, 3.97100984e-07f, -7.26755853e-11f, 0.00522714716f, -0.00221272898f, 6.59265282e-06f, 0.0030466428f,
+    0.0143219477f, 2.31032458e-06f, 1.34694777e-12f, 2.48382757e-10f, 0.00529236122f, -1.48881394e-10f, -0.0184164687f, 0.0123146964f,
+    4.80090918e-06f, 8.56566549e-07f, -0.000818923507f, -8.64823786e-08f, 1.45934709e-09f, -6.17112311e-08f, -0.00765695938f, -8.77156773e-08f,
+    0.0239886753f, -0.015441471f, 0.0197604074f, -5.69238214e-10f, 0.00545248239f, 0.000772069299f, -5.84482186e-12f, 0.00014420664f,
+    0.395902363f, -0.109948141f, 0.0272194332f, 0.0391656706f, 0.230538672f, 0.278609008f, 0.136403739f, -0.156676114f,
+    0.0714711637f, -0.0375355392f, -0.0157910917f, -0.355360954f, -0.0290519347f, -0.0908593301f, -0.15238787f, 0.181465123f,
+    -0.116981516f, 0.0846652861f, -0.085691996f, -0.0950354025f, -0.149631911f, -0.302390662f, -9.44327376e-10f, 0.0523940094f,
+    0.0880044519f, 0.150751835f, -0.128680008f, 0.344592901f, -0.0254304361f, -0.0375872307f, -0.106238869f, -0.0810884271f,
+    0.044722598f, -0.157798113f, -0.12916475f, -0.048364152f, -0.00492678399f, 0.234715541f, 0.107120154f, 0.20367754f,
+    0.312876214f, -0.051255518f, -0.214721736f, -0.156285843f, -0.0169685662f, 0.185130091f, -0.0168881951f, -0.0106041608f,
+    -0.013585965f, 0.331602341f, 0.0228185034f, -0.161380719f, -0.0424805847f, -0.0388564343f, -3.93750588e-05f, -6.64743693e-06f,
+    0.193384643f, 0.113992264f, -0.00352167537f, -0.0281361895f, 0.0523853203f, -8.18102966e-05f, 0.260835451f, -0.259398695f,
+    -0.00202266979f, 0.109717707f, -0.138514885f, 0.031874566f, 0.123242584f, -0.211324003f, 0.05290558f, -0.119119703f,
+    0.0172685278f, -1.22953559e-11f, 0.171969377f, 0.00539796129f, -0.208350291f, 8.30113513e-09f, 0.0153803066f, -5.5978811e-10f,
+    0.138531887f, 0.00670723075f, -0.000551588584f, -0.123545568f, -1.80882399e-09f, -0.0621110721f, 0.00315338174f, 0.00838639132f,
+    3.29153479e-08f, -0.000404950799f, 0.150586376f, -7.24571544e-05f, 0.00220120103f, -0.0496344447f, 7.27280375e-08f, -0.181554436f,
+    -0.0801756506f, 0.127127921f, 0.179770042f, -0.13595672f, 0.373197816f, 0.322429458f, -0.159115358f, -0.456342167f,
+    0.0763241725f, 0.186647746f, 0.200050714f, -0.13997463f, -0.011427199f, -0.0842152875f, -0.237935651f, 0.256864571f,
+    0.191496599f, -0.510058465f, 0.366361989f, 0.203843502f, -0.0506851625f, 0.0547455542f, 6.47025124e-06f, 0.213460239f,
+    -0.489457121f, -0.153016864f, -0.0756377297f, 0.133949583f, -0.169423423f, -0.23222054f, -0.141268678f, 0.405523864f,
+    -0.0516736289f, 0.020821117f, -0.0260925763f, -0.120321835f, -0.00680133052f, 0.156595689f, -0.184161191f, -0.0591403452f,
+    -0.0271495528f, 0.211350485f, 0.30121244f, -0.0958271679f, 0.121618178f, -0.116766102f, -0.295981924f, 0.336922033f,
+    0.190148089f, 0.0770771915f, 0.201219426f, 0.30472693f, -0.0380060384f, -0.131379992f, 1.19402922e-10f, 0.197328854f,
+    -0.390863524f, 0.258426414f, -0.149010589f, 0.131446129f, -0.275189262f, -0.045426792f, 0.230114998f, 0.11995793f,
+    0.382249289f, -0.0887651918f, 0.09854013f, -0.241418521f, -0.351666335f, 0.0242115655f, 0.249502477f, 0.409088808f,
+    -0.134229213f, 0.322179062f, -0.248068532f, 0.426409212f, -0.326309757f, 0.111653466f, 0.179200584f, -0.150877388f,
+    0.00076364759f, 0.373013968f, -0.418627611f, -0.372564064f, -0.0938412251f, -0.0762977119f, -0.00985060322f, 0.0131769933f,
+    0.401470445f, 0.133377461f, 0.259305762f, 0.227469035f, -0.363912749f, 1.37922792e-11f, 0.427905095f, -0.264266807f,
+    0.408967782f, 0.125377464f, -0.266265536f, 0.190762576f, -0.214674718f, 0.308223546f, -0.132511148f, 0.21792822f,
+    0.303703456f, 0.297146949f, 0.0659782329f, 0.0186504857f, -0.115654262f, -0.0736517474f, -0.0413531638f, 0.209902895f,
+    -0.149142734f, 0.396005335f, 0.212374626f, 0.175829793f, -0.20505227f, 0.245031022f, 0.0111909632f, -0.0203933017f,
+    0.131911991f, 0.219177753f, -0.0700626656f, -0.0734209829f, -0.0457676129f, -0.00408014938f, 0.0661417898f, -0.120461271f,
+    -0.362902645f, -0.090816761f, 0.344387871f, 0.116589067f, 0.344965782f, -0.176074539f, -0.00736589149f, -0.0797839863f,
+    -0.124867187f, 0.00610902021f, 0.175769659f, -0.234424768f, 0.139750519f, 0.0559373017f, -0.215983175f, -0.365642162f,
+    0.101489187f, -0.248270369f, -0.0318556997f, 0.306998001f, -0.211633417f, 0.0241188894f, 0.0209549547f, -0.162893425f,
+    -0.504306377f, 0.0562114512f, 0.0763122591f, -0.0668826601f, 0.156673647f, -0.240733613f, -0.173524848f, 0.306752281f,
+    -0.184086267f, 0.153338355f, -0.276256817f, 0.0406639854f, 0.0407247419f, 0.0341021076f, -0.234160347f, 0.00694752438f,
+    -0.0776954866f, -0.213491199f, 0.0718105234f, -0.0865569502f, 0.248083792f, 0.0878843654f, 0.000504498692f, -0.172747865f,
+    -1.45075218e-10f, -2.62831394e-12f, 0.068837929f, -0.034594105f, 0.000364359734f, -0.211974435f, 4.41678095e-11f, -0.000830656933f,
+    -0.0217449682f, -0.204754286f, 0.0195258366f, 0.0636562705f, 0.198791429f, -8.46721658e-12f, -0.125729398f, 0.0962110502f,
+    -0.193714233f, 0.29440105f, -0.37135503f, -0.0137094604f, -0.0464669207f, 0.0272321333f, 0.0545716109f, -0.180143907f,
+    -0.0639687572f, -0.119403363f, 0.133104515f, 0.0509595803f, 0.309036267f, 0.198614665f, -0.128284782f, 0.024694047f,
+    4.12861725e-06f, -0.256478967f, 0.0697468284f, 0.312792143f, -0.244500475f, 0.158419709f, -2.78855476e-11f, -0.00523625043f,
+    -0.145760797f, 0.106610692f, -0.0876384962f, -0.0526778413f, -0.252152975f, -0.144570649f, -0.0806597006f, 0.239045943f,
+    0.202223977f, 0.00239709766f, -0.3375419f, -0.297058107f, 0.0333714019f, -0.0440690446f, -0.286319106f, -0.0578403046f,
+    0.359713536f, 0.364174097f, -0.186651573f, 0.0298098329f, -0.0824302553f, 0.115621182f, 0.257415455f, -0.264170406f,
+    -0.0053032803f, -0.00967057396f, 0.138558778f, 0.0538866471f, -0.1341793f, -0.126232109f, -0.0105436662f, 0.0210941951f,
+    0.0552962811f, 0.312318298f, 0.127797966f, 0.0562911922f, -0.242768345f, -0.00616639401f, 0.244121265f, 0.0487306331f,
+    0.290259254f, 0.045967776f, -0.332682235f, 0.263046635f, 0.232509651f, 0.0267868627f, 0.165048528f, -0.0854321987f,
+    -0.0917561281f, 0.111926114f, 0.198733245f, 0.112166697f, -0.0712564624f, -0.109541388f, 0.141879876f, -0.00696029375f,
+    -0.0823731905f, 0.026041381f, 0.0272855426f, 0.151384308f, 0.207680946f, -0.207708717f, -0.00615556508f, -0.170299874f,
+    0.262441702f, 0.0525017626f, -0.214325383f, 0.0942115217f, 0.191666074f, 0.151286884f, 0.332804451f, 0.0321704167f,
+    0.216780588f, 0.0528916118f, 0.291721112f, 0.062743935f, 0.185055158f, 0.183249829f, -0.0647991899f, 0.131093109f,
+    0.383469437f, 0.374806593f, -0.0953218546f, -0.0708089012f, -0.159466875f, 0.0985782653f, 0.261850884f, -0.206346982f,
+    -0.0464958299f, 0.26772049f, 0.242203673f, 0.142695225f, 0.00631786238f, 0.10959144f, -1.57694349e-05f, 0.0110632213f,
+    0.0347164292f, 0.358164723f, 0.182059669f, 0.237115515f, -0.268055079f, -0.0404361986f, -0.382371986f, -0.215640177f,
+    0.221464621f, 0.221905635f, -0.084085129f, -0.110108396f, 0.176917719f, -0.0363716771f, 0.130629654f, 0.2574944f,
+    0.170258476f, 0.0104339787f, 0.053533451f, 0.253119999f, 0.0540318566f, -0.264313382f, 0.24705652f, -0.343299243f,
+    0.0691754804f, -0.0449583548f, 0.352888227f, 0.0301245563f, -0.108381805f, -0.0785562542f, -7.82085207e-06f, 0.162414682f,
+    0.205074064f, 0.0798571053f, 0.114733302f, 0.248545221f, 0.105696906f, 0.024059066f, -0.0279433452f, -0.129627323f,
+    0.150803926f, -0.231592806f, 0.162047771f, 0.0295939661f, 0.170023902f, -0.213934935f, 0.152130881f, 0.102180948f,
+    0.0291837484f, -0.227441992f, 0.183996836f, 0.151665409f, -0.0512756112f, 0.036267394f, 0.197668466f, 0.188236572f,
+    -0.137272667f, 0.180743294f, 0.0364546762f, -0.0490496149f, -0.259730458f, 0.0541636852f, 0.000833122527f, 0.0843755122f,
+    0.0637777642f, -0.134764276f, 0.0849429082f, -0.0630833272f, -0.12485727f, -0.0512312052f, -0.270680865f, -0.163519735f,
+    -0.105989285f, 0.211359779f, 0.366802878f, 0.32133335f, 0.18575399f, -0.177060642f, 0.16057104f, 0.185433673f,
+    -0.305967114f, 0.12432798f, 0.284875094f, -0.142474549f, 0.11951558f, 0.0268594054f, -0.180465956f, -0.10072514f,
+    -0.125747094f, -0.415172718f, -0.0573812054f, 0.232262536f, -0.10616766f, -0.0810820138f, -1.43313574e-05f, 0.189576229f,
+    -0.350070664f, 0.181098493f, 0.359489148f, 0.312174202f, -0.0231667315f, 0.128032067f, -0.186710796f, 0.048244309f,
+    -0.354958292f, -0.119154281f, 0.211765159f, 0.124880674f, 0.0513263346f, 0.072980383f, 0.176888655f, -0.159359378f,
+    -0.00983758209f, -0.282323101f, 0.25779571f, 0.2253533f, 0.349120678f, -0.236747201f, -0.260324376f, 0.0201849518f,
+    -0.152627749f, -0.207578114f, 0.357056717f, -0.15213705f, -0.106158249f, 0.0504281088f, 5.41893279e-11f, 0.117321021f,
+    -0.2638988f, -0.129418031f, -0.193443666f, -0.173457398f, 0.347791276f, -0.199262002f, 0.1504578f, 0.0743732345f,
+    -0.0526234221f, 0.308184618f, -0.129116971f, 0.164937897f, 0.414969844f, -0.0929445771f, 0.307454273f, -0.365113661f,
+    0.2402575f, 0.164279401f, 0.202368746f, 0.121413611f, -0.0482529401f, 0.0676867495f, -0.305338787f, 0.380625159f,
+    -0.0418376481f, -0.199698112f, 0.192088933f, 0.0933823329f, -0.207349695f, -0.206089528f, -0.00060469732f, -0.054198102f,
+    0.00516918583f, 0.219573245f, 0.0176052458f, -0.0791656188f, 0.271971025f, 0.0888167147f, -0.332311926f, 0.245025355f,
+    0.0803349334f, -0.274217771f, 0.164988868f, 0.164932091f, -0.196863617f, 0.187563804f, 0.158301321f, 0.204780009f,
+    0.0160324586f, -0.0645528971f, 0.150066378f, 0.141906716f, -0.277343174f, -0.00963283341f, 0.25871899f, 0.0999036257f,
+    -0.163967055f, 0.133865744f, -0.117575113f, -0.130654091f, -0.205902716f, -0.148222494f, 0.000318057826f, -0.00993502547f,
+    -0.241158207f, 0.0118738188f, 0.295254381f, 0.303521703f, 0.0146031206f, -0.117885902f, 0.30064204f, 0.246712895f,
+    -0.398735224f, -0.289942545f, 0.172823088f, 0.300483617f, 0.0411719373f, -0.135013483f, -0.0189221537f, 0.206296441f,
+    0.0697188112f, -0.155221319f, 0.301462871f, 0.35155803f, -0.226845849f, -0.00398890698f, 0.0292909539f, 0.0455853325f,
+    0.0207181177f, -0.0740778596f, 0.054346225f, 0.292399223f, 0.0101934417f, 0.0662863784f, -0.00329026589f, 0.0784651651f,
+    0.0527588504f, -0.217168475f, 0.321936989f, 0.347878511f, -0.215768873f, 0.205219763f, -0.395686762f, -0.231034417f,
+    -0.114888302f, 0.332368111f, 0.277777899f, -0.270852088f, 0.317299896f, 0.199873757f, -0.0395291669f, 0.0163532743f,
+    0.319816995f, 0.220766413f, 0.376369622f, -0.16608785f, 0.290077788f, 0.109321763f, -0.0663298431f, 0.30169376f,
+    0.112809372f, -0.0843945403f, 0.0531081638f, 0.0888329331f, -0.002543137f, 0.140984644f, 5.14097914e-05f, 0.16194639f,
+    -0.576120626f, 0.411127301f, -0.126052864f, 0.238560055f, 0.0764993011f, -0.00937441121f, -0.156981919f, 0.185126452f,
+    0.0784083522f, 0.141615928f, 0.0980822052f, -0.1405133f, 0.0420384491f, 0.271652965f, 0.00894787796f, -0.0669965105f,
+    0.224580325f, 0.320481302f, -0.0612149841f, -0.0570249143f, -0.199025809f, -0.0926246128f, 0.0488067404f, 0.100936127f,
+    0.014976147f, 0.147743735f, 0.0541996621f, 0.308333367f, -0.0409347688f, 0.339192538f, 7.71278258e-09f, -0.210345738f,
+    -0.000648908253f, 0.04454241f, 0.193239458f, -0.159403556f, -0.240174886f, 0.156813642f, -0.21444956f, 0.119732901f,
+    0.00325639589f, 0.0286708497f, -0.0486269601f, 0.0708779912f, -0.196910377f, -0.0407072888f, -0.316050416f, -0.127204709f,
+    0.187291289f, 0.307657615f, 0.133952441f, 0.273554479f, 0.255776282f, 0.0589790748f, 0.00372728014f, 0.320875465f,
+    2.47744052e-07f, 0.170867311f, -0.0693727662f, -0.0865794993f, -0.0401565432f, 0.171505081f, -7.21040189e-11f, -0.0168834904f,
+    0.348169843f, -0.202308208f, 0.0355791671f, -0.355242042f, 0.231767146f, 0.0105757451f, 0.019633387f, 0.271456104f,
+    0.113954185f, 0.137030315f, 0.0113940351f, 0.0949836468f, -0.330254223f, 0.370937128f, 0.0504316208f, 0.0717910557f,
+    0.0500324499f, -0.0282196441f, 0.106429692f, -0.189272404f, 0.175463701f, -0.00551486422f, -0.0655986388f, -0.108606058f,
+    -0.0216912335f, 0.189120632f, -0.163313282f, -0.0267074268f, -0.113921096f, -0.168480474f, 0.000179817802f, -0.0154524898f,
+    0.338224135f, 0.32365403f, 0.0371033737f, 0.179026435f, 0.144197045f, -0.00183606356f, -0.0734534331f, -0.219070378f,
+    0.364509456f, -0.333232167f, -0.0783711128f, 0.14739681f, 0.0699401025f, 0.188937562f, -0.247127479f, 0.356197754f,
+    0.0906844318f, 0.0645032314f, -0.328900167f, 0.376327717f, -0.0452489813f, 0.145017291f, 0.414702432f, -0.11601919f,
+    8.83849683e-12f, 0.194611351f, -0.106776559f, -0.146419305f, 0.121883275f, 0.170461934f, 0.00756248346f, -8.06227363e-11f,
+    0.236976429f, 0.245129557f, 0.0736321663f, 0.311301092f, -0.244061743f, 9.20773246e-12f, -0.0278148015f, -0.177347338f,
+    -0.296998256f, 0.248771402f, 0.456889347f, 0.00973672124f, 0.481549088f, 0.164475325f, -0.0198443869f, -0.404794582f,
+    0.421526498f, -0.141402604f, 0.213939801f, -0.496632332f, -0.0152432792f, -0.142102565f, -0.199511804f, 0.179502592f,
+    -0.0849997249f, -0.528179186f, 0.403272428f, 0.171319314f, -0.00105358624f, -0.0328339476f, -0.0230185074f, -0.139101135f,
+    -0.483755137f, -0.341361517f, -0.526681273f, -0.199490753f, 0.0720802694f, -1.97789637e-10f, 0.106009744f, 0.190924838f,
+    0.106619982f, 0.0281892423f, -0.112876519f, 0.121702062f, -0.0960624506f, -0.16693645f, 0.0787058357f, 0.0596729069f,
+    0.41268422f, 0.329390827f, 0.329981106f, -0.280558157f, -0.0445867825f, -0.0691442086f, -0.105751585f, -0.0337217694f,
+    0.175529901f, 0.0765502982f, 0.233777224f, -0.0375966956f, 0.161425377f, 0.195207063f, 0.00213284261f, -0.276894633f,
+    5.15423194e-09f, 0.0483202488f, 0.0219774958f, -0.119901538f, 0.155052f, 0.0746729716f, -0.343963106f, 0.000440081437f,
+    0.0672090173f, -0.133124851f, -0.297260397f, 0.0587411886f, 0.0812051339f, -0.204004183f, -0.290850299f, 0.0341828039f,
+    0.351187143f, 0.167417788f, 0.14108077f, 0.0537840037f, -0.0117928873f, -0.259185023f, 0.161194866f, 0.341678433f,
+    -1.64292748e-09f, 0.269263608f, 0.219477905f, -0.161738416f, 0.163177263f, -0.0849987301f, 4.05348204e-11f, -0.19836196f,
+    -0.333774556f, -0.160298167f, -0.0119242598f, -0.0394577064f, 0.153204224f, -0.0161622418f, -0.168617309f, 0.134693383f
+};
+static const float nn_layer1_bias[32] = {
+    0.0480020365f, 0.0733242715f, 0.169674411f, 0.237577507f, 0.0766057943f, 0.0953947005f, 0.0952495869f, -0.0124124174f,
+    0.0294968987f, 0.29566615f, 0.0602222574f, 0.265907322f, 0.240663387f, 0.157039557f, 0.310769792f, 0.0623514284f,
+    -0.137841868f, 0.160559694f, 0.0333287521f, 0.0176877137f, 0.0836513016f, 0.0788007189f, -0.0627235565f, -0.1892346f,
+    -0.0082236003f, -0.0395792463f, 0.303655679f, 0.0542764393f, -0.111578995f, -0.257006191f, 0.205297506f, 0.121836139f
+};
+
+/* 第2层 32x7 softmax，按[输入][输出]行优先存储 */
+static const float nn_layer2_weights[224] = {
+    0.109233773f, -0.541746441f, -0.255362958f, -0.343690497f, -0.0508754653f, 0.136475306f, 0.0694573231f, -0.245077931f,
+    0.380519709f, -0.119021342f, 0.295806587f, -0.382039897f, 0.0740961462f, -0.519365469f, -0.169746053f, 0.542759563f,
+    0.0637074253f, -0.553225152f, -0.530700361f, -0.266698136f, -0.459598476f, -0.513401693f, 0.0781899133f, 0.0868951779f,
+    -0.305778259f, 0.496603921f, -0.442630628f, 0.222120413f, -0.35038771f, 0.45347726f, -0.0549317936f, 0.390858104f,
+    0.254965219f, -0.27237171f, 0.651589633f, 0.0670958652f, -0.238418356f, -0.260767773f, 0.0235361576f, -0.417003657f,
+    -0.0265751303f, 0.214541149f, 0.0855278249f, 0.193241934f, 0.0957353029f, -0.151446207f, -0.0664049955f, -0.353172902f,
+    -0.441720305f, -0.139795799f, -0.354212548f, 0.517729912f, -0.106952374f, -0.222904776f, -0.0558651952f, -0.608872998f,
+    -0.212765414f, 0.0332027813f, 0.0178523284f, -0.19086544f, 0.300142085f, 0.421783308f, 0.00858719581f, 0.064964057f,
+    -0.0353351488f, -0.47261169f, -0.230997452f, -0.587503876f, 0.101519434f, 0.179119095f, -0.414659487f, 0.444158794f,
+    0.411907856f, 0.271776737f, 0.220500565f, 0.16417366f, -0.49570188f, 0.285832636f, -0.441956481f, 0.372436841f,
+    -0.3484893f, 0.475508184f, 0.465531708f, -0.51797733f, -0.124174762f, 0.243909813f, -0.0512261578f, 0.440427183f,
+    0.22877862f, -0.189658687f, -0.342554764f, -0.263284093f, 0.182850513f, -0.105043315f, 0.0344946178f, -0.0263538608f,
+    0.0722456567f, 0.264088152f, 0.59287626f, -0.221884622f, 0.401049889f, 0.0747888392f, -0.0607627011f, 0.463031516f,
+    -0.572702424f, -0.68420012f, 0.0910106996f, -0.243623208f, 0.431745045f, 0.480661339f, -0.48904415f, 0.345017651f,
+    -0.0748047236f, 0.0429286786f, 0.0648463555f, 0.297148062f, -0.407565648f, -0.0542923335f, 0.113248734f, 0.370115306f,
+    -0.0415109751f, -0.491064499f, -0.381353841f, -0.310477808f, 0.346050842f, -0.418230131f, -0.597616644f, 0.427917487f,
+    -0.603121642f, 0.302998881f, -0.00175391184f, 0.396993916f, -0.138854811f, -0.639210151f, 0.137410706f, 0.161010838f,
+    0.319336582f, -0.417335001f, 0.313299531f, 0.308468468f, 0.113323474f, 0.178603633f, 0.238840191f, 0.0564791476f,
+    -0.35431661f, 0.0261944941f, -0.35641031f, -0.201404217f, -0.140027301f, -0.437781607f, -0.154476491f, -0.260465856f,
+    0.39847691f, 0.29543833f, -0.0684282818f, 0.0821952461f, 4.42028086e-11f, -0.00182732927f, -0.0662318636f, 1.18496923e-13f,
+    0.0171248485f, 0.143223849f, -0.325184438f, -0.319874396f, -0.0959980412f, -0.177551509f, -0.228337689f, -0.190896231f,
+    0.58475674f, 0.243783591f, -0.178512486f, 0.189489862f, -0.249418452f, 0.0210058918f, -0.614059346f, 0.318820547f,
+    0.213114439f, -0.115193869f, -0.346423109f, -0.0714654625f, -0.514324831f, 0.501355977f, 0.00784104464f, 0.104219826f,
+    0.234670386f, -0.0360792846f, -0.478383438f, 0.244164355f, -0.448141918f, 0.241631786f, 0.154914825f, 0.393511535f,
+    -0.155845924f, -0.182131432f, -0.48843509f, 0.355764724f, -0.324122005f, -0.145650993f, -0.362514164f, -0.503533554f,
+    0.291496404f, -0.393154978f, 0.0324111387f, -0.15461504f, -0.37800473f, -0.00510200609f, -0.36730778f, -0.186290517f,
+    0.147183468f, -0.354027136f, 0.400728744f, -0.585985155f, -0.390150121f, 0.297777679f, 0.0866283856f, -0.520016835f,
+    -0.033353243f, -0.295670244f, 0.144356523f, -0.286237758f, 0.359901578f, 0.514122639f, -0.138694792f, 0.354185617f
+};
+static const float nn_layer2_bias[7] = {
+    0.0414190694f, 0.265253674f, -0.239480482f, -0.0092890078f, 0.124335296f, -0.140182242f, 0.242298728f
+};
+
+static const float *const nn_weights[NN_NUM_LAYERS] = {nn_layer0_weights, nn_layer1_weights, nn_layer2_weights};
+static const float *const nn_biases[NN_NUM_LAYERS] = {nn_layer0_bias, nn_layer1_bias, nn_layer2_bias};
+
+/* int8量化模型：int16原始ADC输入，int8权重，int32累加，隐藏层激活量化到[0, 127] */
+#define NN_HAS_QUANTIZED 1
+
+static const int8_t nn_q_layer0_weights[256] = {
+    -40, 85, 16, 15, -67, -58, -72, 65, -5, 46, -79, 77, 63, -74, -22, -30,
+    -33, -24, 25, -50, -26, -72, -1, -29, -8, 55, -32, -5, 30, -69, 9, -64,
+    -102, 53, 86, 1, -20, -44, 16, -48, -66, -3, -79, 63, -27, 9, -48, -7,
+    -14, -11, 45, 52, 40, 51, 44, 68, -100, -57, -52, -12, -32, -85, 38, -32,
+    -23, 18, -34, 22, -41, 40, 22, -42, -32, 33, 28, 29, 30, -19, -8, -43,
+    32, 0, -18, -35, -22, 3, 7, 8, 34, 13, -24, 29, 29, 14, 18, -9,
+    7, -13, -44, -2, -30, -14, -13, 13, 16, -41, -15, 29, -16, -21, -25, -29,
+    28, 24, 21, 35, 26, -5, 34, 14, 39, 37, 0, -39, -39, 3, 20, 32,
+    -80, 36, -35, -51, -95, -9, 110, 22, -23, 67, -8, 107, 100, -92, 41, 7,
+    -2, -120, 62, -54, -113, -95, 104, -80, -111, -28, 127, -74, -7, 62, -70, 10,
+    -91, 1, 77, 0, -102, 60, -20, -107, -127, 94, 55, -97, 3, -78, 43, -23,
+    15, 20, 91, -72, -48, -123, 90, 88, -110, 4, 87, 18, 61, -114, -77, 84,
+    35, -6, -18, -5, 24, 31, 36, 33, 1, -35, -17, 12, -7, -39, -36, 22,
+    -42, -22, 21, 29, -1, -27, 12, -9, -1, 27, 18, 31, 22, 13, -13, -21,
+    -30, -29, 42, 0, 36, 14, 14, -13, -4, 21, -7, 25, -12, -26, 17, -27,
+    37, 40, 27, 4, -43, 22, -1, 37, 37, 26, -26, 4, 35, -27, -13, -5
+};
+static const int32_t nn_q_layer0_bias[64] = {
+    51685, -53197, 48983, 2655, 84007, -9293, -63964, -33654, 35663, -36178, 39038, -103394, -85025, 113509, 32190, 26406,
+    38168, 92931, -41302, 45743, 86852, 99271, -54913, 58506, 45417, -38667, -44724, -7356, -40262, -22675, 27195, 48313,
+    104247, 13152, -82755, -6478, 51899, -11898, -6829, 74623, 88208, -33342, 28090, -21406, 22057, 65349, 7665, 58888,
+    -38255, -39314, -92472, -12253, 31784, 18174, -78699, -111421, 38251, -14181, 9492, 20523, -15660, 106467, 11683, -42104
+};
+
+static const int8_t nn_q_layer1_weights[2048] = {
+    49, 9, 37, -39, 75, 59, 10, -8, 0, 15, -16, 10, -40, -47, -64, -31,
+    27, 56, 20, -46, -4, 5, -1, -14, -5, 50, 5, -12, -28, 9, 31, 37,
+    -21, -25, -24, 50, -31, -11, 68, 33, -33, -2, 21, 43, 63, -16, 73, 74,
+    -38, -74, -41, -56, -24, -4, -3, -24, 18, -23, 59, 5, -5, 17, 43, 62,
+    76, 47, -15, -40, 20, 66, 36, -24, -42, 33, 2, 37, 66, -14, 37, 56,
+    -47, 78, 20, 52, -22, 30, 0, -5, 76, -48, -34, 41, 38, 4, 46, 27,
+    -69, -3, 39, 40, 51, -2, -31, -34, 64, 50, 11, 25, -3, -1, -54, -84,
+    8, -2, 12, 27, -43, 28, 0, -50, -2, 93, 34, 11, 66, 44, 17, 38,
+    33, -60, 38, -7, 11, 77, -56, 4, -74, 22, -62, -64, -24, 10, 5, 45,
+    33, 10, -21, 40, -33, 32, -5, 44, -45, 79, -16, 90, -60, 1, 80, 8,
+    35, 40, 19, 1, 32, 66, -31, 1, 74, 78, 22, 32, -14, -37, 12, -10,
+    -3, -27, 81, 89, 16, 25, 0, 28, -4, -4, 69, 54, 33, 20, -14, -13,
+    68, 41, -72, -69, -30, 52, 71, -4, 35, 18, 89, 61, 22, -1, 18, -66,
+    -10, 65, 64, 80, 45, 30, 0, 42, 27, -44, 22, -55, 30, 0, -22, -1,
+    64, -42, -23, 36, -57, 73, 22, 75, -23, 31, 48, 15, -39, -55, 84, -37,
+    17, 16, -66, -90, -19, -22, 0, -11, 91, 25, 49, 70, -35, 9, 73, 8,
+    5, 32, -14, -40, -19, 82, -15, -4, -5, -11, -60, -38, -23, -43, -17, 16,
+    -36, 19, 33, -16, 15, -53, 0, -53, -15, 7, -48, -11, -54, -7, -1, -29,
+    4, 13, -28, 64, 26, -57, 30, 69, -64, -34, 49, 56, -31, -35, 6, 27,
+    8, -33, -1, 17, -58, -45, 0, 38, -19, -25, -26, 19, 36, -32, 4, 16,
+    -35, -1, -3, -7, -3, 63, -5, -26, 60, 19, -17, 29, 33, 21, -18, -7,
+    -38, -5, 54, 34, -21, 60, 0, -35, -92, -53, -19, -62, -21, -27, -21, 76,
+    -37, 9, 13, 82, -33, -24, 74, 64, 20, -31, -5, 46, 34, 3, 30, 2,
+    24, -37, -12, 4, -7, -33, -1, 8, -40, -22, -14, 24, 26, -52, -8, -29,
+    -54, 39, 9, 72, -23, 5, 57, 35, -22, -24, 7, 75, 24, 47, -18, 55,
+    41, -56, -49, 20, 1, 14, -1, 28, -50, -52, -13, 61, 54, -3, 11, 65,
+    5, 63, -33, -19, 44, 6, 11, -47, -42, 31, 22, -25, 71, 7, -107, 84,
+    -8, -85, 7, 73, 10, -4, 2, -5, -100, -39, -76, 4, -63, 0, 50, 80,
+    11, 35, -59, 60, -62, 14, 15, -66, -5, 17, 21, 51, 47, -1, -4, 11,
+    -46, 70, 40, -16, -8, 32, -1, 3, 25, -3, -70, 11, 71, 3, 48, 78,
+    66, -54, 2, -4, -19, 57, 35, 76, -15, -10, 34, 43, -30, 40, 66, 0,
+    -4, 31, -45, -31, 29, -43, 0, -17, 26, 80, -24, 17, 11, -10, 2, -21,
+    -43, -16, 19, 19, 54, -12, -10, -20, -23, 11, 8, 83, -11, -15, -44, 81,
+    -11, 11, -6, 27, -37, 28, 0, -40, -72, -31, 11, -78, 60, -9, 25, 22,
+    -5, 29, -15, -20, 75, 79, -28, -53, 9, 7, -27, -62, 46, 11, -92, 2,
+    -40, -26, -4, -13, 29, -49, 0, -35, -86, -18, -7, 54, 42, -15, 42, -4,
+    19, 21, -59, -61, -76, -18, -10, 49, 10, 82, 42, 28, -52, -17, 64, -77,
+    0, 41, -3, -39, -26, 76, 0, -21, 97, 32, 87, 69, -44, -9, 17, -34,
+    64, -44, -46, 21, 54, 40, -45, -4, -73, 74, -64, -9, -21, 1, 8, 39,
+    -17, -24, -55, 32, 37, -11, 0, -6, -21, 84, -26, 27, -11, -3, -2, 17,
+    -9, 12, -7, -13, 28, 19, 36, -47, -12, 26, 30, 24, 45, -36, -81, 17,
+    0, -35, 29, 30, -21, 13, -2, -52, 20, 34, 2, 24, -40, 30, 62, 60,
+    -1, 21, 13, -44, 105, -12, 33, -69, -44, 6, 67, 0, 59, 11, -35, 77,
+    -43, -70, 14, 93, 45, -64, 0, 39, -71, 8, 14, -57, 15, -26, 68, 96,
+    68, -20, 35, 42, -50, 49, -60, 38, -7, -22, -27, 48, -33, 21, -18, -25,
+    -8, 59, -5, -2, 33, 33, 0, -55, 48, -67, 65, 11, 54, 27, 91, -32,
+    34, 12, 24, 26, 80, 83, 20, -43, 9, 48, 0, -77, 7, -29, -67, 3,
+    -61, -96, 101, 21, -16, 6, 0, 42, -15, -28, -41, 62, 53, -9, 33, -8,
+    42, -7, 74, 40, 49, 7, -4, -64, -1, 3, 58, -42, -26, 45, 2, 81,
+    42, -68, 32, 56, 16, -49, 0, -36, -87, 22, 26, 31, -24, 36, -16, -12,
+    -3, 70, 68, 64, 45, -29, -20, 17, -36, -24, 54, -19, -25, -34, 45, -59,
+    32, -32, 13, 36, 0, -43, 0, 3, -47, 81, 64, 49, 4, 33, -43, 27,
+    55, 5, -15, 10, -70, 67, 43, 10, 63, 5, -29, 61, -55, 30, 79, -43,
+    -5, 21, 34, 22, 10, -2, 0, -2, 83, -16, 74, -5, 31, 0, 48, 18,
+    -85, 70, 52, -31, 4, -25, -30, -29, 78, 61, -20, 20, 70, 29, 4, -106,
+    19, 67, 7, -17, 0, 12, 0, -13, -89, 93, 60, 26, 14, 27, -23, -21,
+    -40, 44, 47, -7, 66, -62, 20, 72, 16, 34, 23, -3, 75, -13, 64, -27,
+    -42, -41, 44, 8, 31, 23, 4, -38, 21, 20, 56, 64, 15, 7, -86, -59,
+    66, 32, -30, -18, -49, -25, -35, 23, -3, 48, 41, 27, -26, 37, -3, -19,
+    -5, -23, 34, 40, 5, 5, 0, 1, 10, -95, 20, -100, -41, 5, -63, -9,
+    -24, 45, 31, -35, 1, -4, -39, -41, 24, -40, 19, -41, 29, 15, 9, -14,
+    -45, -52, 57, 25, -48, 35, -3, -2, 0, 23, 41, 25, -2, 29, -27, 60,
+    33, 30, -36, 17, 6, 60, -66, -63, -8, -5, 32, -9, 86, -23, -22, 69,
+    -6, 22, 37, 34, -35, 77, 4, -6, -36, 26, -40, -72, -18, 0, 74, 55,
+    -39, 28, 32, -22, 127, -15, 22, -62, 102, 11, 49, -15, 78, -15, -106, 67,
+    27, -108, 89, 75, 24, -49, 0, 36, -117, -50, -35, -58, 22, -5, -8, 102,
+    -47, 16, 5, 39, -22, -19, 42, -9, -1, -53, 66, -12, 89, -9, -18, -15,
+    -40, -19, -7, 29, 0, -45, 0, 18, -47, -78, -37, 41, 48, -7, 78, 61,
+    38, 3, 2, -41, -99, -77, 42, 82, -80, -58, 28, 97, -43, -3, 10, -106,
+    9, 99, -80, -21, 19, -12, 0, -3, 61, 52, 9, -15, -45, -8, 30, -32,
+    4, -2, 0, 0, 1, 0, 0, 1, 3, 0, 0, 0, 1, 0, -4, 3,
+    0, 0, 0, 0, 0, 0, -2, 0, 5, -3, 4, 0, 1, 0, 0, 0,
+    85, -24, 6, 8, 50, 60, 29, -34, 15, -8, -3, -76, -6, -20, -33, 39,
+    -25, 18, -18, -20, -32, -65, 0, 11, 19, 32, -28, 74, -5, -8, -23, -17,
+    10, -34, -28, -10, -1, 51, 23, 44, 67, -11, -46, -34, -4, 40, -4, -2,
+    -3, 71, 5, -35, -9, -8, 0, 0, 42, 25, -1, -6, 11, 0, 56, -56,
+    0, 24, -30, 7, 27, -45, 11, -26, 4, 0, 37, 1, -45, 0, 3, 0,
+    30, 1, 0, -27, 0, -13, 1, 2, 0, 0, 32, 0, 0, -11, 0, -39,
+    -17, 27, 39, -29, 80, 69, -34, -98, 16, 40, 43, -30, -2, -18, -51, 55,
+    41, -110, 79, 44, -11, 12, 0, 46, -105, -33, -16, 29, -36, -50, -30, 87,
+    -11, 4, -6, -26, -1, 34, -40, -13, -6, 45, 65, -21, 26, -25, -64, 73,
+    41, 17, 43, 66, -8, -28, 0, 42, -84, 56, -32, 28, -59, -10, 50, 26,
+    82, -19, 21, -52, -76, 5, 54, 88, -29, 69, -53, 92, -70, 24, 39, -32,
+    0, 80, -90, -80, -20, -16, -2, 3, 86, 29, 56, 49, -78, 0, 92, -57,
+    88, 27, -57, 41, -46, 66, -29, 47, 65, 64, 14, 4, -25, -16, -9, 45,
+    -32, 85, 46, 38, -44, 53, 2, -4, 28, 47, -15, -16, -10, -1, 14, -26,
+    -78, -20, 74, 25, 74, -38, -2, -17, -27, 1, 38, -50, 30, 12, -46, -79,
+    22, -53, -7, 66, -46, 5, 5, -35, -109, 12, 16, -14, 34, -52, -37, 66,
+    -40, 33, -59, 9, 9, 7, -50, 1, -17, -46, 15, -19, 53, 19, 0, -37,
+    0, 0, 15, -7, 0, -46, 0, 0, -5, -44, 4, 14, 43, 0, -27, 21,
+    -42, 63, -80, -3, -10, 6, 12, -39, -14, -26, 29, 11, 67, 43, -28, 5,
+    0, -55, 15, 67, -53, 34, 0, -1, -31, 23, -19, -11, -54, -31, -17, 51,
+    44, 1, -73, -64, 7, -9, -62, -12, 77, 78, -40, 6, -18, 25, 55, -57,
+    -1, -2, 30, 12, -29, -27, -2, 5, 12, 67, 28, 12, -52, -1, 53, 10,
+    62, 10, -72, 57, 50, 6, 36, -18, -20, 24, 43, 24, -15, -24, 31, -1,
+    -18, 6, 6, 33, 45, -45, -1, -37, 56, 11, -46, 20, 41, 33, 72, 7,
+    47, 11, 63, 14, 40, 39, -14, 28, 83, 81, -21, -15, -34, 21, 56, -44,
+    -10, 58, 52, 31, 1, 24, 0, 2, 7, 77, 39, 51, -58, -9, -82, -46,
+    48, 48, -18, -24, 38, -8, 28, 55, 37, 2, 12, 54, 12, -57, 53, -74,
+    15, -10, 76, 6, -23, -17, 0, 35, 44, 17, 25, 54, 23, 5, -6, -28,
+    32, -50, 35, 6, 37, -46, 33, 22, 6, -49, 40, 33, -11, 8, 43, 41,
+    -30, 39, 8, -11, -56, 12, 0, 18, 14, -29, 18, -14, -27, -11, -58, -35,
+    -23, 45, 79, 69, 40, -38, 35, 40, -66, 27, 61, -31, 26, 6, -39, -22,
+    -27, -89, -12, 50, -23, -17, 0, 41, -75, 39, 77, 67, -5, 28, -40, 10,
+    -76, -26, 46, 27, 11, 16, 38, -34, -2, -61, 55, 49, 75, -51, -56, 4,
+    -33, -45, 77, -33, -23, 11, 0, 25, -57, -28, -42, -37, 75, -43, 32, 16,
+    -11, 66, -28, 36, 89, -20, 66, -79, 52, 35, 44, 26, -10, 15, -66, 82,
+    -9, -43, 41, 20, -45, -44, 0, -12, 1, 47, 4, -17, 59, 19, -72, 53,
+    17, -59, 36, 36, -42, 40, 34, 44, 3, -14, 32, 31, -60, -2, 56, 22,
+    -35, 29, -25, -28, -44, -32, 0, -2, -52, 3, 64, 65, 3, -25, 65, 53,
+    -86, -62, 37, 65, 9, -29, -4, 44, 15, -33, 65, 76, -49, -1, 6, 10,
+    4, -16, 12, 63, 2, 14, -1, 17, 11, -47, 69, 75, -46, 44, -85, -50,
+    -25, 72, 60, -58, 68, 43, -9, 4, 69, 48, 81, -36, 62, 24, -14, 65,
+    24, -18, 11, 19, -1, 30, 0, 35, -124, 88, -27, 51, 16, -2, -34, 40,
+    17, 30, 21, -30, 9, 58, 2, -14, 48, 69, -13, -12, -43, -20, 11, 22,
+    3, 32, 12, 66, -9, 73, 0, -45, 0, 10, 42, -34, -52, 34, -46, 26,
+    1, 6, -10, 15, -42, -9, -68, -27, 40, 66, 29, 59, 55, 13, 1, 69,
+    0, 37, -15, -19, -9, 37, 0, -4, 75, -44, 8, -76, 50, 2, 4, 58,
+    25, 29, 2, 20, -71, 80, 11, 15, 11, -6, 23, -41, 38, -1, -14, -23,
+    -5, 41, -35, -6, -25, -36, 0, -3, 73, 70, 8, 39, 31, 0, -16, -47,
+    78, -72, -17, 32, 15, 41, -53, 77, 20, 14, -71, 81, -10, 31, 89, -25,
+    0, 42, -23, -32, 26, 37, 2, 0, 51, 53, 16, 67, -53, 0, -6, -38,
+    -64, 54, 98, 2, 104, 35, -4, -87, 91, -30, 46, -107, -3, -31, -43, 39,
+    -18, -114, 87, 37, 0, -7, -5, -30, -104, -73, -113, -43, 16, 0, 23, 41,
+    23, 6, -24, 26, -21, -36, 17, 13, 89, 71, 71, -60, -10, -15, -23, -7,
+    38, 16, 50, -8, 35, 42, 0, -60, 0, 10, 5, -26, 33, 16, -74, 0,
+    14, -29, -64, 13, 17, -44, -63, 7, 76, 36, 30, 12, -3, -56, 35, 74,
+    0, 58, 47, -35, 35, -18, 0, -43, -72, -35, -3, -8, 33, -3, -36, 29
+};
+static const int32_t nn_q_layer1_bias[32] = {
+    754, 1151, 2664, 3730, 1203, 1498, 1496, -195, 463, 4642, 946, 4175, 3779, 2466, 4880, 979,
+    -2164, 2521, 523, 278, 1313, 1237, -985, -2971, -129, -621, 4768, 852, -1752, -4035, 3223, 1913
+};
+
+static const int8_t nn_q_layer2_weights[224] = {
+    20, -101, -47, -64, -9, 25, 13, -45, 71, -22, 55, -71, 14, -96, -32, 101,
+    12, -103, -99, -50, -85, -95, 15, 16, -57, 92, -82, 41, -65, 84, -10, 73,
+    47, -51, 121, 12, -44, -48, 4, -77, -5, 40, 16, 36, 18, -28, -12, -66,
+    -82, -26, -66, 96, -20, -41, -10, -113, -39, 6, 3, -35, 56, 78, 2, 12,
+    -7, -88, -43, -109, 19, 33, -77, 82, 76, 50, 41, 30, -92, 53, -82, 69,
+    -65, 88, 86, -96, -23, 45, -10, 82, 42, -35, -64, -49, 34, -19, 6, -5,
+    13, 49, 110, -41, 74, 14, -11, 86, -106, -127, 17, -45, 80, 89, -91, 64,
+    -14, 8, 12, 55, -76, -10, 21, 69, -8, -91, -71, -58, 64, -78, -111, 79,
+    -112, 56, 0, 74, -26, -119, 26, 30, 59, -77, 58, 57, 21, 33, 44, 10,
+    -66, 5, -66, -37, -26, -81, -29, -48, 74, 55, -13, 15, 0, 0, -12, 0,
+    3, 27, -60, -59, -18, -33, -42, -35, 109, 45, -33, 35, -46, 4, -114, 59,
+    40, -21, -64, -13, -95, 93, 1, 19, 44, -7, -89, 45, -83, 45, 29, 73,
+    -29, -34, -91, 66, -60, -27, -67, -93, 54, -73, 6, -29, -70, -1, -68, -35,
+    27, -66, 74, -109, -72, 55, 16, -97, -6, -55, 27, -53, 67, 95, -26, 66
+};
+static const int32_t nn_q_layer2_bias[7] = {
+    197, 1263, -1140, -44, 592, -667, 1154
+};
+
+static const int8_t *const nn_q_weights[NN_NUM_LAYERS] = {nn_q_layer0_weights, nn_q_layer1_weights, nn_q_layer2_weights};
+static const int32_t *const nn_q_biases[NN_NUM_LAYERS] = {nn_q_layer0_bias, nn_q_layer1_bias, nn_q_layer2_bias};
+static const int32_t nn_q_multipliers[NN_NUM_LAYERS - 1] = {1543043318, 1796194576};
+static const uint8_t nn_q_shifts[NN_NUM_LAYERS - 1] = {39, 40};
+
+/* 最近类中心预检：(x - mean) * inv_scale 到任一类中心的平方距离不超过上限才运行网络 */
+#define NN_HAS_PRECHECK 1
+#define NN_PRECHECK_CLASSES 7
+
+static const float nn_pre_mean[NN_INPUT_NODES] = {430.885714f, 607.0f, 468.085714f, 792.714286f};
+static const float nn_pre_inv_scale[NN_INPUT_NODES] = {0.00728498645f, 0.00385198835f, 0.00940413301f, 0.00353543975f};
+static const float nn_pre_centroids[NN_PRECHECK_CLASSES * NN_INPUT_NODES] = {
+    -0.631504254f, -1.10552066f, -0.0986090519f, 0.630318401f, 1.16060241f, 1.05467441f, -1.24591328f, 0.609105762f,
+    1.45782986f, 0.870549366f, 1.16906808f, 0.645167248f, -0.868994812f, -1.29889047f, -1.34371626f, -1.58074562f,
+    0.50058264f, 0.818932722f, 1.08631171f, -1.58003853f, -0.87045181f, 0.691817107f, 0.909514007f, 0.628904225f,
+    -0.748064037f, -1.03156248f, -0.476655199f, 0.647288512f
+};
+static const float nn_pre_max_distance = 3.97462648f;
+
+/* 置信度温度标定：softmax输出层的logits先除以该温度，拒识阈值作用于标定后的概率，与上位机RejectingPredictor一致 */
+#define NN_TEMPERATURE 1.25f
+
+#endif
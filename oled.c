@@ -1,66 +1,129 @@
-#include "oled.h"
-#include "bsp/i2c.h"
-#include <string.h>
-
-#define OLED_CMD   0x00
-#define OLED_DATA  0x40
-
-void OLED_Set_Pos(uint8_t x, uint8_t y) {
-    uint8_t cmd[3];
-    cmd[0] = 0xB0 | (y & 0x07);
-    cmd[1] = ((x & 0xF0) >> 4) | 0x10;
-    cmd[2] = x & 0x0F;
-    i2c_write(OLED_CMD, cmd, 3);
-}
-
-void OLED_Init(void) {
-    uint8_t init_seq[] = {
-        0xAE, 0x00, 0x10, 0x40, 0x81, 0xCF, 0xA1, 0xC8, 
-        0xA6, 0xA8, 0x3F, 0xD3, 0x00, 0xD5, 0x80, 0xD9, 
-        0xF1, 0xDA, 0x12, 0xDB, 0x40, 0x20, 0x02, 0x8D, 
-        0x14, 0xA4, 0xA6, 0xAF
-    };
-    
-    i2c_write(OLED_CMD, init_seq, sizeof(init_seq));
-    OLED_Clear();
-}
-
-void OLED_Clear(void) {
-    for (uint8_t i = 0; i < 8; i++) {
-        OLED_Set_Pos(0, i);
-        uint8_t zeros[128] = {0};
-        i2c_write(OLED_DATA, zeros, sizeof(zeros));
-    }
-}
-
-void OLED_ShowChar(uint8_t x, uint8_t y, char chr, uint8_t sizey) {
-    if (sizey == 8) {
-        uint8_t char_data[6] = {0}; // 6x8字符
-        OLED_Set_Pos(x, y);
-        i2c_write(OLED_DATA, char_data, 6);
-    } else if (sizey == 16) {
-        uint8_t char_data[16] = {0}; // 8x16字符
-        OLED_Set_Pos(x, y);
-        i2c_write(OLED_DATA, char_data, 16);
-    }
-}
-
-void OLED_ShowString(uint8_t x, uint8_t y, const char *str, uint8_t sizey) {
-    while (*str) {
-        OLED_ShowChar(x, y, *str, sizey);
-        if (sizey == 8) x += 6;
-        else x += 8;
-        str++;
-    }
-}
-
-void OLED_ShowChinese(uint8_t x, uint8_t y, uint8_t no, uint8_t sizey) {
-
-    if (sizey == 16) {
-        uint8_t char_data[32] = {0}; // 16x16汉字
-        OLED_Set_Pos(x, y);
-        i2c_write(OLED_DATA, char_data, 16);
-        OLED_Set_Pos(x, y + 1);
-        i2c_write(OLED_DATA, char_data + 16, 16);
-    }
-}
\ No newline at end of file
+#include "oled.h"
+#include "bsp/i2c.h"
+#include <string.h>
+
+#define OLED_CMD   0x00
+#define OLED_DATA  0x40
+
+// 同一页内两段变化之间相隔不超过该列数时合并发送：多发几个未变化的字节
+// 比再发一次定位命令和一次新的I2C传输更省
+#define OLED_MERGE_GAP 6
+
+#ifdef OLED_FONT_HEADER
+#include OLED_FONT_HEADER  // 提供字库 asc2_0806[95][6], asc2_1608[95][16], Hzk[][32]
+#else
+// 字库未随源码提供时使用空白字形
+static const uint8_t asc2_0806[95][6];
+static const uint8_t asc2_1608[95][16];
+static const uint8_t Hzk[22][32];
+#endif
+
+// 显存：framebuffer为绘制结果，shown为屏幕上当前的内容
+static uint8_t framebuffer[OLED_PAGES][OLED_WIDTH];
+static uint8_t shown[OLED_PAGES][OLED_WIDTH];
+// 每页的脏列范围 [dirty_lo, dirty_hi)，dirty_lo >= dirty_hi 表示该页未改动
+static uint8_t dirty_lo[OLED_PAGES];
+static uint8_t dirty_hi[OLED_PAGES];
+static int force_full;  // 屏幕内容未知（刚初始化），下次刷新发送整屏
+
+void OLED_Set_Pos(uint8_t x, uint8_t y) {
+    uint8_t cmd[3];
+    cmd[0] = 0xB0 | (y & 0x07);
+    cmd[1] = ((x & 0xF0) >> 4) | 0x10;
+    cmd[2] = x & 0x0F;
+    i2c_write(OLED_CMD, cmd, 3);
+}
+
+static void mark_dirty(uint8_t page, int x0, int x1) {
+    if (x0 < dirty_lo[page]) dirty_lo[page] = x0;
+    if (x1 > dirty_hi[page]) dirty_hi[page] = x1;
+}
+
+// 把一列字形数据写入显存的一页，超出屏幕的部分裁掉
+static void blit(int x, int page, const uint8_t *data, int width) {
+    if (page < 0 || page >= OLED_PAGES || x >= OLED_WIDTH) return;
+    if (x + width > OLED_WIDTH) width = OLED_WIDTH - x;
+    if (width <= 0) return;
+    memcpy(&framebuffer[page][x], data, width);
+    mark_dirty(page, x, x + width);
+}
+
+void OLED_Init(void) {
+    uint8_t init_seq[] = {
+        0xAE, 0x00, 0x10, 0x40, 0x81, 0xCF, 0xA1, 0xC8,
+        0xA6, 0xA8, 0x3F, 0xD3, 0x00, 0xD5, 0x80, 0xD9,
+        0xF1, 0xDA, 0x12, 0xDB, 0x40, 0x20, 0x02, 0x8D,
+        0x14, 0xA4, 0xA6, 0xAF
+    };
+
+    i2c_write(OLED_CMD, init_seq, sizeof(init_seq));
+    force_full = 1;
+    OLED_Clear();
+    OLED_Refresh();
+}
+
+void OLED_Clear(void) {
+    memset(framebuffer, 0, sizeof(framebuffer));
+    for (uint8_t i = 0; i < OLED_PAGES; i++) {
+        mark_dirty(i, 0, OLED_WIDTH);
+    }
+}
+
+void OLED_ShowChar(uint8_t x, uint8_t y, char chr, uint8_t sizey) {
+    if (chr < ' ' || chr > '~') chr = ' ';
+    int c = chr - ' ';
+    if (sizey == 8) {
+        blit(x, y, asc2_0806[c], 6); // 6x8字符
+    } else if (sizey == 16) {
+        blit(x, y, asc2_1608[c], 8); // 8x16字符：上半页8列，下半页8列
+        blit(x, y + 1, asc2_1608[c] + 8, 8);
+    }
+}
+
+void OLED_ShowString(uint8_t x, uint8_t y, const char *str, uint8_t sizey) {
+    while (*str) {
+        OLED_ShowChar(x, y, *str, sizey);
+        if (sizey == 8) x += 6;
+        else x += 8;
+        str++;
+    }
+}
+
+void OLED_ShowChinese(uint8_t x, uint8_t y, uint8_t no, uint8_t sizey) {
+
+    if (sizey == 16 && no < sizeof(Hzk) / sizeof(Hzk[0])) {
+        blit(x, y, Hzk[no], 16); // 16x16汉字
+        blit(x, y + 1, Hzk[no] + 16, 16);
+    }
+}
+
+int OLED_Refresh(void) {
+    int sent = 0;
+    for (uint8_t page = 0; page < OLED_PAGES; page++) {
+        int lo = dirty_lo[page], hi = dirty_hi[page];
+        int x = lo;
+        while (x < hi) {
+            // 跳过与屏幕内容相同的列，再向后合并间隔不超过OLED_MERGE_GAP的变化
+            while (x < hi && !force_full && framebuffer[page][x] == shown[page][x]) x++;
+            if (x >= hi) break;
+            int last = x;
+            for (int c = x + 1; c < hi && c - last <= OLED_MERGE_GAP + 1; c++) {
+                if (force_full || framebuffer[page][c] != shown[page][c]) last = c;
+            }
+            int len = last + 1 - x;
+            OLED_Set_Pos(x, page);
+            i2c_write(OLED_DATA, &framebuffer[page][x], len);
+            memcpy(&shown[page][x], &framebuffer[page][x], len);
+            sent += len;
+            x = last + 1;
+        }
+        dirty_lo[page] = OLED_WIDTH;
+        dirty_hi[page] = 0;
+    }
+    force_full = 0;
+    return sent;
+}
+
+const uint8_t *OLED_GetFramebuffer(void) {
+    return &framebuffer[0][0];
+}
@@ -1,15 +1,24 @@
-#ifndef __OLED_H__
-#define __OLED_H__
-
-#include <stdint.h>
-
-// OLED初始化
-void OLED_Init(void);
-
-// OLED控制函数
-void OLED_Clear(void);
-void OLED_ShowChar(uint8_t x, uint8_t y, char chr, uint8_t sizey);
-void OLED_ShowString(uint8_t x, uint8_t y, const char *str, uint8_t sizey);
-void OLED_ShowChinese(uint8_t x, uint8_t y, uint8_t no, uint8_t sizey);
-
-#endif
\ No newline at end of file
+#ifndef __OLED_H__
+#define __OLED_H__
+
+#include <stdint.h>
+
+#define OLED_WIDTH 128
+#define OLED_PAGES 8  // 64行，每页8行
+
+// OLED初始化
+void OLED_Init(void);
+
+// OLED绘制函数：只修改内存中的显存并标记脏区域，调用OLED_Refresh后才显示
+void OLED_Clear(void);
+void OLED_ShowChar(uint8_t x, uint8_t y, char chr, uint8_t sizey);
+void OLED_ShowString(uint8_t x, uint8_t y, const char *str, uint8_t sizey);
+void OLED_ShowChinese(uint8_t x, uint8_t y, uint8_t no, uint8_t sizey);
+
+// 把与屏幕内容不同的列按页成段发送，返回发送的显示数据字节数
+int OLED_Refresh(void);
+
+// 显存内容，OLED_PAGES x OLED_WIDTH 字节，按页存储
+const uint8_t *OLED_GetFramebuffer(void);
+
+#endif
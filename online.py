@@ -0,0 +1,321 @@
+import copy
+import os
+import queue
+import threading
+import numpy as np
+from network import (get_features_and_labels, train_model, save_artifact, save_sign_mapping,
+                     load_artifact, load_artifact_header, load_sign_mapping, data_hash,
+                     compile_model, restore_pipeline, FastPredictor, CentroidPredictor,
+                     RejectingPredictor, CachedPredictor, format_calibration,
+                     REJECT_THRESHOLD, CACHE_BUCKET)
+
+MODEL_FILE = 'model.npz'
+SAMPLES_FILE = 'samples.bin'
+PARTIAL_FIT_EPOCHS = 20
+REPLAY_RATIO = 1.0  # 增量训练时混入的旧样本数量（相对新样本的比例），缓解遗忘
+
+# 样本文件：定长记录 A1-A4 (uint16) + 手势编号 (uint16)，小端序，可直接追加
+SAMPLE_DTYPE = np.dtype([('x', '<u2', (4,)), ('label', '<u2')])
+# 会话索引文件（样本文件名加该后缀）：每次append（一次标定采集）的起始记录号，uint64小端序
+SESSION_SUFFIX = '.sessions'
+
+
+class SampleStore:
+    """可追加的标注样本文件"""
+
+    def __init__(self, path=SAMPLES_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, samples, label):
+        records = np.zeros(len(samples), dtype=SAMPLE_DTYPE)
+        records['x'] = np.clip(np.asarray(samples), 0, 65535)
+        records['label'] = label
+        with self._lock:
+            start = len(self)
+            with open(self.path, 'ab') as f:
+                f.write(records.tobytes())
+            with open(self.path + SESSION_SUFFIX, 'ab') as f:
+                f.write(np.array([start], dtype='<u8').tobytes())
+
+    def load(self):
+        """返回 (X[n, 4], y[n])，文件不存在时返回空数组"""
+        with self._lock:
+            if not os.path.exists(self.path):
+                return np.empty((0, 4)), np.empty(0, dtype=int)
+            records = np.fromfile(self.path, dtype=SAMPLE_DTYPE)
+        return records['x'].astype(np.float64), records['label'].astype(int)
+
+    def session_starts(self):
+        """每次append写入的第一个记录号（升序）；没有会话索引的旧文件返回空数组"""
+        path = self.path + SESSION_SUFFIX
+        with self._lock:
+            if not os.path.exists(path):
+                return np.empty(0, dtype=int)
+            starts = np.fromfile(path, dtype='<u8').astype(int)
+        return starts[starts < len(self)]
+
+    def __len__(self):
+        if not os.path.exists(self.path):
+            return 0
+        return os.path.getsize(self.path) // SAMPLE_DTYPE.itemsize
+
+
+class ModelHolder:
+    """当前使用的推理模型，可在识别运行中整体替换
+
+    predict/predict_batch每次只读取一次self._model引用，替换是单次赋值，
+    推理线程不会看到半更新的模型。
+    """
+
+    def __init__(self, model, sign_mapping):
+        self._model = model
+        self.sign_mapping = sign_mapping
+        self.version = 0
+        self._listeners = []
+
+    @property
+    def model(self):
+        return self._model
+
+    @property
+    def classes(self):
+        return self._model.classes
+
+    def add_listener(self, callback):
+        """模型替换后调用callback(holder)"""
+        self._listeners.append(callback)
+
+    def swap(self, model):
+        self._model = model
+        self.version += 1
+        for callback in self._listeners:
+            callback(self)
+
+    def predict(self, X):
+        return self._model.predict(X)
+
+    def predict_batch(self, X):
+        return self._model.predict_batch(X)
+
+    def predict_proba(self, X):
+        return self._model.predict_proba(X)
+
+
+class OnlineTrainer(threading.Thread):
+    """后台训练线程：对已有手势做partial_fit增量更新，出现新手势时完整重训，
+    完成后原子替换ModelHolder中的模型并保存到磁盘"""
+
+    def __init__(self, holder, store, pipeline=None, model_path=MODEL_FILE,
+                 mapping_path='sign_mapping.json', config=None):
+        super().__init__(name="OnlineTrainer", daemon=True)
+        self.holder = holder
+        self.store = store
+        self.pipeline = pipeline  # sklearn管道；为None时由从.npz加载的MLP重建，其他模型首个任务完整训练
+        self.model_path = model_path
+        self.mapping_path = mapping_path
+        self.config = config  # search.py选出的模型族和参数，为None时使用默认MLP
+        self._jobs = queue.Queue()
+        self.busy = False
+
+    def submit_samples(self, samples, label):
+        """提交新采集的标注样本（调用方负责写入SampleStore）"""
+        self._jobs.put(('samples', np.asarray(samples, dtype=np.float64), int(label)))
+
+    def request_retrain(self):
+        self._jobs.put(('retrain', None, None))
+
+    def stop(self):
+        self._jobs.put(None)
+
+    def _training_data(self):
+        return training_data(self.store)
+
+    def _retrain(self):
+        X, y = self._training_data()
+        if self.config is None:
+            self.pipeline = train_model(X, y)[0]
+        else:
+            # 保持搜索选出的模型族，重训后不会退回默认MLP
+            from search import train_family
+            self.pipeline = train_family(self.config['family'], self.config['params'], X, y)
+
+    def _partial_fit(self, samples, label):
+        pipeline = copy.deepcopy(self.pipeline)
+        scaler, mlp = pipeline[0], pipeline[-1]
+        X, y = self._training_data()
+        # 只混入模型已有类别的旧样本，尚未重训的新手势不能参与partial_fit
+        known = np.isin(y, mlp.classes_)
+        X, y = X[known], y[known]
+        rng = np.random.default_rng()
+        n_replay = min(len(X), int(len(samples) * REPLAY_RATIO) or 1)
+        replay_idx = rng.choice(len(X), n_replay, replace=False)
+        batch_X = scaler.transform(np.vstack([samples, X[replay_idx]]))
+        batch_y = np.concatenate([np.full(len(samples), label), y[replay_idx]])
+        for _ in range(PARTIAL_FIT_EPOCHS):
+            order = rng.permutation(len(batch_y))
+            mlp.partial_fit(batch_X[order], batch_y[order])
+        self.pipeline = pipeline
+
+    def _restore_pipeline(self):
+        """从.npz加载的MLP没有sklearn管道，在后台线程中由其参数重建，
+        启动后第一次标定已有手势即可partial_fit，不必完整重训"""
+        model = self.holder.model
+        if self.pipeline is not None or not isinstance(model, FastPredictor):
+            return
+        if self.config is not None and self.config['family'] != 'mlp':
+            return
+        alpha = self.config['params']['alpha'] if self.config is not None else 0.0001
+        try:
+            self.pipeline = restore_pipeline(model, alpha)
+        except Exception as e:
+            print(f"无法重建训练管道({str(e)})，首次更新时完整训练")
+
+    def run(self):
+        self._restore_pipeline()
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            kind, samples, label = job
+            self.busy = True
+            try:
+                # 只有MLP管道支持partial_fit，其他模型族总是完整重训
+                known = hasattr(self.pipeline, 'steps') and label in self.pipeline[-1].classes_
+                if kind == 'samples' and known:
+                    self._partial_fit(samples, label)
+                else:
+                    # 新手势无法通过partial_fit增加类别，需要完整重训
+                    self._retrain()
+                self.holder.swap(compile_model(self.pipeline))
+                X, y = self._training_data()
+                meta = {'search': self.config} if self.config is not None else None
+                save_artifact(self.pipeline, self.holder.sign_mapping, self.model_path, X, y, meta)
+                save_sign_mapping(self.holder.sign_mapping, self.mapping_path)
+                print(f"模型已更新 (版本 {self.holder.version})")
+            except Exception as e:
+                print(f"后台训练失败: {str(e)}")
+            finally:
+                self.busy = False
+
+
+class Calibrator:
+    """标定模式：从实时数据流中采集一段标注样本，写入样本文件并提交后台训练"""
+
+    def __init__(self, reader, store, trainer, holder, seconds=3.0):
+        self.reader = reader
+        self.seconds = seconds  # 每次采集的时长
+        self.store = store
+        self.trainer = trainer
+        self.holder = holder
+        self._start_seq = None
+        self._label = None
+
+    @property
+    def active(self):
+        return self._start_seq is not None
+
+    def label_for(self, name):
+        """返回手势名称对应的编号，新手势分配新编号并加入映射"""
+        mapping = self.holder.sign_mapping
+        for key, value in mapping.items():
+            if value == name:
+                return int(key)
+        label = max((int(k) for k in mapping), default=0) + 1
+        mapping[str(label)] = name
+        return label
+
+    def start(self, name):
+        self._label = self.label_for(name)
+        self._start_seq = self.reader.buffer.count
+        return self._label
+
+    def finish(self):
+        """结束采集，返回采集到的样本数"""
+        if self._start_seq is None:
+            return 0
+        samples, _, _ = self.reader.since(self._start_seq)
+        self._start_seq = None
+        if len(samples):
+            self.store.append(samples, self._label)
+            self.trainer.submit_samples(samples, self._label)
+        return len(samples)
+
+
+def training_data(store):
+    """内置数据加上样本文件中的标定样本，返回 (X, y)"""
+    X, y, _ = get_features_and_labels()
+    extra_X, extra_y = store.load()
+    return np.vstack([X, extra_X]), np.concatenate([y, extra_y])
+
+
+def load_initial_model(model_path=MODEL_FILE, mapping_path='sign_mapping.json', store=None):
+    """立即返回可用的模型，不在启动时阻塞训练，也不导入sklearn
+
+    返回 (推理模型, 手势映射, 是否需要后台训练)。模型文件缺失或无法加载时，
+    返回由内置数据构造的最近类中心后备模型；模型的训练数据哈希与当前
+    数据（内置数据+样本文件）不一致时仍先使用该模型，同时要求重训。
+    """
+    X, y = training_data(store if store is not None else SampleStore())
+    try:
+        model, sign_mapping, header = load_artifact(model_path)
+    except Exception as e:
+        print(f"无法加载模型({str(e)})，先使用后备模型，后台训练中...")
+        try:
+            sign_mapping = load_sign_mapping(mapping_path)
+        except Exception:
+            _, _, sign_names = get_features_and_labels()
+            sign_mapping = {str(k): v for k, v in sign_names.items()}
+        return CentroidPredictor(X, y), sign_mapping, True
+    if 'search' in header:
+        search = header['search']
+        print(f"使用模型搜索选出的{search['family']}模型 (交叉验证准确率 {search['accuracy']:.3f}, "
+              f"{search['latency_us']:.1f}us/样本)")
+    stale = header['data_hash'] != data_hash(X, y)
+    if stale:
+        print("模型与当前训练数据不一致，后台重新训练...")
+    return model, sign_mapping, stale
+
+
+def start_online_learning(model_path=MODEL_FILE, mapping_path='sign_mapping.json',
+                          samples_path=SAMPLES_FILE):
+    """加载(或后备)模型并启动后台训练线程，返回 (ModelHolder, SampleStore, OnlineTrainer)"""
+    store = SampleStore(samples_path)
+    model, sign_mapping, needs_training = load_initial_model(model_path, mapping_path, store)
+    holder = ModelHolder(model, sign_mapping)
+    try:
+        # search.py选出的模型带有search字段，后台重训沿用同一模型族和参数
+        config = load_artifact_header(model_path).get('search')
+    except Exception:
+        config = None
+    trainer = OnlineTrainer(holder, store, None, model_path, mapping_path, config)
+    trainer.start()
+    if needs_training:
+        trainer.request_retrain()
+    return holder, store, trainer
+
+
+def build_recognizer(holder, store, threshold=REJECT_THRESHOLD, bucket=CACHE_BUCKET):
+    """组装识别器：类中心预检 + 温度标定后的置信度拒识 + 预测缓存，返回 (识别器, RejectingPredictor或None)
+
+    threshold为0时不拒识也不预检，bucket为0时不使用缓存。模型替换后自动重建类中心、
+    重新标定温度并清空缓存，拒识阈值始终作用于标定后的概率。
+    """
+    model = holder
+    rejecting = None
+    if threshold > 0:
+        X, y = training_data(store)
+        rejecting = RejectingPredictor(holder, X, y, threshold=threshold)
+        rejecting.calibrate(X, y)
+        print(format_calibration(rejecting.calibration))
+
+        def refresh(_):
+            X, y = training_data(store)
+            rejecting.refit(X, y)
+            rejecting.calibrate(X, y)
+        holder.add_listener(refresh)
+        model = rejecting
+    if bucket > 0:
+        model = CachedPredictor(model, bucket)
+        holder.add_listener(model.invalidate)
+    return model, rejecting
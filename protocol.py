@@ -0,0 +1,347 @@
+import struct
+import time
+import numpy as np
+
+# 上行二进制帧（与下行帧格式一致）:
+#   A5 5A 0A + [5x uint16 小端序: A0, A1, A2, A3, A4] + SUM8(payload)
+FRAME_HEADER = b'\xA5\x5A'
+FRAME_PAYLOAD_LEN = 0x0A
+FRAME_SIZE = 3 + FRAME_PAYLOAD_LEN + 1
+UPLINK_STRUCT = struct.Struct('<5HB')
+MAX_PENDING = 4096  # 无法解析的残留数据上限，超过则丢弃
+
+
+def parse_text_line(line):
+    """解析 "a0,a1,a2,a3,a4" 文本行，返回A1-A4，格式错误返回None"""
+    values = line.split(b',')
+    if len(values) != 5:
+        return None
+    try:
+        return [int(val) for val in values[1:]]
+    except ValueError:
+        return None
+
+
+def encode_uplink_frame(values):
+    """把A0-A4五个原始ADC值编码为上行二进制帧"""
+    payload = struct.pack('<5H', *(max(0, min(int(v), 65535)) for v in values))
+    return FRAME_HEADER + bytes([FRAME_PAYLOAD_LEN]) + payload + bytes([sum(payload) & 0xFF])
+
+
+def encode_text_line(values):
+    """把A0-A4五个原始ADC值编码为上行文本行"""
+    return (','.join(str(int(v)) for v in values) + '\r\n').encode()
+
+
+class StreamParser:
+    """增量式上行数据解析器，自动识别二进制帧与CSV文本行
+
+    二进制帧以0xA5开头，文本行只包含ASCII字符，因此两种格式可以在同一
+    字节流中混合出现。校验失败时只跳过一个字节重新同步帧头。
+    """
+
+    def __init__(self):
+        self._pending = bytearray()
+        self.mode = None  # 最近一次成功解析的格式: 'text' / 'binary'
+        self.frames = 0
+        self.errors = 0
+
+    def feed(self, data):
+        """送入新收到的字节，返回解析出的所有样本(A1-A4)列表"""
+        buf = self._pending
+        buf += data
+        samples = []
+        n = len(buf)
+        pos = 0
+        with memoryview(buf) as mv:
+            while pos < n:
+                if buf[pos] == 0xA5:
+                    if n - pos < 3:
+                        break
+                    if buf[pos + 1] == 0x5A and buf[pos + 2] == FRAME_PAYLOAD_LEN:
+                        if n - pos < FRAME_SIZE:
+                            break
+                        a0, a1, a2, a3, a4, sum8 = UPLINK_STRUCT.unpack_from(mv, pos + 3)
+                        if sum(mv[pos + 3:pos + 3 + FRAME_PAYLOAD_LEN]) & 0xFF == sum8:
+                            samples.append([a1, a2, a3, a4])
+                            self.mode = 'binary'
+                            pos += FRAME_SIZE
+                            continue
+                    # 帧头或校验错误：跳过一个字节重新同步
+                    self.errors += 1
+                    pos += 1
+                    continue
+
+                # 文本行不会包含0xA5，下一个帧头之前的完整行可以整块切分
+                frame_start = buf.find(0xA5, pos)
+                limit = n if frame_start < 0 else frame_start
+                end = buf.rfind(b'\n', pos, limit)
+                if end >= 0:
+                    for line in mv[pos:end].tobytes().split(b'\n'):
+                        line = line.strip()
+                        if not line:
+                            continue
+                        sensor_data = parse_text_line(line)
+                        if sensor_data is None:
+                            self.errors += 1
+                            continue
+                        samples.append(sensor_data)
+                        self.mode = 'text'
+                    pos = end + 1
+                if frame_start < 0:
+                    break
+                # 帧头之前没有换行结尾的残缺文本直接丢弃
+                if mv[pos:frame_start].tobytes().strip():
+                    self.errors += 1
+                pos = frame_start
+        del buf[:pos]
+        if len(buf) > MAX_PENDING:
+            self.errors += 1
+            buf.clear()
+        self.frames += len(samples)
+        return samples
+
+
+# 下行舵机帧: A5 5A 0A + [5x uint16 小端序: A4, A3, A2, A0(与A2相同), A1] + SUM8(payload)
+DOWNLINK_STRUCT = struct.Struct('<3B5HB')
+ADC_MAX = 1023  # 10位ADC
+
+
+def transform_sensor_values(sensor_data):
+    """将原始ADC值转换为舵机控制值（根据拟合公式）"""
+    if sensor_data is None or len(sensor_data) < 4:
+        return None
+    
+    # 原始ADC值
+    a1, a2, a3, a4 = sensor_data
+    
+    # 应用拟合公式转换
+    # 通道1 (A1): y = 4.5x - 440
+    
+    transformed_a1 = int(-3.9130 * a1 +3073.913)
+    
+    # 通道2 (A2): y = 1.9565x + 373.913
+    transformed_a2 = int(-2 * a2 + 2500)
+    
+    # 通道3 (A3): y = 2.8125x + 100
+    transformed_a3 = int(-3.333 * a3 + 2866.667)
+    
+    # 通道4 (A4): y = -1.2784x + 2310.088
+    transformed_a4 = int(1.4286 * a4 + 514.286)
+    
+    # 确保值在有效范围内 (1000-1900)
+    transformed_a1 = max(1000, min(1900, transformed_a1))
+    transformed_a2 = max(1000, min(1900, transformed_a2))
+    transformed_a3 = max(1000, min(1900, transformed_a3))
+    transformed_a4 = max(1000, min(1900, transformed_a4))
+    
+    return [transformed_a1, transformed_a2, transformed_a3, transformed_a4]
+
+
+def format_sensor_data(sensor_data):
+    """格式化传感器数据为协议帧:
+       A5 5A 0A + [5x uint16 小端序] + SUM8(payload)
+       顺序: A4, A3, A2, A0(与A2相同), A1
+    """
+    if sensor_data is None or len(sensor_data) < 4:
+        return None
+
+    # 提取转换后的值
+    transformed_a1, transformed_a2, transformed_a3, transformed_a4 = sensor_data
+    
+    # 按顺序创建值列表: A4, A3, A2, A0(等于A2), A1
+    values = [
+        transformed_a4,  # A4
+        transformed_a3,  # A3
+        transformed_a2,  # A2
+        transformed_a2,  # A0 (与A2相同)
+        transformed_a1   # A1
+    ]
+
+    # 帧头
+    frame = bytearray([0xA5, 0x5A, 0x0A])
+
+    # 负载（10字节）：每个uint16"小端序"：低字节在前，高字节在后
+    payload = bytearray()
+    for v in values:
+        # 确保值在0-65535范围内
+        v = max(0, min(int(v), 65535))
+        # 小端序：先低字节，后高字节
+        payload.append(v & 0xFF)        # 低8位
+        payload.append((v >> 8) & 0xFF) # 高8位
+
+    # SUM8：对10个负载字节求和，取低8位
+    sum8 = sum(payload) & 0xFF
+
+    # 组帧：帧头 + 负载 + 校验
+    frame += payload
+    frame.append(sum8)
+
+    return bytes(frame)
+
+
+def build_servo_luts(adc_max=ADC_MAX):
+    """预先计算每个通道 原始ADC值 -> 限幅后舵机值 的查找表，形状(4, adc_max + 1)
+
+    直接调用transform_sensor_values生成，保证与逐样本公式结果完全一致。
+    各通道公式单调，超出[0, adc_max]的输入截断到端点后结果不变。
+    """
+    luts = np.empty((4, adc_max + 1), dtype=np.uint16)
+    for adc in range(adc_max + 1):
+        luts[:, adc] = transform_sensor_values([adc, adc, adc, adc])
+    return luts
+
+
+class DownlinkEncoder:
+    """查表转换 + struct.pack_into编码的下行帧编码器"""
+
+    def __init__(self, luts=None):
+        self.luts = build_servo_luts() if luts is None else luts
+        self.adc_max = self.luts.shape[1] - 1
+        self._tables = [lut.tolist() for lut in self.luts]
+        self._buf = bytearray(FRAME_SIZE)
+
+    def transform(self, sensor_data):
+        """原始A1-A4 -> 舵机值A1-A4，与transform_sensor_values结果相同"""
+        adc_max = self.adc_max
+        return [table[min(max(int(v), 0), adc_max)]
+                for table, v in zip(self._tables, sensor_data)]
+
+    def encode_into(self, buf, offset, sensor_data):
+        """把一个原始样本编码为下行帧，写入buf[offset:offset + FRAME_SIZE]"""
+        t1, t2, t3, t4 = self.transform(sensor_data)
+        sum8 = ((t4 & 0xFF) + (t4 >> 8) + (t3 & 0xFF) + (t3 >> 8)
+                + 2 * ((t2 & 0xFF) + (t2 >> 8)) + (t1 & 0xFF) + (t1 >> 8)) & 0xFF
+        DOWNLINK_STRUCT.pack_into(buf, offset, 0xA5, 0x5A, FRAME_PAYLOAD_LEN,
+                                  t4, t3, t2, t2, t1, sum8)
+
+    def encode(self, sensor_data):
+        """编码一个原始样本，返回内部复用的缓冲区（下次调用前有效）"""
+        if sensor_data is None or len(sensor_data) < 4:
+            return None
+        self.encode_into(self._buf, 0, sensor_data)
+        return self._buf
+
+    def encode_batch(self, samples):
+        """把(N, 4)原始样本一次编码为N帧连续的bytes，供单次ser.write发送"""
+        samples = np.asarray(samples).reshape(-1, 4)
+        idx = np.clip(samples, 0, self.adc_max)
+        servo = self.luts[np.arange(4), idx]  # (N, 4): A1-A4
+        payload = np.ascontiguousarray(servo[:, [3, 2, 1, 1, 0]], dtype='<u2')
+        frames = np.empty((len(samples), FRAME_SIZE), dtype=np.uint8)
+        frames[:, 0] = 0xA5
+        frames[:, 1] = 0x5A
+        frames[:, 2] = FRAME_PAYLOAD_LEN
+        frames[:, 3:13] = payload.view(np.uint8)
+        frames[:, 13] = frames[:, 3:13].sum(axis=1, dtype=np.uint32) & 0xFF
+        return frames.tobytes()
+
+
+def verify_downlink_encoder(encoder=None, low=-64, high=ADC_MAX + 64):
+    """逐字节比较查表编码器与原公式实现，覆盖全部ADC取值及越界值"""
+    encoder = encoder or DownlinkEncoder()
+    rng = np.random.default_rng(0)
+    samples = rng.integers(low, high + 1, size=(5000, 4))
+    samples[:high - low + 1] = np.arange(low, high + 1)[:, None]
+    expected = [format_sensor_data(transform_sensor_values(s.tolist())) for s in samples]
+    single = all(bytes(encoder.encode(s.tolist())) == e for s, e in zip(samples, expected))
+    return single and encoder.encode_batch(samples) == b''.join(expected)
+
+
+class _LegacyTextParser:
+    """原read_serial_data的逐行decode/strip/split解析方式，作为基准"""
+
+    def __init__(self):
+        self._pending = b''
+        self.errors = 0
+
+    def feed(self, data):
+        lines = (self._pending + data).split(b'\n')
+        self._pending = lines.pop()
+        samples = []
+        for raw in lines:
+            line = raw.decode().strip()
+            if line:
+                values = line.split(',')
+                if len(values) == 5:
+                    samples.append([int(val) for val in values[1:]])
+        return samples
+
+
+def benchmark(count=20000, chunk_size=1024):
+    """通过pyserial的loop://回环比较文本行与二进制帧的解析速度
+
+    loop://的内部队列只有4096字节，因此按块交替写入和读取，
+    只统计解析器本身的耗时。
+    """
+    import serial
+
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 1024, size=(count, 5))
+    text_stream = b''.join(encode_text_line(v) for v in values)
+    binary_stream = b''.join(encode_uplink_frame(v) for v in values)
+    cases = {
+        'legacy': (text_stream, _LegacyTextParser),
+        'text': (text_stream, StreamParser),
+        'binary': (binary_stream, StreamParser),
+    }
+
+    results = {}
+    for name, (stream, parser_cls) in cases.items():
+        port = serial.serial_for_url('loop://', timeout=0)
+        parser = parser_cls()
+        parsed = 0
+        elapsed = 0.0
+        for offset in range(0, len(stream), chunk_size):
+            port.write(stream[offset:offset + chunk_size])
+            chunk = port.read(port.in_waiting)
+            start = time.perf_counter()
+            parsed += len(parser.feed(chunk))
+            elapsed += time.perf_counter() - start
+        port.close()
+        # 9600波特率下每字节10位
+        results[name] = {
+            'samples': parsed,
+            'errors': parser.errors,
+            'bytes_per_sample': len(stream) / count,
+            'samples_per_s': parsed / elapsed,
+            'max_rate_9600': 9600 / 10 / (len(stream) / count),
+        }
+    return results
+
+
+def benchmark_downlink(count=20000):
+    """比较原公式+逐字节组帧与查表+struct编码(单帧/批量)的速度"""
+    encoder = DownlinkEncoder()
+    samples = np.random.default_rng(0).integers(0, ADC_MAX + 1, size=(count, 4))
+    sample_lists = samples.tolist()
+
+    def legacy():
+        for s in sample_lists:
+            format_sensor_data(transform_sensor_values(s))
+
+    def lut_single():
+        for s in sample_lists:
+            encoder.encode(s)
+
+    def lut_batch():
+        encoder.encode_batch(samples)
+
+    results = {}
+    for name, fn in (('legacy', legacy), ('lut', lut_single), ('lut_batch', lut_batch)):
+        start = time.perf_counter()
+        fn()
+        results[name] = count / (time.perf_counter() - start)
+    return results
+
+
+if __name__ == "__main__":
+    for name, r in benchmark().items():
+        print(f"{name:>6}: {r['samples']} 样本, {r['errors']} 错误, "
+              f"{r['bytes_per_sample']:.1f} 字节/样本, "
+              f"解析 {r['samples_per_s']:.0f} 样本/秒, "
+              f"9600bps上限 {r['max_rate_9600']:.0f} Hz")
+    
+    print(f"下行编码与原实现逐字节一致: {verify_downlink_encoder()}")
+    for name, rate in benchmark_downlink().items():
+        print(f"{name:>9}: {rate:.0f} 帧/秒")
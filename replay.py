@@ -0,0 +1,230 @@
+import argparse
+import os
+import struct
+import threading
+import time
+import numpy as np
+import serial
+from network import data
+from protocol import encode_text_line, encode_uplink_frame
+
+# 录制文件格式：文件头 + 若干记录
+#   文件头: b'GLVREC1\0'
+#   记录:   uint64 相对起始时间(ns) + uint32 数据长度 + 原始串口字节（小端序）
+RECORD_MAGIC = b'GLVREC1\0'
+RECORD_HEADER = struct.Struct('<QI')
+
+
+class Recorder:
+    """把带时间戳的原始串口数据写入紧凑的二进制录制文件"""
+
+    def __init__(self, path):
+        self._file = open(path, 'wb')
+        self._file.write(RECORD_MAGIC)
+        self._start_ns = None
+        self.records = 0
+        self.bytes = 0
+
+    def write(self, chunk, t_ns=None):
+        if t_ns is None:
+            t_ns = time.perf_counter_ns()
+        if self._start_ns is None:
+            self._start_ns = t_ns
+        self._file.write(RECORD_HEADER.pack(t_ns - self._start_ns, len(chunk)))
+        self._file.write(chunk)
+        self.records += 1
+        self.bytes += len(chunk)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_recording(path):
+    """读取录制文件，返回 [(相对时间ns, 字节), ...]"""
+    with open(path, 'rb') as f:
+        blob = f.read()
+    if not blob.startswith(RECORD_MAGIC):
+        raise ValueError(f"不是录制文件: {path}")
+    records = []
+    pos = len(RECORD_MAGIC)
+    with memoryview(blob) as mv:
+        while pos + RECORD_HEADER.size <= len(blob):
+            t_ns, length = RECORD_HEADER.unpack_from(mv, pos)
+            pos += RECORD_HEADER.size
+            records.append((t_ns, mv[pos:pos + length].tobytes()))
+            pos += length
+    return records
+
+
+def write_recording(path, records):
+    with Recorder(path) as rec:
+        for t_ns, chunk in records:
+            rec.write(chunk, t_ns)
+
+
+def record_serial(port, baud_rate, path, duration=None):
+    """从真实串口录制原始数据，duration为None时录制到Ctrl+C"""
+    ser = serial.serial_for_url(port, baud_rate, timeout=0.1)
+    deadline = None if duration is None else time.monotonic() + duration
+    with Recorder(path) as rec:
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                chunk = ser.read(ser.in_waiting or 1)
+                if chunk:
+                    rec.write(chunk)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            ser.close()
+    return rec.records, rec.bytes
+
+
+def gesture_samples():
+    """按手势编号分组的A1-A4样本（来自network.data），返回 {编号: (n, 4)数组}"""
+    ids = np.array(data['编号'])
+    features = np.array([data['A1'], data['A2'], data['A3'], data['A4']]).T
+    return {int(g): features[ids == g] for g in np.unique(ids)}
+
+
+def synthesize(seconds=10.0, rate=50.0, hold=1.0, noise=3.0, fmt='text', seed=0, transition=0.0):
+    """按network.data中每个手势的样本生成模拟会话
+
+    每隔hold秒随机切换一个手势，每个样本在该手势的某个真实样本上叠加
+    高斯噪声；A0通道填0。transition>0时每段开始的transition秒内从上一个姿态
+    平滑运动到新手势的姿态（标签已是新手势），模拟做手势时的手指动作。
+    返回 ([(相对时间ns, 字节)], 每个样本的手势编号)。
+    """
+    rng = np.random.default_rng(seed)
+    groups = gesture_samples()
+    gesture_ids = list(groups)
+    encode = encode_uplink_frame if fmt == 'binary' else encode_text_line
+    n = int(seconds * rate)
+    per_gesture = max(1, int(hold * rate))
+    records = []
+    labels = []
+    transition_n = min(int(transition * rate), per_gesture)
+    gesture = rng.choice(gesture_ids)
+    base = previous = None
+    for i in range(n):
+        k = i % per_gesture
+        if k == 0:
+            gesture = rng.choice(gesture_ids)
+            previous = base
+        base = groups[gesture][rng.integers(len(groups[gesture]))]
+        pose = base
+        if previous is not None and k < transition_n:
+            # smoothstep插值：起止速度为0，中段最快
+            t = (k + 1) / (transition_n + 1)
+            pose = previous + (base - previous) * (t * t * (3 - 2 * t))
+        sample = np.clip(np.round(pose + rng.normal(0, noise, 4)), 0, 1023).astype(int)
+        records.append((int(i * 1e9 / rate), encode([0, *sample])))
+        labels.append(int(gesture))
+    return records, labels
+
+
+def replay(records, port, speed=1.0, stop_event=None):
+    """按录制时间把数据写入port；speed为倍速，0表示不等待、尽快发送"""
+    start = time.perf_counter_ns()
+    for t_ns, chunk in records:
+        if stop_event is not None and stop_event.is_set():
+            break
+        if speed > 0:
+            delay = (start + t_ns / speed - time.perf_counter_ns()) / 1e9
+            if delay > 0:
+                time.sleep(delay)
+        port.write(chunk)
+    return len(records)
+
+
+class PtyDevice:
+    """伪终端模拟的串口设备：向master写入的数据可从slave路径像真实串口一样读取"""
+
+    def __init__(self):
+        import tty
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self.path = os.ttyname(self.slave)
+
+    def write(self, chunk):
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(self.master, view):]
+
+    def read(self, size=4096):
+        return os.read(self.master, size)
+
+    def close(self):
+        os.close(self.master)
+        os.close(self.slave)
+
+
+def replay_in_background(records, port, speed=1.0):
+    """在后台线程回放，返回 (线程, 停止事件)"""
+    stop_event = threading.Event()
+    thread = threading.Thread(target=replay, args=(records, port, speed, stop_event), daemon=True)
+    thread.start()
+    return thread, stop_event
+
+
+def main():
+    parser = argparse.ArgumentParser(description="串口数据录制、合成与回放")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('record', help="从串口录制原始数据")
+    p.add_argument('output')
+    p.add_argument('--port', default='/dev/ttyS1')
+    p.add_argument('--baud', type=int, default=9600)
+    p.add_argument('--duration', type=float, help="录制时长(秒)，默认直到Ctrl+C")
+
+    p = sub.add_parser('synth', help="由network.data生成模拟会话")
+    p.add_argument('output')
+    p.add_argument('--seconds', type=float, default=60)
+    p.add_argument('--rate', type=float, default=50, help="样本率(Hz)")
+    p.add_argument('--hold', type=float, default=1.0, help="每个手势保持的秒数")
+    p.add_argument('--noise', type=float, default=3.0, help="高斯噪声标准差(ADC)")
+    p.add_argument('--transition', type=float, default=0.0, help="每段开始时从上一姿态过渡的秒数")
+    p.add_argument('--format', choices=('text', 'binary'), default='text')
+    p.add_argument('--seed', type=int, default=0)
+
+    p = sub.add_parser('play', help="回放录制文件")
+    p.add_argument('input')
+    p.add_argument('--port', help="写入的串口或pyserial URL；默认创建伪终端")
+    p.add_argument('--baud', type=int, default=9600)
+    p.add_argument('--speed', type=float, default=1.0, help="回放倍速，0表示尽快发送")
+    p.add_argument('--loop', action='store_true', help="循环回放")
+
+    args = parser.parse_args()
+    if args.command == 'record':
+        records, nbytes = record_serial(args.port, args.baud, args.output, args.duration)
+        print(f"已录制 {records} 条记录, {nbytes} 字节 -> {args.output}")
+    elif args.command == 'synth':
+        records, _ = synthesize(args.seconds, args.rate, args.hold, args.noise, args.format, args.seed,
+                                args.transition)
+        write_recording(args.output, records)
+        print(f"已生成 {len(records)} 个样本 -> {args.output}")
+    elif args.command == 'play':
+        records = read_recording(args.input)
+        if args.port:
+            port = serial.serial_for_url(args.port, args.baud)
+        else:
+            port = PtyDevice()
+            print(f"模拟串口: {port.path}（把main.py的SERIAL_PORT指向该路径）")
+        try:
+            while True:
+                replay(records, port, args.speed)
+                if not args.loop:
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            port.close()
+
+
+if __name__ == "__main__":
+    main()
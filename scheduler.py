@@ -0,0 +1,69 @@
+import threading
+import time
+
+
+class PeriodicSender(threading.Thread):
+    """基于单调时钟截止时间的周期任务线程
+
+    第k次执行的截止时间固定为 start + k * period，执行耗时不会累积成漂移。
+    若某次执行超时错过了后续截止时间，则跳过这些周期并计入missed。
+    """
+
+    def __init__(self, period, task, name="PeriodicSender"):
+        super().__init__(name=name, daemon=True)
+        if period <= 0:
+            raise ValueError("period必须大于0")
+        self.period = period
+        self.task = task
+        self._stop_event = threading.Event()
+        self.ticks = 0
+        self.missed = 0
+        self.max_jitter = 0.0
+        self._jitter_sum = 0.0
+
+    def set_rate(self, hz):
+        """修改发送频率(Hz)，从下一个周期开始生效"""
+        if hz <= 0:
+            raise ValueError("hz必须大于0")
+        self.period = 1.0 / hz
+
+    def stop(self, timeout=2.0):
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+
+    def stats(self):
+        """返回执行次数、错过的周期数以及唤醒抖动(秒)"""
+        return {
+            'ticks': self.ticks,
+            'missed': self.missed,
+            'mean_jitter': self._jitter_sum / self.ticks if self.ticks else 0.0,
+            'max_jitter': self.max_jitter,
+        }
+
+    def run(self):
+        deadline = time.monotonic() + self.period
+        while not self._stop_event.is_set():
+            delay = deadline - time.monotonic()
+            if delay > 0 and self._stop_event.wait(delay):
+                break
+
+            now = time.monotonic()
+            jitter = now - deadline
+            self.ticks += 1
+            self._jitter_sum += jitter
+            if jitter > self.max_jitter:
+                self.max_jitter = jitter
+
+            try:
+                self.task()
+            except Exception as e:
+                print(f"周期任务执行失败: {str(e)}")
+
+            deadline += self.period
+            now = time.monotonic()
+            if now > deadline:
+                # 已错过的周期直接跳过，避免连续补发
+                skipped = int((now - deadline) // self.period) + 1
+                self.missed += skipped
+                deadline += skipped * self.period
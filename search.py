@@ -0,0 +1,287 @@
+import argparse
+import json
+import math
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from network import save_artifact, compile_model, CentroidPredictor
+
+SEARCH_FILE = 'search_results.json'
+TRIALS = 12  # 每个模型族的评估次数（无参数的模型族只评估一次）
+INITIAL_TRIALS = 4  # 每个模型族先随机采样的次数，之后由高斯过程代理模型提议
+CANDIDATES = 2000  # 每次提议时评估采集函数的随机候选点数
+CV_FOLDS = 5
+ACCURACY_TOLERANCE = 0.01  # 准确率与最优相差不超过该值时，选择更快的模型
+LATENCY_REPEAT = 1000
+
+# 搜索空间：(参数名, 下界, 上界, 类型)，'log'/'logint'在对数尺度上均匀采样
+SPACES = {
+    'mlp': [
+        ('layers', 1, 3, 'int'),
+        ('width', 8, 128, 'logint'),
+        ('alpha', 1e-5, 1e-1, 'log'),
+    ],
+    'forest': [
+        ('n_estimators', 5, 100, 'logint'),
+        ('max_depth', 2, 12, 'int'),
+        ('max_features', 1, 4, 'int'),
+    ],
+    'boosting': [
+        ('n_estimators', 5, 100, 'logint'),
+        ('max_depth', 1, 4, 'int'),
+        ('learning_rate', 0.03, 0.5, 'log'),
+    ],
+    'centroid': [],
+}
+
+
+def build_model(family, params, seed=0):
+    """按模型族和参数构造未训练的模型"""
+    if family == 'mlp':
+        from sklearn.neural_network import MLPClassifier
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.pipeline import make_pipeline
+        # 逐层宽度减半，与原来的 (64, 32) 结构一致
+        sizes = tuple(max(4, params['width'] >> i) for i in range(params['layers']))
+        return make_pipeline(StandardScaler(), MLPClassifier(
+            hidden_layer_sizes=sizes, alpha=params['alpha'], max_iter=1000, random_state=seed))
+    if family == 'forest':
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(n_estimators=params['n_estimators'], max_depth=params['max_depth'],
+                                      max_features=params['max_features'], random_state=seed)
+    if family == 'boosting':
+        from sklearn.ensemble import GradientBoostingClassifier
+        return GradientBoostingClassifier(n_estimators=params['n_estimators'], max_depth=params['max_depth'],
+                                          learning_rate=params['learning_rate'], random_state=seed)
+    if family == 'centroid':
+        return None
+    raise ValueError(f"未知模型族: {family}")
+
+
+def train_family(family, params, X, y, seed=0):
+    """训练并返回模型（sklearn模型，centroid为CentroidPredictor）"""
+    if family == 'centroid':
+        return CentroidPredictor(X, y)
+    model = build_model(family, params, seed)
+    with warnings.catch_warnings():
+        # 小数据集上MLP常提前收敛或达到max_iter，不影响评估
+        warnings.simplefilter('ignore')
+        model.fit(X, y)
+    return model
+
+
+def fit_model(family, params, X, y, seed=0):
+    """训练并返回NumPy推理对象"""
+    return compile_model(train_family(family, params, X, y, seed))
+
+
+def decode(space, u):
+    """把单位超立方体中的点映射为参数字典"""
+    params = {}
+    for (name, low, high, kind), v in zip(space, u):
+        if kind in ('log', 'logint'):
+            value = math.exp(math.log(low) + v * (math.log(high) - math.log(low)))
+        else:
+            value = low + v * (high - low)
+        if kind in ('int', 'logint'):
+            value = int(min(high, max(low, round(value))))
+        params[name] = value
+    return params
+
+
+def cv_splits(y, folds=CV_FOLDS, seed=0):
+    """分层K折划分，返回 [(训练索引, 验证索引)]；折数不超过最少类别的样本数"""
+    from sklearn.model_selection import StratifiedKFold
+    folds = max(2, min(folds, np.bincount(np.unique(y, return_inverse=True)[1]).min()))
+    return list(StratifiedKFold(folds, shuffle=True, random_state=seed).split(np.zeros(len(y)), y))
+
+
+def evaluate(family, params, X, y, splits, seed=0):
+    """交叉验证准确率，并返回在全部数据上训练的推理对象（在工作进程中执行）"""
+    correct = 0
+    for train, test in splits:
+        predictor = fit_model(family, params, X[train], y[train], seed)
+        correct += int(np.sum(predictor.predict(X[test]) == y[test]))
+    return correct / sum(len(test) for _, test in splits), fit_model(family, params, X, y, seed)
+
+
+def per_sample_us(predictor, X, repeat=LATENCY_REPEAT):
+    """单样本推理耗时(微秒)，取3轮中最快的一轮；在主进程中依次测量，避免并行评估互相干扰"""
+    samples = [X[i % len(X)][None, :] for i in range(repeat)]
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for sample in samples:
+            predictor.predict(sample)
+        best = min(best, time.perf_counter() - start)
+    return best / repeat * 1e6
+
+
+def _rbf(A, B, length_scale):
+    d2 = ((A[:, None, :] - B[None, :, :]) ** 2).sum(axis=2)
+    return np.exp(-0.5 * d2 / length_scale ** 2)
+
+
+def _gp_posterior(U, s, candidates, noise=1e-3):
+    """零均值高斯过程（RBF核，长度尺度按边际似然在网格上选择），返回候选点的 (均值, 标准差)"""
+    mu0, sd0 = s.mean(), s.std() or 1.0
+    z = (s - mu0) / sd0
+    best = None
+    for length_scale in (0.1, 0.2, 0.4, 0.8):
+        K = _rbf(U, U, length_scale) + noise * np.eye(len(U))
+        L = np.linalg.cholesky(K)
+        alpha = np.linalg.solve(L.T, np.linalg.solve(L, z))
+        log_likelihood = -0.5 * z @ alpha - np.log(np.diag(L)).sum()
+        if best is None or log_likelihood > best[0]:
+            best = (log_likelihood, length_scale, L, alpha)
+    _, length_scale, L, alpha = best
+    Ks = _rbf(candidates, U, length_scale)
+    mean = Ks @ alpha
+    v = np.linalg.solve(L, Ks.T)
+    std = np.sqrt(np.maximum(1.0 - (v * v).sum(axis=0), 1e-12))
+    return mean * sd0 + mu0, std * sd0
+
+
+def expected_improvement(mean, std, best):
+    """最小化问题的期望改进"""
+    from scipy.stats import norm
+    z = (best - mean) / std
+    return (best - mean) * norm.cdf(z) + std * norm.pdf(z)
+
+
+def scalarize(accuracy, latency_us, weight):
+    """ParEGO：把 (1-准确率, log延迟) 归一化后按随机权重做增广切比雪夫标量化（越小越好）"""
+    error = 1.0 - np.asarray(accuracy)
+    log_latency = np.log(np.asarray(latency_us))
+
+    def normalize(v):
+        span = v.max() - v.min()
+        return (v - v.min()) / span if span > 0 else np.zeros_like(v)
+
+    terms = np.stack([weight * normalize(error), (1 - weight) * normalize(log_latency)])
+    return terms.max(axis=0) + 0.05 * terms.sum(axis=0)
+
+
+def propose(space, trials, all_trials, rng):
+    """为一个模型族提议下一个参数点（单位超立方体坐标）"""
+    if len(trials) < INITIAL_TRIALS:
+        return rng.random(len(space))
+    # 标量化使用全部模型族的结果做归一化，使各族的目标可比
+    weight = rng.random()
+    scores = scalarize([t['accuracy'] for t in all_trials], [t['latency_us'] for t in all_trials], weight)
+    index = {id(t): i for i, t in enumerate(all_trials)}
+    U = np.array([t['u'] for t in trials])
+    s = scores[[index[id(t)] for t in trials]]
+    candidates = rng.random((CANDIDATES, len(space)))
+    mean, std = _gp_posterior(U, s, candidates)
+    return candidates[expected_improvement(mean, std, s.min()).argmax()]
+
+
+def pareto_front(trials):
+    """准确率更高且延迟更低的意义下不被支配的试验，按延迟升序"""
+    front = []
+    for t in sorted(trials, key=lambda t: (t['latency_us'], -t['accuracy'])):
+        if not front or t['accuracy'] > front[-1]['accuracy']:
+            front.append(t)
+    return front
+
+
+def choose(front, tolerance=ACCURACY_TOLERANCE, max_latency_us=None):
+    """在Pareto前沿上选择：满足延迟上限的前提下，准确率与最优相差不超过tolerance的最快模型"""
+    allowed = [t for t in front if max_latency_us is None or t['latency_us'] <= max_latency_us] or front[:1]
+    best = max(t['accuracy'] for t in allowed)
+    return min((t for t in allowed if t['accuracy'] >= best - tolerance), key=lambda t: t['latency_us'])
+
+
+def run_search(X, y, families=tuple(SPACES), trials=TRIALS, workers=None, seed=0, verbose=True):
+    """在进程池中并行做多模型族的贝叶斯优化，返回 (全部试验, 各试验的推理对象)
+
+    每一轮为每个仍有预算的模型族提议一个点（有多余核时按核数提议多个），
+    一起提交到进程池做交叉验证；延迟在主进程中依次测量。
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    workers = workers or os.cpu_count() or 1
+    rng = np.random.default_rng(seed)
+    splits = cv_splits(y, seed=seed)
+    budget = {f: (trials if SPACES[f] else 1) for f in families}
+    history = {f: [] for f in families}
+    all_trials, predictors = [], []
+    with ProcessPoolExecutor(workers) as pool:
+        while any(budget.values()):
+            per_family = max(1, workers // sum(1 for f in families if budget[f]))
+            batch = []
+            for family in families:
+                for _ in range(min(per_family, budget[family])):
+                    u = propose(SPACES[family], history[family], all_trials, rng) if SPACES[family] else []
+                    params = decode(SPACES[family], u)
+                    batch.append((family, list(u), params,
+                                  pool.submit(evaluate, family, params, X, y, splits, seed)))
+                    budget[family] -= 1
+            # 整批评估完成后再测延迟，测量时进程池空闲
+            results = [future.result() for *_, future in batch]
+            for (family, u, params, _), (accuracy, predictor) in zip(batch, results):
+                trial = {
+                    'family': family,
+                    'params': params,
+                    'u': u,
+                    'accuracy': accuracy,
+                    'latency_us': per_sample_us(predictor, X),
+                }
+                history[family].append(trial)
+                all_trials.append(trial)
+                predictors.append(predictor)
+                if verbose:
+                    print(f"{family:<9} 准确率 {accuracy:.3f}  {trial['latency_us']:7.1f}us  {params}")
+    return all_trials, predictors
+
+
+def main():
+    from online import SampleStore, training_data, MODEL_FILE
+
+    parser = argparse.ArgumentParser(description="多模型族贝叶斯优化搜索：准确率-推理延迟Pareto前沿")
+    parser.add_argument('--families', default=','.join(SPACES), help="参与搜索的模型族，逗号分隔")
+    parser.add_argument('--trials', type=int, default=TRIALS, help="每个模型族的评估次数")
+    parser.add_argument('--workers', type=int, default=None, help="进程数，默认为CPU核数")
+    parser.add_argument('--max-latency-us', type=float, help="选择模型时的单样本延迟上限")
+    parser.add_argument('--tolerance', type=float, default=ACCURACY_TOLERANCE)
+    parser.add_argument('--samples', default='samples.bin', help="同时使用该样本文件中的标定数据")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default=MODEL_FILE, help="选中模型的保存路径（main.py加载该文件）")
+    parser.add_argument('--report', default=SEARCH_FILE, help="全部试验和Pareto前沿的JSON报告")
+    args = parser.parse_args()
+
+    families = tuple(f.strip() for f in args.families.split(',') if f.strip())
+    for family in families:
+        if family not in SPACES:
+            parser.error(f"未知模型族: {family}")
+    # 与online.load_initial_model使用相同的训练数据，保存的数据哈希一致，启动时不会触发重训
+    X, y = training_data(SampleStore(args.samples))
+    start = time.perf_counter()
+    trials, predictors = run_search(X, y, families, args.trials, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+
+    front = pareto_front(trials)
+    chosen = choose(front, args.tolerance, args.max_latency_us)
+    print(f"\n{len(trials)} 次评估, 用时 {elapsed:.1f}s; Pareto前沿:")
+    for t in front:
+        mark = '*' if t is chosen else ' '
+        print(f" {mark} {t['family']:<9} 准确率 {t['accuracy']:.3f}  {t['latency_us']:7.1f}us  {t['params']}")
+
+    from network import get_features_and_labels, load_sign_mapping
+    try:
+        sign_mapping = load_sign_mapping('sign_mapping.json')
+    except Exception:
+        sign_mapping = get_features_and_labels()[2]
+    search_meta = {key: chosen[key] for key in ('family', 'params', 'accuracy', 'latency_us')}
+    save_artifact(predictors[trials.index(chosen)], sign_mapping, args.output, X, y,
+                  meta={'search': search_meta})
+    print(f"已保存 {chosen['family']} 模型: {args.output}")
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump({'trials': trials, 'front': front, 'chosen': search_meta}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import threading
+import time
+import numpy as np
+import serial
+from protocol import StreamParser
+from latency import tracker
+
+CONNECT_TIMEOUT = 5.0  # wait_connected默认等待串口打开的最长时间(秒)
+
+
+class SensorRingBuffer:
+    """预分配的传感器环形缓冲区（单写者/多读者，无锁）
+
+    时间戳为time.perf_counter()秒，即串口数据到达(read返回)的时刻。
+    写者（串口读取线程）先写入数据和时间戳，再递增计数器发布；
+    读者读取计数器后复制数据，复制完成后再检查计数器，若写者已覆盖
+    被读取的槽位则重试（seqlock）。
+    """
+
+    def __init__(self, capacity=1024, channels=4):
+        self.capacity = capacity
+        self.channels = channels
+        self._data = np.zeros((capacity, channels), dtype=np.int32)
+        self._stamps = np.zeros(capacity, dtype=np.float64)
+        self._count = 0  # 已写入的样本总数（只增不减）
+
+    @property
+    def count(self):
+        return self._count
+
+    def push(self, values, stamp=None):
+        """写入一个样本（仅由读取线程调用）"""
+        idx = self._count % self.capacity
+        self._data[idx] = values
+        self._stamps[idx] = time.perf_counter() if stamp is None else stamp
+        self._count += 1
+
+    def latest(self, max_age=None):
+        """返回 (样本, 时间戳, 序号)，无数据或数据过期时返回None"""
+        while True:
+            count = self._count
+            if count == 0:
+                return None
+            idx = (count - 1) % self.capacity
+            values = self._data[idx].copy()
+            stamp = self._stamps[idx]
+            if self._count - count < self.capacity - 1:
+                break
+        if max_age is not None and time.perf_counter() - stamp > max_age:
+            return None
+        return values, stamp, count
+
+    def window(self, n):
+        """返回最近n个样本 (数据[n, channels], 时间戳[n])，按时间先后排列"""
+        n = min(n, self.capacity - 1)
+        while True:
+            count = self._count
+            n_avail = min(n, count)
+            idx = np.arange(count - n_avail, count) % self.capacity
+            values = self._data[idx]
+            stamps = self._stamps[idx]
+            if self._count - count < self.capacity - n_avail:
+                return values, stamps
+
+    def since(self, seq):
+        """返回序号seq之后写入的样本 (数据, 时间戳, 当前序号)，最多capacity-1个"""
+        while True:
+            count = self._count
+            n_avail = min(count - seq, self.capacity - 1)
+            idx = np.arange(count - n_avail, count) % self.capacity
+            values = self._data[idx]
+            stamps = self._stamps[idx]
+            if self._count - count < self.capacity - n_avail:
+                return values, stamps, count
+
+
+class SerialReader(threading.Thread):
+    """后台串口采集线程：独占串口，把每一帧解析后写入环形缓冲区"""
+
+    def __init__(self, port, baud_rate, buffer=None, open_serial=None, reconnect_delay=1.0):
+        super().__init__(name="SerialReader", daemon=True)
+        self.port = port
+        self.baud_rate = baud_rate
+        self.buffer = buffer if buffer is not None else SensorRingBuffer()
+        self.reconnect_delay = reconnect_delay
+        self._open_serial = open_serial or self._default_open
+        self._stop_event = threading.Event()
+        self.ser = None
+        self.last_error = None  # 最近一次打开或读取串口失败的异常
+        self.parser = StreamParser()
+
+    def _default_open(self):
+        return serial.serial_for_url(self.port, self.baud_rate, timeout=0.1)
+
+    def latest(self, max_age=None):
+        return self.buffer.latest(max_age)
+
+    def window(self, n):
+        return self.buffer.window(n)
+
+    def since(self, seq):
+        return self.buffer.since(seq)
+
+    @property
+    def frames(self):
+        return self.parser.frames
+
+    @property
+    def errors(self):
+        return self.parser.errors
+
+    def wait_connected(self, timeout=CONNECT_TIMEOUT):
+        """等待串口打开，超时抛出TimeoutError（附带最近一次连接错误）"""
+        deadline = time.monotonic() + timeout
+        while self.ser is None:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"{timeout:g}秒内未能打开串口 {self.port}: {self.last_error}")
+            time.sleep(0.01)
+
+    def stop(self, timeout=2.0):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def _connect(self):
+        try:
+            self.ser = self._open_serial()
+            print(f"串口已连接: {self.port} @ {self.baud_rate} bps")
+            return True
+        except Exception as e:
+            print(f"串口连接失败: {str(e)}")
+            self.last_error = e
+            self.ser = None
+            return False
+
+    def _close(self):
+        if self.ser is not None:
+            try:
+                self.ser.close()
+            except Exception:
+                pass
+            self.ser = None
+
+    def run(self):
+        while not self._stop_event.is_set():
+            if self.ser is None and not self._connect():
+                self._stop_event.wait(self.reconnect_delay)
+                continue
+            try:
+                # 有数据时一次读完，没有数据时阻塞到超时，不占用GUI线程
+                chunk = self.ser.read(self.ser.in_waiting or 1)
+            except Exception as e:
+                print(f"读取串口数据错误: {str(e)}")
+                self.last_error = e
+                self._close()
+                continue
+            if not chunk:
+                continue
+            arrival_ns = time.perf_counter_ns()
+            stamp = arrival_ns * 1e-9
+            # 文本行与二进制帧均由解析器自动识别
+            samples = self.parser.feed(chunk)
+            tracker.record_since('parse', arrival_ns)
+            for sensor_data in samples:
+                self.buffer.push(sensor_data, stamp)
+        self._close()
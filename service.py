@@ -0,0 +1,407 @@
+import argparse
+import asyncio
+import json
+import queue
+import signal
+import sys
+import threading
+import time
+import numpy as np
+import serial
+from online import start_online_learning, build_recognizer
+from network import UNKNOWN, REJECT_THRESHOLD, CACHE_BUCKET
+from protocol import StreamParser, DownlinkEncoder
+from filters import make_stabilizer
+from latency import tracker
+
+SERIAL_PORT = '/dev/ttyS1'
+BAUD_RATE = 9600
+READ_TIMEOUT = 0.1
+RECOGNIZE_INTERVAL = 0.1  # ReaderDriver的识别周期(秒)
+STALE_TIMEOUT = 0.5  # 超过该时间(秒)未更新的样本视为过期，不再分类
+
+
+def stdout_subscriber(event):
+    """把识别事件以JSON行输出到标准输出"""
+    sys.stdout.write(json.dumps(event, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+class QueueSubscriber:
+    """把识别事件放入线程安全队列，供Tk界面等其他线程消费；
+    notify在每次放入事件后调用（例如SignLanguageDisplay.wakeup，只置位唤醒标志），
+    消费者据此决定何时读取队列"""
+
+    def __init__(self, maxsize=256, notify=None):
+        self.queue = queue.Queue(maxsize)
+        self.notify = notify
+
+    def __call__(self, event):
+        try:
+            # 每个订阅者各自记录入队时间，界面据此统计排队等待(ui_wait)
+            self.queue.put_nowait(dict(event, queued_ns=time.perf_counter_ns()))
+        except queue.Full:
+            pass
+        if self.notify is not None:
+            self.notify()
+
+
+class SocketPublisher:
+    """通过本地TCP或Unix套接字向所有已连接客户端广播JSON行"""
+
+    def __init__(self):
+        self._writers = set()
+        self._servers = []
+
+    async def start_tcp(self, host, port):
+        self._servers.append(await asyncio.start_server(self._on_client, host, port))
+
+    async def start_unix(self, path):
+        self._servers.append(await asyncio.start_unix_server(self._on_client, path))
+
+    async def _on_client(self, reader, writer):
+        self._writers.add(writer)
+        try:
+            # 客户端只接收事件，读到EOF表示断开
+            await reader.read()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def __call__(self, event):
+        line = (json.dumps(event, ensure_ascii=False) + "\n").encode()
+        for writer in list(self._writers):
+            if writer.is_closing():
+                self._writers.discard(writer)
+                continue
+            # 客户端读得太慢时直接断开，不阻塞识别流程
+            if writer.transport.get_write_buffer_size() > 65536:
+                writer.close()
+                self._writers.discard(writer)
+                continue
+            writer.write(line)
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        for writer in list(self._writers):
+            writer.close()
+
+
+class RecognitionService:
+    """无界面的识别服务：串口采集 -> 滤波 -> 批量推理 -> 表决 -> 发布事件，
+    同时按固定周期向舵机下发最新样本"""
+
+    def __init__(self, model, sign_mapping, port=SERIAL_PORT, baud_rate=BAUD_RATE,
+                 stabilizer=None, send_interval=None, open_serial=None, temporal=None, logger=None):
+        self.model = model
+        self.temporal = temporal  # TemporalRecognizer，设置后改用窗口特征识别
+        self.sign_mapping = sign_mapping
+        self.logger = logger  # datalog.LogWriter，设置后记录全部原始样本
+        self.port = port
+        self.baud_rate = baud_rate
+        self.stabilizer = stabilizer if stabilizer is not None else make_stabilizer()
+        self.send_interval = send_interval
+        self._open_serial = open_serial or (
+            lambda: serial.serial_for_url(self.port, self.baud_rate, timeout=READ_TIMEOUT))
+        self.parser = StreamParser()
+        self.encoder = DownlinkEncoder()
+        self.subscribers = []
+        self.ser = None
+        self.latest_sample = None
+        self.samples = 0
+        self.events = 0
+        self._stopping = asyncio.Event()
+
+    def subscribe(self, callback):
+        """注册订阅者：callback(event)，event为可JSON序列化的dict"""
+        self.subscribers.append(callback)
+        return callback
+
+    def publish(self, event):
+        self.events += 1
+        for callback in self.subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"订阅者处理事件失败: {str(e)}", file=sys.stderr)
+
+    def process_samples(self, samples):
+        """滤波并批量推理一组新样本，返回稳定手势切换产生的事件"""
+        if not samples:
+            return []
+        self.latest_sample = samples[-1]
+        self.samples += len(samples)
+        predict_start = time.perf_counter_ns()
+        confidence = None
+        if self.temporal is not None:
+            # 窗口特征本身已平滑，只对窗口填满后的样本输出标签
+            labels = self.temporal.update(samples)
+            samples = samples[len(samples) - len(labels):]
+        else:
+            smoothed = np.array([self.stabilizer.smooth(s) for s in samples], dtype=np.float64)
+            if hasattr(self.model, 'recognize'):
+                labels, confidence, _ = self.model.recognize(smoothed)
+            else:
+                labels = self.model.predict(smoothed)
+        tracker.record_since('predict', predict_start)
+        events = []
+        for i, (sample, label) in enumerate(zip(samples, labels)):
+            gesture_id = self.stabilizer.update(label)
+            # 切换到拒识状态不发布事件
+            if gesture_id is None or gesture_id == UNKNOWN:
+                continue
+            gesture_id = int(gesture_id)
+            event = {
+                'time': time.time(),
+                'gesture_id': gesture_id,
+                'gesture': self.sign_mapping.get(str(gesture_id), f"未知手势({gesture_id})"),
+                'sample': [int(v) for v in sample],
+            }
+            if confidence is not None:
+                event['confidence'] = round(float(confidence[i]), 4)
+            events.append(event)
+        return events
+
+    async def _acquire(self):
+        loop = asyncio.get_running_loop()
+        while not self._stopping.is_set():
+            if self.ser is None:
+                try:
+                    self.ser = await loop.run_in_executor(None, self._open_serial)
+                    print(f"串口已连接: {self.port} @ {self.baud_rate} bps", file=sys.stderr)
+                except Exception as e:
+                    print(f"串口连接失败: {str(e)}", file=sys.stderr)
+                    await asyncio.sleep(1.0)
+                    continue
+            ser = self.ser
+            try:
+                # 阻塞读放到线程池中执行，事件循环始终不被串口I/O阻塞
+                chunk = await loop.run_in_executor(None, lambda: ser.read(ser.in_waiting or 1))
+            except Exception as e:
+                print(f"读取串口数据错误: {str(e)}", file=sys.stderr)
+                self._close_serial()
+                continue
+            if chunk:
+                arrival_ns = time.perf_counter_ns()
+                samples = self.parser.feed(chunk)
+                tracker.record_since('parse', arrival_ns)
+                if self.logger is not None and samples:
+                    self.logger.log_samples(samples, arrival_ns * 1e-9)
+                for event in self.process_samples(samples):
+                    self.publish(event)
+                    tracker.record_since('end_to_end', arrival_ns)
+
+    async def _downlink(self):
+        """按单调时钟截止时间周期下发，与PeriodicSender行为一致"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.send_interval
+        while not self._stopping.is_set():
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            if self.ser is not None and self.latest_sample is not None:
+                try:
+                    write_start = time.perf_counter_ns()
+                    self.ser.write(self.encoder.encode(self.latest_sample))
+                    tracker.record_since('write', write_start)
+                except Exception as e:
+                    print(f"发送传感器数据失败: {str(e)}", file=sys.stderr)
+            deadline += self.send_interval
+            now = loop.time()
+            if now > deadline:
+                deadline += ((now - deadline) // self.send_interval + 1) * self.send_interval
+
+    def _close_serial(self):
+        if self.ser is not None:
+            try:
+                self.ser.close()
+            except Exception:
+                pass
+            self.ser = None
+
+    async def run(self):
+        tasks = [asyncio.ensure_future(self._acquire())]
+        if self.send_interval:
+            tasks.append(asyncio.ensure_future(self._downlink()))
+        try:
+            await self._stopping.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._close_serial()
+
+    def stop(self):
+        self._stopping.set()
+
+
+class ReaderDriver(threading.Thread):
+    """用已有的SerialReader（串口由其独占）驱动RecognitionService：周期取出新样本，
+    过期样本不参与识别，稳定手势事件经service.publish发布给订阅者；
+    等待数据、拒识等状态只交给on_status（例如界面的QueueSubscriber）"""
+
+    def __init__(self, service, reader, interval=RECOGNIZE_INTERVAL, max_age=STALE_TIMEOUT,
+                 on_status=None, on_samples=None):
+        super().__init__(name="ReaderDriver", daemon=True)
+        self.service = service
+        self.reader = reader
+        self.interval = interval
+        self.max_age = max_age
+        self.on_status = on_status
+        self.on_samples = on_samples  # 首次收到新样本时的回调（启动分析）
+        self._seq = 0
+        self._stop_event = threading.Event()
+        self._reset_requested = threading.Event()
+        self._status = None
+        self._last_data_time = time.monotonic()
+
+    def request_reset(self):
+        """请求在识别线程中重置滤波和表决状态（清空序列时由界面调用）"""
+        self._reset_requested.set()
+
+    def stop(self, timeout=2.0):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def _post_status(self, text, color):
+        if self._status != text:
+            self._status = text
+            if self.on_status is not None:
+                self.on_status({'type': 'status', 'text': text, 'color': color})
+
+    def step(self):
+        if self._reset_requested.is_set():
+            self._reset_requested.clear()
+            self.service.stabilizer.reset()
+        samples, stamps, self._seq = self.reader.since(self._seq)
+        now = time.perf_counter()
+        fresh = stamps >= now - self.max_age
+        if not fresh.any():
+            # 两次识别之间可能没有新样本，超过1秒才提示等待
+            if time.monotonic() - self._last_data_time > 1.0:
+                self._post_status("状态: 等待串口数据...", "orange")
+            return
+        self._last_data_time = time.monotonic()
+        for stamp in stamps[fresh]:
+            tracker.record('queue', (now - stamp) * 1e9)
+        if self.on_samples is not None:
+            self.on_samples()
+        arrival_ns = int(stamps[fresh][-1] * 1e9)
+        events = self.service.process_samples(samples[fresh].tolist())
+        for event in events:
+            event['arrival_ns'] = arrival_ns
+            self.service.publish(event)
+        if events:
+            self._status = None
+        if self.service.stabilizer.stable == UNKNOWN:
+            self._post_status("状态: 未识别到已知手势", "orange")
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.step()
+            except Exception as e:
+                self._post_status(f"状态: 错误 - {str(e)}", "red")
+
+
+def run_with_gui(service, sign_mapping, coro):
+    """在后台线程运行识别服务协程coro，Tk界面作为订阅者显示识别结果"""
+    import tkinter as tk
+    from ui import SignLanguageDisplay
+
+    ui_events = service.subscribe(QueueSubscriber())
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_until_complete, args=(coro,), daemon=True)
+    thread.start()
+
+    root = tk.Tk()
+    app = SignLanguageDisplay(root, None, sign_mapping, None, None, event_queue=ui_events.queue)
+    ui_events.notify = app.wakeup
+    root.mainloop()
+
+    loop.call_soon_threadsafe(service.stop)
+    thread.join(2.0)
+
+
+def dump_latency(path):
+    tracker.export(path)
+    print(tracker.format_report(), file=sys.stderr)
+
+
+async def run_headless(service, args):
+    publisher = None
+    if args.tcp or args.unix:
+        publisher = service.subscribe(SocketPublisher())
+        if args.tcp:
+            host, _, port = args.tcp.rpartition(':')
+            await publisher.start_tcp(host or '127.0.0.1', int(port))
+        if args.unix:
+            await publisher.start_unix(args.unix)
+    try:
+        await service.run()
+    finally:
+        if publisher is not None:
+            await publisher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="无界面手语识别服务")
+    parser.add_argument('--port', default=SERIAL_PORT, help="串口设备或pyserial URL")
+    parser.add_argument('--baud', type=int, default=BAUD_RATE)
+    parser.add_argument('--send-interval', type=float, default=0.8, help="舵机下发周期(秒)，0表示不下发")
+    parser.add_argument('--tcp', help="在 host:port 上发布识别事件")
+    parser.add_argument('--unix', help="在Unix套接字路径上发布识别事件")
+    parser.add_argument('--quiet', action='store_true', help="不向标准输出打印事件")
+    parser.add_argument('--gui', action='store_true', help="同时启动Tk界面作为订阅者")
+    parser.add_argument('--latency-file', default='latency.json', help="延迟统计导出文件")
+    parser.add_argument('--temporal-model', help="使用temporal.py训练的窗口模型(.npz)识别")
+    parser.add_argument('--reject-threshold', type=float, default=REJECT_THRESHOLD,
+                        help="置信度低于该值时拒识，0表示关闭拒识和预检")
+    parser.add_argument('--cache-bucket', type=int, default=CACHE_BUCKET,
+                        help="预测缓存的ADC量化步长，0表示不使用缓存")
+    parser.add_argument('--log-dir', help="把识别事件批量写入该目录下的轮转日志(datalog.py)")
+    parser.add_argument('--log-raw', action='store_true', help="日志中同时记录全部原始样本")
+    args = parser.parse_args()
+
+    holder, store, trainer = start_online_learning('model.npz', 'sign_mapping.json')
+    sign_mapping = holder.sign_mapping
+    model, _ = build_recognizer(holder, store, args.reject_threshold, args.cache_bucket)
+    temporal = None
+    if args.temporal_model:
+        from temporal import TemporalRecognizer
+        temporal, _ = TemporalRecognizer.load(args.temporal_model)
+    logger = None
+    if args.log_dir:
+        from datalog import LogWriter
+        logger = LogWriter(args.log_dir)
+        logger.start()
+    service = RecognitionService(model, sign_mapping, args.port, args.baud,
+                                 send_interval=args.send_interval or None, temporal=temporal,
+                                 logger=logger if args.log_raw else None)
+    if not args.quiet:
+        service.subscribe(stdout_subscriber)
+    if logger is not None:
+        service.subscribe(logger.log_event)
+
+    if hasattr(signal, 'SIGUSR1'):
+        # kill -USR1 <pid> 导出延迟统计
+        signal.signal(signal.SIGUSR1, lambda *_: dump_latency(args.latency_file))
+
+    if args.gui:
+        run_with_gui(service, sign_mapping, run_headless(service, args))
+    else:
+        try:
+            asyncio.run(run_headless(service, args))
+        except KeyboardInterrupt:
+            pass
+    trainer.stop()
+    if logger is not None:
+        logger.stop()
+    dump_latency(args.latency_file)
+
+
+if __name__ == "__main__":
+    main()
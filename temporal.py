@@ -0,0 +1,275 @@
+import argparse
+import time
+import numpy as np
+from network import (get_features_and_labels, train_model, save_artifact, load_artifact,
+                     FastPredictor)
+from protocol import StreamParser
+
+WINDOW = 16  # 滑动窗口长度（样本数）
+TEMPORAL_MODEL_FILE = 'temporal_model.npz'
+HOLD = 1.0  # 合成会话中每个手势保持的秒数
+TRANSITION = 0.4  # 合成会话中每个手势开始时从上一姿态运动过来的秒数
+
+# 每个窗口的特征（逐通道）：均值、首尾差、最小二乘斜率、方差，共 4 x 4 = 16 维
+FEATURE_NAMES = [f"{kind}_A{ch}" for kind in ('mean', 'delta', 'slope', 'var') for ch in range(1, 5)]
+
+
+def _window_constants(window):
+    """窗口内位置 i = 0..K-1 的 Σi 与 斜率公式的分母 K*Σi² - (Σi)²"""
+    i1 = window * (window - 1) // 2
+    i2 = (window - 1) * window * (2 * window - 1) // 6
+    return i1, window * i2 - i1 * i1
+
+
+def _features(window, first, last, s, q, t):
+    """由窗口的累加量计算特征：s=Σx, q=Σx², t=Σi*x（均为整数，结果与批量计算逐位一致）"""
+    i1, denom = _window_constants(window)
+    mean = s / window
+    return np.concatenate([
+        mean,
+        (last - first).astype(np.float64),
+        (window * t - i1 * s) / denom,
+        q / window - mean * mean,
+    ], axis=-1)
+
+
+class WindowFeatures:
+    """在实时样本流上增量计算窗口特征
+
+    维护环形缓冲区和 Σx、Σx²、Σi*x 三组整数累加量，每来一个样本只做O(1)
+    更新，重叠窗口的计算全部复用，不必每次从头遍历K个样本。
+    """
+
+    def __init__(self, window=WINDOW, channels=4):
+        if window < 2:
+            raise ValueError("window必须不小于2")
+        self.window = window
+        self._ring = np.zeros((window, channels), dtype=np.int64)
+        self._s = np.zeros(channels, dtype=np.int64)
+        self._q = np.zeros(channels, dtype=np.int64)
+        self._t = np.zeros(channels, dtype=np.int64)
+        self._count = 0
+
+    def reset(self):
+        self._ring[:] = 0
+        self._s[:] = 0
+        self._q[:] = 0
+        self._t[:] = 0
+        self._count = 0
+
+    @property
+    def ready(self):
+        return self._count >= self.window
+
+    def update(self, sample):
+        """送入一个样本，窗口填满后返回特征向量，否则返回None"""
+        x = np.rint(np.asarray(sample, dtype=np.float64)).astype(np.int64)
+        k = self.window
+        idx = self._count % k
+        if self._count >= k:
+            # 最旧样本移出：其余样本在窗口中的位置都减1
+            old = self._ring[idx]
+            self._s -= old
+            self._q -= old * old
+            self._t -= self._s
+            self._t += (k - 1) * x
+        else:
+            self._t += self._count * x
+        self._s += x
+        self._q += x * x
+        self._ring[idx] = x
+        self._count += 1
+        if self._count < k:
+            return None
+        first = self._ring[self._count % k]
+        return _features(k, first, x, self._s, self._q, self._t)
+
+    def update_many(self, samples):
+        """逐个送入样本，返回每个完整窗口的特征 (m, 16)"""
+        rows = [f for f in (self.update(s) for s in samples) if f is not None]
+        return np.array(rows).reshape(-1, len(FEATURE_NAMES))
+
+
+def window_features(X, window=WINDOW):
+    """对一段连续样本 (n, 4) 用前缀和一次性计算所有完整窗口的特征 (n-K+1, 16)，
+    与WindowFeatures逐样本计算的结果一致，用于构造训练集"""
+    X = np.rint(np.asarray(X, dtype=np.float64)).astype(np.int64)
+    n = len(X)
+    if n < window:
+        return np.empty((0, len(FEATURE_NAMES)))
+    zero = np.zeros((1, X.shape[1]), dtype=np.int64)
+    m = np.arange(n, dtype=np.int64)[:, None]
+    cs = np.concatenate([zero, np.cumsum(X, axis=0)])
+    cq = np.concatenate([zero, np.cumsum(X * X, axis=0)])
+    cm = np.concatenate([zero, np.cumsum(m * X, axis=0)])
+    end = np.arange(window, n + 1)
+    start = end - window
+    s = cs[end] - cs[start]
+    q = cq[end] - cq[start]
+    # Σ(m - start)*x_m = Σm*x_m - start*Σx_m
+    t = cm[end] - cm[start] - start[:, None] * s
+    return _features(window, X[start], X[end - 1], s, q, t)
+
+
+def build_windows(sequences, window=WINDOW):
+    """sequences: [(样本[n, 4], 标签[n]), ...]，返回 (窗口特征, 窗口末样本的标签)"""
+    features, labels = [], []
+    for samples, seq_labels in sequences:
+        f = window_features(samples, window)
+        features.append(f)
+        labels.append(np.asarray(seq_labels)[window - 1:window - 1 + len(f)])
+    return np.vstack(features), np.concatenate(labels)
+
+
+def synthesized_sequences(seconds=120.0, rate=50.0, seed=0, hold=HOLD, transition=TRANSITION):
+    """由replay.synthesize生成带过渡运动的连续样本，返回 [(样本, 标签)]
+
+    每个手势开始的transition秒是从上一姿态到新姿态的运动，标签为新手势，
+    窗口的首尾差、斜率、方差特征在这些样本上才有信息。
+    """
+    from replay import synthesize
+    records, labels = synthesize(seconds, rate, hold, fmt='binary', seed=seed, transition=transition)
+    samples = np.array(StreamParser().feed(b''.join(chunk for _, chunk in records)), dtype=np.float64)
+    return [(samples, np.array(labels))]
+
+
+def transition_mask(n, rate=50.0, hold=HOLD, transition=TRANSITION):
+    """synthesized_sequences生成的n个样本中处于过渡运动的样本（第一段没有上一姿态）"""
+    per_gesture = max(1, int(hold * rate))
+    mask = np.arange(n) % per_gesture < min(int(transition * rate), per_gesture)
+    mask[:per_gesture] = False
+    return mask
+
+
+def store_sequences(store):
+    """把样本文件中的标定样本切分为序列：每次标定采集（一次append）是一段连续数据，
+    相邻两次采集即使标签相同也不拼接；没有会话索引的旧文件按标签变化切分"""
+    X, y = store.load()
+    if not len(y):
+        return []
+    cuts = np.union1d(np.flatnonzero(np.diff(y)) + 1, store.session_starts())
+    cuts = cuts[(cuts > 0) & (cuts < len(y))]
+    return [(xs, ys) for xs, ys in zip(np.split(X, cuts), np.split(y, cuts))]
+
+
+def train_temporal_model(sequences=None, window=WINDOW):
+    """在窗口特征上训练MLP，sequences为None时使用带过渡运动的合成会话，返回 (管道, 手势映射)"""
+    if sequences is None:
+        sequences = synthesized_sequences()
+    X, y = build_windows(sequences, window)
+    model, _ = train_model(X, y)
+    _, _, sign_names = get_features_and_labels()
+    return model, sign_names
+
+
+class TemporalRecognizer:
+    """流式时序识别：增量窗口特征 + 批量推理"""
+
+    def __init__(self, model, window=WINDOW):
+        self.model = model
+        self.features = WindowFeatures(window)
+
+    @classmethod
+    def load(cls, path=TEMPORAL_MODEL_FILE):
+        model, sign_mapping, header = load_artifact(path)
+        return cls(model, header['window']), sign_mapping
+
+    def reset(self):
+        self.features.reset()
+
+    def update(self, samples):
+        """送入一批新样本，返回每个完整窗口的预测标签（窗口未填满时为空）"""
+        features = self.features.update_many(samples)
+        if not len(features):
+            return np.empty(0, dtype=int)
+        return self.model.predict(features)
+
+
+def _accuracy(predicted, labels, mask=None):
+    if mask is not None:
+        predicted, labels = predicted[mask], labels[mask]
+    return float(np.mean(predicted == labels)) if len(labels) else float('nan')
+
+
+def compare_with_snapshot(window=WINDOW, seconds=60.0, rate=50.0, sequences=None, held_out=()):
+    """比较单样本模型与窗口模型的准确率和逐样本延迟
+
+    两个模型都在sequences（默认为带过渡运动的合成会话）上训练，在另一段合成会话上
+    评估整体准确率和过渡段（手指运动中）的准确率；held_out为未参与训练的标定会话，
+    给出时另外报告在这些真实序列上的准确率。两个模型都只在窗口填满后的样本上比较。
+    """
+    if sequences is None:
+        sequences = synthesized_sequences(rate=rate)
+    snapshot = FastPredictor(train_model(np.vstack([x for x, _ in sequences]),
+                                         np.concatenate([y for _, y in sequences]))[0])
+    temporal = FastPredictor(train_temporal_model(sequences, window)[0])
+    samples, labels = synthesized_sequences(seconds, rate, seed=1)[0]
+    moving = transition_mask(len(samples), rate)[window - 1:]
+
+    def evaluate(samples, labels, mask=None):
+        recognizer = TemporalRecognizer(temporal, window)
+        temporal_labels = recognizer.update(samples)
+        snapshot_labels = snapshot.predict(samples)[window - 1:]
+        labels = labels[window - 1:]
+        return _accuracy(snapshot_labels, labels, mask), _accuracy(temporal_labels, labels, mask)
+
+    def per_sample_us(step):
+        start = time.perf_counter()
+        for sample in samples:
+            step(sample)
+        return (time.perf_counter() - start) / len(samples) * 1e6
+
+    report = {}
+    report['snapshot_accuracy'], report['temporal_accuracy'] = evaluate(samples, labels)
+    report['snapshot_transition_accuracy'], report['temporal_transition_accuracy'] = \
+        evaluate(samples, labels, moving)
+    held_out = [(x, y) for x, y in held_out if len(y) >= window]
+    if held_out:
+        # 按会话逐段识别，窗口不跨会话；各会话按样本数加权
+        results = np.array([evaluate(x, y) for x, y in held_out])
+        weights = np.array([len(y) - window + 1 for _, y in held_out])
+        report['snapshot_session_accuracy'], report['temporal_session_accuracy'] = \
+            (results * weights[:, None]).sum(axis=0) / weights.sum()
+    recognizer = TemporalRecognizer(temporal, window)
+    report['snapshot_us'] = per_sample_us(lambda s: snapshot.predict(s[None, :]))
+    report['temporal_us'] = per_sample_us(lambda s: recognizer.update(s[None, :]))
+    report['window_delay_ms'] = (window - 1) / 2 / rate * 1000
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="滑动窗口时序手势模型")
+    parser.add_argument('--window', type=int, default=WINDOW, help="窗口长度（样本数）")
+    parser.add_argument('--samples', help="同时使用该样本文件中的标定数据训练")
+    parser.add_argument('-o', '--output', default=TEMPORAL_MODEL_FILE)
+    args = parser.parse_args()
+
+    # 校验增量计算与批量计算一致
+    samples, _ = synthesized_sequences(10)[0]
+    streaming = WindowFeatures(args.window).update_many(samples)
+    print(f"增量特征与批量特征一致: {np.array_equal(streaming, window_features(samples, args.window))}")
+
+    sequences = synthesized_sequences()
+    sessions = []
+    if args.samples:
+        from online import SampleStore
+        sessions = store_sequences(SampleStore(args.samples))
+        print(f"标定会话 {len(sessions)} 段")
+    model, sign_names = train_temporal_model(sequences + sessions, args.window)
+    X, y = build_windows(sequences + sessions, args.window)
+    save_artifact(model, sign_names, args.output, X, y, meta={'window': args.window})
+    print(f"时序模型已保存: {args.output}")
+
+    # 评估时每隔一段标定会话留出一段，不参与训练
+    report = compare_with_snapshot(args.window, sequences=sequences + sessions[::2], held_out=sessions[1::2])
+    for name, key in (("单样本模型", 'snapshot'), ("窗口模型  ", 'temporal')):
+        line = (f"{name}: 准确率 {report[key + '_accuracy']:.3f}, "
+                f"过渡段 {report[key + '_transition_accuracy']:.3f}")
+        if key + '_session_accuracy' in report:
+            line += f", 留出的标定会话 {report[key + '_session_accuracy']:.3f}"
+        print(f"{line}, {report[key + '_us']:.1f}us/样本")
+    print(f"窗口引入的平均延迟 {report['window_delay_ms']:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
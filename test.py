@@ -1,107 +1,400 @@
-import serial
-import time
-import threading
-
-# 配置串口参数
-SERIAL_PORT = '/dev/ttyS1'  # 根据实际情况修改串口
-BAUD_RATE = 9600
-TIMEOUT = 1
-SEND_INTERVAL = 0.8  # 发送间隔，单位：秒
-
-# 要发送的固定十六进制数据 (原始数据)
-# 对应: A5 5A 0A DC 05 40 06 A4 06 6C 07 D0 07 1B
-BASE_HEX_DATA = [
-    0xA5, 0x5A, 0x0A, 0xDC, 
-    0x05, 0x40, 0x06, 0xA4, 
-    0x06, 0x6C, 0x07, 0xD0, 
-    0x07, 0x1B
-]
-
-# 添加常见的串口结束符 (回车\r + 换行\n)
-# 对应十六进制: 0x0D (CR) 和 0x0A (LF)
-TERMINATOR = [0x0D, 0x0A]
-
-# 组合数据和结束符，转换为字节对象
-SEND_DATA = bytes(BASE_HEX_DATA + TERMINATOR)
-
-# 全局变量
-ser = None
-running = True
-
-def init_serial():
-    """初始化串口连接"""
-    global ser
-    try:
-        ser = serial.Serial(
-            port=SERIAL_PORT,
-            baudrate=BAUD_RATE,
-            timeout=TIMEOUT
-        )
-        if ser.is_open:
-            print(f"成功连接到串口: {SERIAL_PORT} @ {BAUD_RATE} bps")
-            return True
-        return False
-    except Exception as e:
-        print(f"串口初始化失败: {str(e)}")
-        return False
-
-def send_data():
-    """发送带结束符的十六进制数据到STM32"""
-    global ser, running
-    
-    while running:
-        if ser is None or not ser.is_open:
-            # 尝试重新连接
-            if not init_serial():
-                time.sleep(SEND_INTERVAL)
-                continue
-        
-        try:
-            # 直接发送字节数据（包含结束符）
-            bytes_sent = ser.write(SEND_DATA)
-            # 打印发送的十六进制数据（包含结束符），便于调试
-            hex_str = ' '.join(f'{b:02X}' for b in SEND_DATA)
-            print(f"发送数据 ({bytes_sent} 字节): {hex_str}")
-        except Exception as e:
-            print(f"发送数据失败: {str(e)}")
-            # 发送失败时尝试重新连接
-            if ser and ser.is_open:
-                ser.close()
-            ser = None
-        
-        # 等待下一次发送
-        time.sleep(SEND_INTERVAL)
-
-def main():
-    global running
-    
-    print("STM32带结束符的十六进制串口通信程序启动...")
-    print(f"目标串口: {SERIAL_PORT}")
-    print(f"波特率: {BAUD_RATE}")
-    print(f"发送间隔: {SEND_INTERVAL}秒")
-    print(f"发送数据 (含结束符): {''.join(f'{b:02X}' for b in SEND_DATA)}")
-    print("结束符: 0x0D (CR) 和 0x0A (LF)")
-    print("按Ctrl+C退出程序")
-    
-    # 启动发送线程
-    send_thread = threading.Thread(target=send_data, daemon=True)
-    send_thread.start()
-    
-    try:
-        # 保持主线程运行
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\n程序正在退出...")
-        running = False
-        send_thread.join()
-        
-        # 关闭串口
-        if ser and ser.is_open:
-            ser.close()
-            print("串口已关闭")
-        print("程序已退出")
-
-if __name__ == "__main__":
-    main()
-    
\ No newline at end of file
+import argparse
+import os
+import threading
+import time
+import numpy as np
+import serial
+from latency import LatencyHistogram
+from protocol import StreamParser, encode_uplink_frame, encode_text_line
+from replay import gesture_samples, PtyDevice
+
+# 配置串口参数
+SERIAL_PORT = '/dev/ttyS1'  # 根据实际情况修改串口
+BAUD_RATE = 9600
+TIMEOUT = 1
+SEND_INTERVAL = 0.8  # fixed模式的默认发送间隔，单位：秒
+
+# 要发送的固定十六进制数据 (原始数据)
+# 对应: A5 5A 0A DC 05 40 06 A4 06 6C 07 D0 07 1B
+BASE_HEX_DATA = [
+    0xA5, 0x5A, 0x0A, 0xDC,
+    0x05, 0x40, 0x06, 0xA4,
+    0x06, 0x6C, 0x07, 0xD0,
+    0x07, 0x1B
+]
+
+# 添加常见的串口结束符 (回车\r + 换行\n)
+# 对应十六进制: 0x0D (CR) 和 0x0A (LF)
+TERMINATOR = [0x0D, 0x0A]
+
+# 组合数据和结束符，转换为字节对象
+SEND_DATA = bytes(BASE_HEX_DATA + TERMINATOR)
+
+BITS_PER_BYTE = 10  # 8N1：起始位 + 8数据位 + 停止位
+BATCH_INTERVAL = 0.002  # 到期的帧合并为一次write，每批最多覆盖该时长(秒)的帧
+MAX_WRITE_BYTES = 4096  # 每次write最多写入的字节数（与伪终端缓冲区相当）
+POOL_FRAMES = 50000  # 预先编码的帧数上限，发送更多帧时循环使用
+COMMON_BAUDS = (9600, 19200, 38400, 57600, 115200, 230400, 460800, 921600)
+LINK_HEADROOM = 0.7  # 容量规划时链路占用率不超过该值
+
+
+def link_limit(baud, frame_bytes):
+    """串口在baud下每秒最多能传输的帧数"""
+    return baud / BITS_PER_BYTE / frame_bytes
+
+
+def required_baud(rate, frame_bytes, headroom=LINK_HEADROOM):
+    """以rate帧/秒发送且链路占用率不超过headroom时所需的最低常用波特率，没有则返回None"""
+    for baud in COMMON_BAUDS:
+        if link_limit(baud, frame_bytes) * headroom >= rate:
+            return baud
+    return None
+
+
+def make_frames(count, pattern='gestures', fmt='binary', corrupt=0.0, hold=50, noise=3.0, seed=0):
+    """预先编码count帧，返回 (帧列表, 每帧的手势编号[count], 每帧能否被解析[count])
+
+    gestures: 每hold帧随机换一个（与上一个不同的）手势，样本取自network.data并叠加高斯噪声
+    fixed:    原test.py的固定14字节帧加回车换行
+    corrupt为损坏帧的比例：二进制帧改错校验和，文本行把逗号换成分号
+    """
+    rng = np.random.default_rng(seed)
+    if pattern == 'fixed':
+        frames = [SEND_DATA] * count
+        gestures = np.full(count, -1)
+    else:
+        groups = gesture_samples()
+        gesture_ids = list(groups)
+        encode = encode_uplink_frame if fmt == 'binary' else encode_text_line
+        gestures = np.empty(count, dtype=int)
+        gesture = rng.choice(gesture_ids)
+        for start in range(0, count, max(1, hold)):
+            gesture = rng.choice([g for g in gesture_ids if g != gesture])
+            gestures[start:start + hold] = gesture
+        frames = []
+        for g in gestures:
+            base = groups[g][rng.integers(len(groups[g]))]
+            sample = np.clip(np.round(base + rng.normal(0, noise, 4)), 0, 1023).astype(int)
+            frames.append(encode([0, *sample]))
+    bad = np.flatnonzero(rng.random(count) < corrupt)
+    for i in bad:
+        frame = bytearray(frames[i])
+        if frame[:1] == b'\xA5':
+            frame[-1] ^= 0x5A
+        else:
+            frame = frame.replace(b',', b';', 1)
+        frames[i] = bytes(frame)
+    parser = StreamParser()
+    valid = np.array([len(parser.feed(frame)) == 1 for frame in frames])
+    return frames, gestures, valid
+
+
+def open_port(port, baud_rate=BAUD_RATE):
+    """打开串口或pyserial URL"""
+    ser = serial.serial_for_url(port, baud_rate, timeout=TIMEOUT)
+    print(f"成功连接到串口: {port} @ {baud_rate} bps")
+    return ser
+
+
+def _sleep_until(t_ns):
+    delay = (t_ns - time.perf_counter_ns()) / 1e9
+    if delay > 0:
+        time.sleep(delay)
+
+
+def send_frames(port, frames, count, rate=None, link_baud=None, stop_event=None, verbose=False):
+    """按目标速率发送count帧（循环使用frames），rate为None时尽快发送
+
+    到期的帧合并为一次write。link_baud不为None时模拟该波特率的串口链路
+    （用于伪终端，真实串口由驱动限速）：一批数据要等链路发完上一批、
+    并按字节数计算出传输完成的时刻才写入，相当于接收端收齐整帧的时间。
+    返回发送统计、每帧的写入完成时间和计划发送时间(perf_counter_ns)；
+    尽快发送时计划时间即写入时间。
+    """
+    lengths = np.array([len(f) for f in frames])
+    ends = np.cumsum(lengths)
+    view = memoryview(b''.join(frames))
+    frame_ns = 1e9 / rate if rate else 0.0
+    byte_ns = BITS_PER_BYTE * 1e9 / link_baud if link_baud else 0.0
+    batch_ns = max(BATCH_INTERVAL * 1e9, frame_ns, byte_ns * lengths.mean())
+    send_ns = np.zeros(count, dtype=np.int64)
+    due_ns = np.zeros(count, dtype=np.int64)
+    writes = LatencyHistogram()
+    lag = LatencyHistogram()  # 写入时间相对计划时间的滞后（超过链路容量时积压）
+    sent_bytes = 0
+    start = link_free = time.perf_counter_ns()
+    i = 0
+    while i < count and not (stop_event is not None and stop_event.is_set()):
+        now = time.perf_counter_ns()
+        if rate:
+            due = min(count, int((now - start) / frame_ns) + 1)
+            if due <= i:
+                _sleep_until(start + i * frame_ns)
+                continue
+        else:
+            due = count
+        # 一批不跨越帧池末尾，覆盖的时长不超过batch_ns
+        j = i % len(frames)
+        n = min(due - i, len(frames) - j)
+        per_frame = max(frame_ns, byte_ns * lengths[j])
+        n = max(1, min(n, int(batch_ns / per_frame) if per_frame else n))
+        lo = ends[j - 1] if j else 0
+        n = max(1, min(n, int(np.searchsorted(ends, lo + MAX_WRITE_BYTES, 'right')) - j))
+        hi = ends[j + n - 1]
+        if link_baud:
+            # 有帧待发时链路连续发送，只在链路空闲后才从本批的计划时间重新开始计时，
+            # sleep的误差不会累积成吞吐量损失
+            link_free = max(link_free, start + i * frame_ns) + (hi - lo) * byte_ns
+            _sleep_until(link_free)
+        write_start = time.perf_counter_ns()
+        port.write(view[lo:hi])
+        done = time.perf_counter_ns()
+        writes.record(done - write_start)
+        send_ns[i:i + n] = done
+        due_ns[i:i + n] = done
+        if rate:
+            due_ns[i:i + n] = start + np.arange(i, i + n) * frame_ns
+            for k in range(i, i + n):
+                lag.record(done - due_ns[k])
+        if verbose:
+            print(f"发送数据 ({hi - lo} 字节): {view[lo:hi].hex(' ').upper()}")
+        sent_bytes += hi - lo
+        i += n
+    if rate:
+        # 实际速率按完整的发送周期计算
+        _sleep_until(start + i * frame_ns)
+    elapsed = (time.perf_counter_ns() - start) / 1e9
+    return {
+        'frames': i,
+        'bytes': sent_bytes,
+        'elapsed': elapsed,
+        'frames_per_s': i / elapsed if elapsed else 0.0,
+        'writes': writes.summary(),
+        'lag': lag.summary(),
+        'send_ns': send_ns[:i],
+        'due_ns': due_ns[:i],
+    }
+
+
+def _discard(fd):
+    """读走并丢弃伪终端另一端收到的数据，避免缓冲区写满后发送阻塞"""
+    try:
+        while os.read(fd, 65536):
+            pass
+    except OSError:
+        pass
+
+
+class LoopbackPipeline:
+    """在本进程内以无界面方式运行main.py的采集与识别流程
+    (SerialReader + 拒识/缓存识别器 + RecognitionService/ReaderDriver)，串口指向伪终端，
+    记录每个样本的到达时间和每个稳定手势事件的时间"""
+
+    def __init__(self, path, baud_rate=BAUD_RATE):
+        import main as app
+        from online import load_initial_model, SampleStore, ModelHolder, build_recognizer
+        from service import RecognitionService
+        self.app = app
+        app.SERIAL_PORT, app.BAUD_RATE = path, baud_rate
+        model, self.sign_mapping, _ = load_initial_model()
+        recognizer, _ = build_recognizer(ModelHolder(model, self.sign_mapping), SampleStore(),
+                                         app.REJECT_THRESHOLD, app.CACHE_BUCKET)
+        self.service = RecognitionService(recognizer, self.sign_mapping, stabilizer=app.stabilizer)
+        self.service.subscribe(self._on_gesture)
+        self.worker = None
+        self.reader = None
+        self.events = []  # (perf_counter_ns, 手势编号)
+        self.arrivals = []  # 每个样本的到达时间(ns)数组
+        self._seq = 0
+        self._stop_event = threading.Event()
+        self._collector = threading.Thread(target=self._collect, name="LoopbackCollector", daemon=True)
+
+    def _on_gesture(self, event):
+        self.events.append((time.perf_counter_ns(), event['gesture_id']))
+
+    def _collect(self):
+        while not self._stop_event.wait(0.002):
+            _, stamps, self._seq = self.reader.since(self._seq)
+            if len(stamps):
+                self.arrivals.append((stamps * 1e9).astype(np.int64))
+
+    def start(self):
+        self.reader = self.app.init_serial()
+        try:
+            self.reader.wait_connected()
+        except TimeoutError:
+            self.reader.stop()
+            raise
+        from service import ReaderDriver
+        self.worker = ReaderDriver(self.service, self.reader, self.app.RECOGNIZE_INTERVAL,
+                                   self.app.STALE_TIMEOUT)
+        self.worker.start()
+        self._collector.start()
+
+    def mark(self):
+        """当前计数，作为一轮测量的起点"""
+        return {'frames': self.reader.frames, 'errors': self.reader.errors,
+                'arrivals': sum(len(a) for a in self.arrivals), 'events': len(self.events)}
+
+    def drain(self, expected, timeout=5.0, settle=1.0):
+        """等待已发送的expected个有效帧全部被解析，再等settle秒让识别表决完成"""
+        deadline = time.monotonic() + timeout
+        while self.reader.frames < expected and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(settle)
+        self.worker.request_reset()
+
+    def stop(self):
+        self._stop_event.set()
+        self._collector.join(1.0)
+        self.worker.stop()
+        self.reader.stop()
+
+
+def analyze_loopback(pipeline, base, sent, gestures, valid):
+    """按发送顺序把第k个有效帧与第k个收到的样本对应，统计样本延迟、丢帧和识别延迟
+
+    延迟都从帧的计划发送时间算起（相当于手势动作发生的时刻），包含链路积压和传输时间。
+    样本延迟到SerialReader解析出该样本；识别延迟到同一段手势内识别线程给出该手势的稳定事件。
+    """
+    n = sent['frames']
+    send_ns = sent['send_ns']
+    due_ns = sent['due_ns']
+    ok = valid[np.arange(n) % len(valid)]
+    labels = gestures[np.arange(n) % len(gestures)]
+    arrivals = np.concatenate(pipeline.arrivals)[base['arrivals']:] if pipeline.arrivals else np.zeros(0, np.int64)
+    valid_ns = due_ns[ok]
+    matched = min(len(valid_ns), len(arrivals))
+    latency = LatencyHistogram()
+    for delta in arrivals[:matched] - valid_ns[:matched]:
+        latency.record(delta)
+
+    starts = np.flatnonzero(np.diff(labels, prepend=labels[0] - 1) != 0)
+    events = pipeline.events[base['events']:]
+    recognition = LatencyHistogram()
+    recognized = 0
+    segments = 0
+    for s, seg_start in enumerate(starts):
+        seg_end = starts[s + 1] if s + 1 < len(starts) else n
+        first = np.flatnonzero(ok[seg_start:seg_end])
+        if labels[seg_start] < 0 or len(first) == 0:
+            continue
+        segments += 1
+        t0 = due_ns[seg_start + first[0]]
+        t1 = send_ns[seg_end] if seg_end < n else float('inf')
+        hit = next((t for t, g in events if t0 <= t < t1 and g == labels[seg_start]), None)
+        if hit is not None:
+            recognized += 1
+            recognition.record(hit - t0)
+    return {
+        'valid_sent': int(ok.sum()),
+        'received': pipeline.reader.frames - base['frames'],
+        'dropped': int(ok.sum()) - (pipeline.reader.frames - base['frames']),
+        'parse_errors': pipeline.reader.errors - base['errors'],
+        'latency': latency.summary(),
+        'segments': segments,
+        'recognized': recognized,
+        'recognition': recognition.summary(),
+    }
+
+
+def format_result(rate, baud, sent, loop=None):
+    utilization = sent['bytes'] * BITS_PER_BYTE / baud / sent['elapsed'] if sent['elapsed'] else 0.0
+    w, lag = sent['writes'], sent['lag']
+    target = f"{rate:8.1f}" if rate else f"{'max':>8}"
+    line = (f"{target} {sent['frames_per_s']:9.1f} {utilization:7.1%} "
+            f"{w['p50'] / 1e3:8.1f} {w['p99'] / 1e3:8.1f} {lag['p99'] / 1e6:9.1f}")
+    if loop is not None:
+        t, r = loop['latency'], loop['recognition']
+        line += (f" {loop['dropped']:6d} {loop['parse_errors']:6d} {t['p50'] / 1e6:8.2f} {t['p99'] / 1e6:8.2f}"
+                 f" {loop['recognized']:>4d}/{loop['segments']:<4d} {r['p50'] / 1e6:8.0f} {r['p99'] / 1e6:8.0f}")
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="串口负载生成与往返基准：按目标速率或扫描速率发送上行帧，"
+                                                 "默认经伪终端回环到main.py的采集与识别流程")
+    parser.add_argument('--port', help="发送到的串口或pyserial URL（如/dev/ttyS1）；默认创建伪终端并回环到main.py")
+    parser.add_argument('--baud', type=int, default=BAUD_RATE, help="链路波特率，伪终端上按此速率模拟链路")
+    parser.add_argument('--no-throttle', action='store_true', help="伪终端不模拟波特率，尽快发送")
+    parser.add_argument('--no-pipeline', action='store_true', help="伪终端上只测发送，不运行识别流程")
+    parser.add_argument('--pattern', choices=('gestures', 'fixed'), default='gestures',
+                        help="gestures: network.data中的随机手势序列; fixed: 原固定14字节帧")
+    parser.add_argument('--format', choices=('binary', 'text'), default='binary')
+    parser.add_argument('--corrupt', type=float, default=0.0, help="损坏帧（校验和错误）的比例")
+    parser.add_argument('--rate', default='50', help="目标帧率(Hz)，max表示尽快发送")
+    parser.add_argument('--sweep', type=int, default=0,
+                        help="从--rate按几何级数扫描到1.2倍链路上限的速率点数")
+    parser.add_argument('--duration', type=float, default=10.0, help="每个速率点的发送时长(秒)")
+    parser.add_argument('--hold', type=float, default=1.0, help="每个手势保持的秒数")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help="打印每次发送的十六进制数据")
+    args = parser.parse_args()
+
+    sample = make_frames(1, args.pattern, args.format)[0][0]
+    frame_bytes = len(sample)
+    limit = link_limit(args.baud, frame_bytes)
+    if args.pattern == 'fixed' and args.rate == '50':
+        args.rate = str(1 / SEND_INTERVAL)
+    rate = None if args.rate == 'max' else float(args.rate)
+    rates = [rate]
+    if args.sweep > 1:
+        rates = list(np.geomspace(rate or 1.0, 1.2 * limit, args.sweep))
+
+    loopback = args.port is None
+    throttle = args.baud if loopback and not args.no_throttle else None
+    if loopback:
+        port = PtyDevice()
+        print(f"模拟串口: {port.path}" + (f"，按{args.baud}bps模拟链路" if throttle else "，不限速"))
+    else:
+        port = open_port(args.port, args.baud)
+    pipeline = None
+    if loopback and not args.no_pipeline:
+        pipeline = LoopbackPipeline(port.path, args.baud)
+        pipeline.start()
+    elif loopback:
+        threading.Thread(target=_discard, args=(port.slave,), daemon=True).start()
+
+    print(f"帧格式: {args.pattern}/{args.format}, {frame_bytes} 字节/帧, "
+          f"{args.baud}bps链路上限 {limit:.1f} 帧/秒")
+    header = f"{'目标Hz':>8} {'实际Hz':>9} {'链路占用':>7} {'写p50us':>8} {'写p99us':>8} {'滞后p99ms':>9}"
+    if pipeline is not None:
+        header += (f" {'丢帧':>6} {'解析错':>6} {'样本p50':>8} {'样本p99':>8} {'识别':>9} "
+                   f"{'识别p50':>8} {'识别p99':>8}")
+    results = []
+    stop_event = threading.Event()
+    try:
+        for step_rate in rates:
+            effective = step_rate or (limit if throttle or not loopback else 20000.0)
+            count = max(1, int(args.duration * effective))
+            frames, gestures, valid = make_frames(min(count, POOL_FRAMES), args.pattern, args.format,
+                                                  args.corrupt, max(1, int(args.hold * effective)), seed=args.seed)
+            base = pipeline.mark() if pipeline is not None else None
+            sent = send_frames(port, frames, count, step_rate, throttle, stop_event, args.verbose)
+            loop = None
+            if pipeline is not None:
+                expected = base['frames'] + int(valid[np.arange(sent['frames']) % len(valid)].sum())
+                pipeline.drain(expected)
+                loop = analyze_loopback(pipeline, base, sent, gestures, valid)
+            results.append(format_result(step_rate, args.baud, sent, loop))
+            if len(results) == 1:
+                print(header)
+            print(results[-1])
+    except KeyboardInterrupt:
+        print("\n程序正在退出...")
+        stop_event.set()
+    finally:
+        if pipeline is not None:
+            pipeline.stop()
+        port.close()
+
+    if pipeline is not None:
+        print("注: 样本/识别延迟(ms)从计划发送时刻算起，含链路积压和传输时间；识别列为识别出的手势段/有效手势段")
+    for target in (50, 100, 200):
+        baud = required_baud(target, frame_bytes)
+        need = f"{baud}bps" if baud else f"超过{COMMON_BAUDS[-1]}bps"
+        print(f"以{target}Hz发送（链路占用≤{LINK_HEADROOM:.0%}）至少需要 {need}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import numpy as np
+from datalog import LogWriter, LogReader, list_logs, load_logs
+
+
+def _write_log(directory):
+    writer = LogWriter(str(directory))
+    writer.start()
+    samples = np.arange(40).reshape(10, 4)
+    writer.log_samples(samples, stamps=np.arange(10) * 0.01)
+    writer.log_event({'gesture_id': 3, 'confidence': 0.95, 'sample': [1, 2, 3, 4]})
+    writer.log_sentence("你好")
+    writer.stop()
+    return samples
+
+
+def test_log_round_trip(tmp_path):
+    samples = _write_log(tmp_path)
+    logged, gestures, sentences = load_logs(list_logs(str(tmp_path)))
+    assert np.array_equal(logged['x'], samples)
+    assert gestures['gesture'].tolist() == [3]
+    assert np.allclose(gestures['confidence'], 0.95)
+    assert gestures['x'].tolist() == [[1, 2, 3, 4]]
+    assert [text for _, text in sentences] == ["你好"]
+
+
+def test_log_reader_views_outlive_context(tmp_path):
+    samples = _write_log(tmp_path)
+    path = list_logs(str(tmp_path))[0]
+    with LogReader(path) as reader:
+        x = reader.samples()
+        g = reader.gestures()
+    assert np.array_equal(x['x'], samples)
+    assert g['gesture'].tolist() == [3]
@@ -0,0 +1,36 @@
+import shutil
+import pytest
+from network import FastPredictor, RejectingPredictor, get_features_and_labels, quantize_model, train_model
+from export_c import export_header, generate_header, verify_c_parity
+
+needs_gcc = pytest.mark.skipif(shutil.which('gcc') is None, reason="需要主机gcc")
+
+
+@pytest.fixture(scope='module')
+def trained():
+    X, y, _ = get_features_and_labels()
+    return train_model(X, y)[0], X, y
+
+
+def test_header_declares_topology_and_classes(trained):
+    model, X, _ = trained
+    header = generate_header(model)
+    assert f"#define NN_INPUT_NODES {X.shape[1]}" in header
+    assert "static const int nn_class_ids[NN_OUTPUT_NODES] = {" + ', '.join(
+        str(int(c)) for c in model.classes_) + "};" in header
+
+
+@needs_gcc
+def test_c_header_matches_python(trained, tmp_path):
+    model, X, y = trained
+    qmodel = quantize_model(model)
+    precheck = RejectingPredictor(FastPredictor(model), X, y)
+    precheck.calibrate(X, y)
+    header = str(tmp_path / 'nn_model.h')
+    export_header(model, header, qmodel, precheck)
+    with open(header, encoding='utf-8') as f:
+        assert f"#define NN_TEMPERATURE {precheck.temperature:.9g}" in f.read()
+    # C输出标定后的概率，拒识判断与上位机RejectingPredictor一致
+    ok, max_err = verify_c_parity(model, header, qmodel=qmodel, precheck=precheck)
+    assert ok, max_err
+    assert max_err <= 1e-4
@@ -0,0 +1,153 @@
+import numpy as np
+import pytest
+from network import (UNKNOWN, CachedPredictor, FastPredictor, RejectingPredictor, get_features_and_labels,
+                     predict_batch, quantization_report, quantize_model, restore_pipeline, train_model,
+                     verify_fast_predictor)
+from online import ModelHolder
+
+
+@pytest.fixture(scope='module')
+def trained():
+    X, y, _ = get_features_and_labels()
+    return train_model(X, y)[0], X, y
+
+
+def test_fast_predictor_matches_sklearn(trained):
+    model, X, _ = trained
+    fast = FastPredictor(model)
+    assert np.array_equal(fast.predict(X), model.predict(X))
+    assert np.allclose(fast.predict_proba(X), model.predict_proba(X), atol=1e-9)
+
+
+def test_fast_predictor_single_sample_and_helpers(trained):
+    model, X, _ = trained
+    fast = FastPredictor(model)
+    labels, proba = predict_batch(fast, X[:1].ravel())
+    assert labels.tolist() == model.predict(X[:1]).tolist()
+    assert np.allclose(proba.sum(axis=1), 1.0)
+    assert verify_fast_predictor(model, X)
+
+
+def test_restore_pipeline_matches_predictor_and_supports_partial_fit(trained):
+    model, X, y = trained
+    fast = FastPredictor(model)
+    pipeline = restore_pipeline(fast)
+    assert np.array_equal(pipeline.predict(X), model.predict(X))
+    assert np.allclose(pipeline.predict_proba(X), fast.predict_proba(X), atol=1e-9)
+    pipeline[-1].partial_fit(pipeline[0].transform(X), y)
+    assert np.array_equal(pipeline[-1].classes_, fast.classes)
+    assert not np.allclose(FastPredictor(pipeline).coefs[0], fast.coefs[0])
+
+
+def test_quantized_mlp_tracks_float_model(trained):
+    model, X, y = trained
+    fast = FastPredictor(model)
+    qmodel = quantize_model(model, X)
+    logits = qmodel.predict_logits(X)
+    assert logits.dtype == np.int64 and logits.shape == (len(X), len(fast.classes))
+    assert np.mean(qmodel.predict(X) == fast.predict(X)) >= 0.95
+    labels, proba = qmodel.predict_batch(X)
+    assert np.array_equal(labels, qmodel.predict(X))
+    assert np.allclose(proba.sum(axis=1), 1.0)
+    # int8 logits乘以logit_scale后应接近float模型输出层的logits
+    float_logits = np.log(fast.predict_proba(X))
+    float_logits -= float_logits.mean(axis=1, keepdims=True)
+    int_logits = logits * qmodel.logit_scale
+    int_logits -= int_logits.mean(axis=1, keepdims=True)
+    assert np.abs(int_logits - float_logits).max() < 0.1 * np.abs(float_logits).max()
+
+
+def test_quantization_report_sizes(trained):
+    model, X, y = trained
+    fast = FastPredictor(model)
+    report = quantization_report(model, X=X, y=y, repeat=10)
+    assert report['float_bytes'] == sum(w.nbytes + b.nbytes for w, b in zip(fast.coefs, fast.intercepts))
+    assert report['float32_bytes'] * 2 == report['float_bytes']
+    assert report['int8_bytes'] < report['float32_bytes'] / 3
+
+
+class _CountingModel:
+    """按第一个通道的值输出标签的假模型，记录推理的样本数"""
+
+    classes = np.array([0, 1])
+
+    def __init__(self, label=0, on_predict=None):
+        self.label = label
+        self.on_predict = on_predict
+        self.predicted = 0
+
+    def predict_batch(self, X):
+        self.predicted += len(X)
+        if self.on_predict is not None:
+            self.on_predict()
+        proba = np.zeros((len(X), 2))
+        proba[:, self.label] = 1.0
+        return np.full(len(X), self.label), proba
+
+
+def test_cached_predictor_counts_hits_and_misses():
+    model = _CountingModel()
+    cache = CachedPredictor(model, bucket=4, maxsize=8)
+    cache.recognize([[100, 200, 300, 400], [101, 201, 301, 401]])  # 同一格：一批内两次未命中
+    cache.recognize([[102, 202, 302, 402]])
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 2, 1)
+    assert model.predicted == 2
+
+
+def test_cached_predictor_evicts_least_recently_used():
+    model = _CountingModel()
+    cache = CachedPredictor(model, bucket=1, maxsize=2)
+    a, b, c = [[1, 0, 0, 0]], [[2, 0, 0, 0]], [[3, 0, 0, 0]]
+    cache.recognize(a)
+    cache.recognize(b)
+    cache.recognize(a)  # a变为最近使用
+    cache.recognize(c)  # 淘汰b
+    assert cache.stats()['size'] == 2
+    before = model.predicted
+    cache.recognize(a)
+    assert model.predicted == before
+    cache.recognize(b)
+    assert model.predicted == before + 1
+
+
+def test_cached_predictor_invalidated_on_swap():
+    holder = ModelHolder(_CountingModel(0), {})
+    cache = CachedPredictor(holder, bucket=4)
+    holder.add_listener(cache.invalidate)
+    assert cache.recognize([[100, 200, 300, 400]])[0].tolist() == [0]
+    holder.swap(_CountingModel(1))
+    assert cache.recognize([[100, 200, 300, 400]])[0].tolist() == [1]
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_cached_predictor_drops_results_of_a_swapped_out_model():
+    holder = ModelHolder(None, {})
+    # 旧模型推理过程中，训练线程替换模型并清空缓存
+    old = _CountingModel(0, on_predict=lambda: holder.swap(_CountingModel(1)))
+    holder.swap(old)
+    cache = CachedPredictor(holder, bucket=4)
+    holder.add_listener(cache.invalidate)
+    assert cache.recognize([[100, 200, 300, 400]])[0].tolist() == [0]
+    assert cache.stats()['size'] == 0
+    assert cache.recognize([[100, 200, 300, 400]])[0].tolist() == [1]
+
+
+def test_rejecting_predictor_never_mixes_old_and_new_precheck():
+    X, y, _ = get_features_and_labels()
+    model = _CountingModel()
+    rejecting = RejectingPredictor(model, X, y)
+    old_centroids = rejecting.centroids
+    far = X.max(axis=0) * 10
+
+    def distances(samples):
+        # 识别线程计算完距离后，训练线程用大得多的距离上限重建预检
+        rejecting.ood_factor = 1000.0
+        rejecting.refit(X, y)
+        return type(old_centroids).distances(old_centroids, samples)
+    old_centroids.distances = distances
+
+    labels, _, _ = rejecting.recognize([far])
+    assert labels.tolist() == [UNKNOWN]
+    assert model.predicted == 0
+    assert rejecting.max_distance > rejecting.centroids.distances(far[None, :]).min()
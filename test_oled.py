@@ -0,0 +1,36 @@
+import shutil
+import numpy as np
+import pytest
+from oled_bench import build_bench, gesture_frame, legacy_bytes, recognition_stream, run
+
+pytestmark = pytest.mark.skipif(shutil.which('gcc') is None, reason="需要主机gcc")
+
+
+@pytest.fixture(scope='module')
+def bench(tmp_path_factory):
+    return build_bench(str(tmp_path_factory.mktemp('oled')))
+
+
+def test_screen_matches_framebuffer_after_every_refresh(bench):
+    frames = list(recognition_stream(60, hold=10))
+    init, rows = run(bench, frames)
+    assert init[3] == 1
+    assert len(rows) == len(frames)
+    assert all(row[3] == 1 for row in rows)
+
+
+def test_steady_frame_sends_fewer_bytes_than_legacy(bench):
+    frame = gesture_frame(3, 2, 0.91, 2000, 1500)
+    _, rows = run(bench, [frame, frame])
+    # 第二帧内容不变：只发送脏区域，远少于原驱动整屏清除+重绘
+    first, steady = rows
+    assert steady[0] < first[0] < legacy_bytes(frame)
+    assert steady[2] == 0
+
+
+def test_jittering_frames_send_fewer_bytes_than_legacy(bench):
+    frames = list(recognition_stream(40, hold=10))
+    _, rows = run(bench, frames)
+    bus = np.array([row[0] for row in rows])
+    legacy = np.array([legacy_bytes(f) for f in frames])
+    assert (bus < legacy).all()
@@ -0,0 +1,32 @@
+import threading
+import numpy as np
+from network import FastPredictor, get_features_and_labels, save_artifact, train_model
+from online import OnlineTrainer, start_online_learning
+
+
+def test_first_calibration_of_loaded_mlp_is_incremental(tmp_path, monkeypatch):
+    X, y, sign_names = get_features_and_labels()
+    model_path = str(tmp_path / 'model.npz')
+    save_artifact(train_model(X, y)[0], sign_names, model_path)
+
+    def no_retrain(self):
+        raise AssertionError("已知手势不应完整重训")
+    monkeypatch.setattr(OnlineTrainer, '_retrain', no_retrain)
+
+    holder, store, trainer = start_online_learning(model_path, str(tmp_path / 'sign_mapping.json'),
+                                                   str(tmp_path / 'samples.bin'))
+    assert isinstance(holder.model, FastPredictor)
+    updated = threading.Event()
+    holder.add_listener(lambda _: updated.set())
+    try:
+        label = int(y[0])
+        samples = X[y == label] + np.random.default_rng(0).normal(0, 5, (int((y == label).sum()), 4))
+        store.append(samples, label)
+        trainer.submit_samples(samples, label)
+        assert updated.wait(60)
+    finally:
+        trainer.stop()
+        trainer.join(10)
+    assert holder.version == 1
+    assert trainer.pipeline is not None
+    assert np.array_equal(holder.model.classes, np.unique(y))
@@ -0,0 +1,93 @@
+import numpy as np
+from protocol import (MAX_PENDING, DownlinkEncoder, StreamParser, encode_text_line,
+                      encode_uplink_frame, format_sensor_data, transform_sensor_values,
+                      verify_downlink_encoder)
+
+
+def test_downlink_encoder_matches_format_sensor_data():
+    assert verify_downlink_encoder()
+
+
+def test_downlink_encode_clamps_out_of_range_adc():
+    encoder = DownlinkEncoder()
+    for sample in ([-5, 0, 2000, 1023], [1023, 1023, 1023, 1023]):
+        clamped = [min(max(v, 0), 1023) for v in sample]
+        assert bytes(encoder.encode(sample)) == format_sensor_data(transform_sensor_values(clamped))
+    assert encoder.encode(None) is None
+
+
+def test_downlink_encode_batch_is_concatenated_frames():
+    encoder = DownlinkEncoder()
+    samples = np.random.default_rng(1).integers(0, 1024, (50, 4))
+    frames = encoder.encode_batch(samples)
+    assert frames == b''.join(bytes(encoder.encode(s.tolist())) for s in samples)
+
+
+def _frames(values):
+    return [encode_uplink_frame(v) for v in values]
+
+
+VALUES = [[i, 100 + i, 200 + i, 300 + i, 400 + i] for i in range(20)]
+
+
+def test_parser_binary_frames_split_at_every_byte():
+    stream = b''.join(_frames(VALUES))
+    parser = StreamParser()
+    samples = []
+    for i in range(len(stream)):
+        samples += parser.feed(stream[i:i + 1])
+    assert samples == [v[1:] for v in VALUES]
+    assert (parser.mode, parser.errors, parser.frames) == ('binary', 0, len(VALUES))
+
+
+def test_parser_text_lines_split_across_chunks():
+    stream = b''.join(encode_text_line(v) for v in VALUES)
+    parser = StreamParser()
+    samples = []
+    for start in range(0, len(stream), 7):
+        samples += parser.feed(stream[start:start + 7])
+    assert samples == [v[1:] for v in VALUES]
+    assert (parser.mode, parser.errors) == ('text', 0)
+
+
+def test_parser_interleaved_text_and_binary():
+    stream = b''
+    for i, v in enumerate(VALUES):
+        stream += encode_text_line(v) if i % 2 else encode_uplink_frame(v)
+    parser = StreamParser()
+    samples = parser.feed(stream[:25]) + parser.feed(stream[25:])
+    assert samples == [v[1:] for v in VALUES]
+    assert parser.errors == 0
+
+
+def test_parser_rejects_bad_checksum_and_resyncs():
+    frames = _frames(VALUES[:3])
+    bad = bytearray(frames[1])
+    bad[-1] ^= 0xFF
+    parser = StreamParser()
+    samples = parser.feed(b'\x00\xA5\x12' + frames[0] + bytes(bad) + frames[2])
+    assert samples == [VALUES[0][1:], VALUES[2][1:]]
+    assert parser.errors > 0
+
+
+def test_parser_resyncs_on_false_header_inside_payload():
+    # 负载中出现的A5 5A 0A不能被当作帧头，校验失败后逐字节重新同步
+    frame = encode_uplink_frame([0x5AA5, 0x0A, 1, 2, 3])
+    parser = StreamParser()
+    samples = parser.feed(frame[5:] + frame + frame)
+    assert samples == [[0x0A, 1, 2, 3]] * 2
+
+
+def test_parser_drops_malformed_text_lines():
+    parser = StreamParser()
+    samples = parser.feed(b'1,2,3\r\n0,1,x,3,4\r\n' + encode_text_line(VALUES[0]))
+    assert samples == [VALUES[0][1:]]
+    assert parser.errors == 2
+
+
+def test_parser_caps_pending_garbage():
+    parser = StreamParser()
+    # 没有换行的文本永远无法解析，缓冲超过MAX_PENDING后丢弃
+    assert parser.feed(b'1' * (MAX_PENDING + 1)) == []
+    assert parser.errors == 1
+    assert parser.feed(encode_uplink_frame(VALUES[0])) == [VALUES[0][1:]]
@@ -0,0 +1,55 @@
+import time
+import pytest
+from scheduler import PeriodicSender
+
+
+def _run(sender, seconds):
+    sender.start()
+    time.sleep(seconds)
+    sender.stop()
+    return sender.stats()
+
+
+def test_ticks_follow_fixed_deadlines():
+    stats = _run(PeriodicSender(0.01, lambda: None), 0.5)
+    # 截止时间不随执行耗时漂移，0.5秒内约50次
+    assert 40 <= stats['ticks'] <= 51
+    assert stats['missed'] == 0
+    assert 0 <= stats['mean_jitter'] <= stats['max_jitter']
+
+
+def test_overrunning_task_skips_missed_periods():
+    stats = _run(PeriodicSender(0.01, lambda: time.sleep(0.035)), 0.5)
+    assert stats['missed'] >= 2 * stats['ticks'] - 1
+    assert stats['ticks'] <= 15
+
+
+def test_failing_task_keeps_running():
+    def fail():
+        raise RuntimeError("发送失败")
+    assert _run(PeriodicSender(0.01, fail), 0.2)['ticks'] >= 10
+
+
+def test_set_rate_changes_period():
+    sender = PeriodicSender(0.05, lambda: None)
+    sender.start()
+    time.sleep(0.1)
+    sender.set_rate(200)
+    assert sender.period == 0.005
+    before = sender.stats()['ticks']
+    time.sleep(0.3)
+    sender.stop()
+    assert sender.stats()['ticks'] - before >= 40
+
+
+@pytest.mark.parametrize('hz', [0, -10])
+def test_set_rate_rejects_non_positive(hz):
+    sender = PeriodicSender(0.01, lambda: None)
+    with pytest.raises(ValueError):
+        sender.set_rate(hz)
+    assert sender.period == 0.01
+
+
+def test_period_must_be_positive():
+    with pytest.raises(ValueError):
+        PeriodicSender(0, lambda: None)
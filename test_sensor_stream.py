@@ -0,0 +1,143 @@
+import sys
+import threading
+import numpy as np
+import pytest
+from sensor_stream import SensorRingBuffer, SerialReader
+
+WRITES = 200_000
+
+
+def _check_rows(values, stamps):
+    """写者写入的第i个样本为 [i, i+1, i+2, i+3]，时间戳为i；撕裂的行不满足该关系"""
+    first = values[:, 0]
+    assert np.array_equal(values, first[:, None] + np.arange(4))
+    assert np.array_equal(stamps, first)
+
+
+def test_ring_buffer_readers_see_no_torn_rows_or_gaps():
+    buffer = SensorRingBuffer(capacity=16)
+    done = threading.Event()
+    failures = []
+
+    def write():
+        for i in range(WRITES):
+            buffer.push([i, i + 1, i + 2, i + 3], float(i))
+        done.set()
+
+    def read_since():
+        seq = 0
+        try:
+            while True:
+                finished = done.is_set()
+                values, stamps, count = buffer.since(seq)
+                _check_rows(values, stamps)
+                # 返回的是序号count-len..count-1的连续样本；没有落后超过容量时从seq开始
+                assert np.array_equal(values[:, 0], np.arange(count - len(values), count))
+                if count - seq <= buffer.capacity - 1:
+                    assert len(values) == count - seq
+                seq = count
+                if finished and seq == WRITES:
+                    return
+        except AssertionError as e:
+            failures.append(e)
+
+    def read_latest():
+        try:
+            while not done.is_set():
+                latest = buffer.latest()
+                if latest is None:
+                    continue
+                values, stamp, count = latest
+                _check_rows(values[None, :], np.array([stamp]))
+                assert values[0] == count - 1
+        except AssertionError as e:
+            failures.append(e)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # 尽量频繁地切换线程，让读写交错
+    try:
+        threads = [threading.Thread(target=f) for f in (read_since, read_latest, read_since, write)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(60)
+    finally:
+        sys.setswitchinterval(interval)
+    assert not failures, failures[0]
+    assert buffer.count == WRITES
+
+
+class _PreemptedArray(np.ndarray):
+    """读取时先执行on_read，模拟读者复制数据前被写者抢占"""
+
+    on_read = None
+
+    def __getitem__(self, key):
+        if _PreemptedArray.on_read is not None:
+            on_read, _PreemptedArray.on_read = _PreemptedArray.on_read, None
+            on_read()
+        return np.asarray(super().__getitem__(key))
+
+
+def _preempt(buffer, writes):
+    """下一次读取数据时写者先写入writes个样本（每次读取只触发一次）"""
+    def on_read():
+        for _ in range(writes):
+            i = buffer.count
+            buffer.push([i, i + 1, i + 2, i + 3], float(i))
+    buffer._data = buffer._data.view(_PreemptedArray)
+    _PreemptedArray.on_read = on_read
+
+
+def test_ring_buffer_retries_when_slots_are_overwritten_during_read():
+    buffer = SensorRingBuffer(capacity=8)
+    for i in range(5):
+        buffer.push([i, i + 1, i + 2, i + 3], float(i))
+    _preempt(buffer, 8)  # 覆盖全部槽位
+    values, stamps, count = buffer.since(0)
+    _check_rows(values, stamps)
+    assert count == 13
+    assert values[:, 0].tolist() == list(range(6, 13))
+
+    _preempt(buffer, 8)
+    values, stamp, count = buffer.latest()
+    assert count == 21 and values[0] == 20 and stamp == 20.0
+
+    _preempt(buffer, 8)
+    values, stamps = buffer.window(3)
+    _check_rows(values, stamps)
+    assert values[:, 0].tolist() == [26, 27, 28]
+
+
+def test_ring_buffer_since_caps_at_capacity():
+    buffer = SensorRingBuffer(capacity=8)
+    for i in range(20):
+        buffer.push([i, i + 1, i + 2, i + 3], float(i))
+    values, stamps, count = buffer.since(0)
+    assert count == 20
+    assert values[:, 0].tolist() == list(range(13, 20))
+    _check_rows(values, stamps)
+    assert buffer.since(count)[0].shape == (0, 4)
+
+
+def test_wait_connected_times_out_with_last_error():
+    def open_serial():
+        raise OSError("设备不存在")
+    reader = SerialReader('/dev/null-glove', 115200, open_serial=open_serial, reconnect_delay=0.01)
+    reader.start()
+    try:
+        with pytest.raises(TimeoutError, match="设备不存在"):
+            reader.wait_connected(0.2)
+    finally:
+        reader.stop()
+    assert isinstance(reader.last_error, OSError)
+
+
+def test_wait_connected_returns_once_open():
+    reader = SerialReader('loop://', 115200)
+    reader.start()
+    try:
+        reader.wait_connected()
+        assert reader.ser is not None and reader.last_error is None
+    finally:
+        reader.stop()
@@ -0,0 +1,46 @@
+import numpy as np
+from online import SampleStore
+from replay import synthesize
+from temporal import (WindowFeatures, store_sequences, synthesized_sequences, transition_mask,
+                      window_features)
+
+
+def test_streaming_features_match_batch():
+    samples, _ = synthesized_sequences(5)[0]
+    assert np.array_equal(WindowFeatures(8).update_many(samples), window_features(samples, 8))
+
+
+def test_synthesized_transitions_move_between_poses():
+    samples, labels = synthesized_sequences(20)[0]
+    moving = transition_mask(len(samples))
+    features = window_features(samples, 8)
+    # 过渡段窗口的首尾差明显大于静止段（静止段只有噪声和同类样本间的差异）
+    delta = np.abs(features[:, 4:8]).sum(axis=1)
+    ends_moving = moving[7:]
+    assert np.median(delta[ends_moving]) > 2 * np.median(delta[~ends_moving])
+    assert len(labels) == len(samples)
+
+
+def test_synthesize_without_transition_is_unchanged():
+    plain = synthesize(2, fmt='binary', seed=4)
+    assert synthesize(2, fmt='binary', seed=4, transition=0.0) == plain
+    assert synthesize(2, fmt='binary', seed=4, transition=0.4)[1] == plain[1]
+
+
+def test_store_sequences_cut_at_session_boundaries(tmp_path):
+    store = SampleStore(str(tmp_path / 'samples.bin'))
+    store.append(np.full((5, 4), 100), 1)
+    store.append(np.full((3, 4), 200), 1)  # 同一手势的第二次采集
+    store.append(np.full((4, 4), 300), 2)
+    assert store.session_starts().tolist() == [0, 5, 8]
+    sequences = store_sequences(store)
+    assert [len(y) for _, y in sequences] == [5, 3, 4]
+    assert [int(y[0]) for _, y in sequences] == [1, 1, 2]
+
+
+def test_store_sequences_without_session_index(tmp_path):
+    store = SampleStore(str(tmp_path / 'samples.bin'))
+    store.append(np.full((5, 4), 100), 1)
+    store.append(np.full((4, 4), 300), 2)
+    (tmp_path / 'samples.bin.sessions').unlink()
+    assert [len(y) for _, y in store_sequences(store)] == [5, 4]
@@ -1,31 +1,55 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, font
 import json
+import queue
+import threading
 import time
+from collections import deque
+from latency import tracker
+from network import UNKNOWN
+
+PREFERRED_FONTS = ["WenQuanYi Micro Hei", "SimHei", "Heiti TC", "Arial"]
+FONT_CACHE_FILE = 'font_cache.json'  # 缓存上次选定的字体，避免每次启动枚举全部系统字体
+SEQUENCE_MAXLEN = 50  # 序列最多保留的手势数
+SEQUENCE_SEPARATOR = " → "
+MAX_EVENTS_PER_UPDATE = 64  # 每次刷新最多合并处理的事件数，避免突发事件长时间占用事件循环
+EVENT_CHECK_INTERVAL = 50  # 订阅模式下Tk线程检查唤醒标志的周期(ms)，未被唤醒时不读取队列、不刷新
 
 class SignLanguageDisplay:
-    def __init__(self, root, model, sign_mapping, data_provider, gesture_sender):
+    def __init__(self, root, model, sign_mapping, data_provider, gesture_sender, stabilizer=None,
+                 event_queue=None, arrival_provider=None, calibrator=None, on_clear=None, logger=None):
         self.root = root
         self.root.title("TCF-BO-RF手语翻译系统")
         self.root.geometry("800x700")
         self.root.resizable(True, True)
 
         self.last_sign = None
-        self.current_sequence = ""
+        self.sequence = deque(maxlen=SEQUENCE_MAXLEN)  # 有界序列，超出时丢弃最旧的手势
+        self._sequence_text = ""  # 已渲染的序列文本，追加时增量拼接
         self.model = model
         self.sign_mapping = sign_mapping
         self.data_provider = data_provider
         self.gesture_sender = gesture_sender
+        self.stabilizer = stabilizer  # 为None时每次分类结果都直接显示
+        self.event_queue = event_queue  # 作为识别服务的订阅者时，从该队列读取识别事件
+        self.arrival_provider = arrival_provider  # 返回当前样本到达串口的时间(perf_counter_ns)
+        self.calibrator = calibrator  # 标定模式：采集标注样本并在后台更新模型
+        self.on_clear = on_clear  # 清空序列时调用（例如重置后台识别线程的表决状态）
+        self.logger = logger  # datalog.LogWriter，设置后保存的序列写入日志而不是output.txt
+        self._status = None  # 当前状态栏内容，相同内容不重复设置
+        self._wakeup = threading.Event()  # 生产者线程放入事件后置位，只由Tk线程读取和清除
+        self._wakeup.set()  # 界面创建前已放入队列的事件在首次检查时处理
+        self._shown_sign = None  # 当前画布上显示的手势
         self.sensor_values = [0, 0, 0, 0]
         self.last_update_time = time.time()
 
         # 字体设置
         self.base_font = self._get_compatible_font()
-        self.title_font = (self.base_font[0], 28, "bold")
-        self.sign_font = (self.base_font[0], 48, "bold")
-        self.sequence_font = (self.base_font[0], 24)
-        self.info_font = (self.base_font[0], 12)
-        self.status_font = (self.base_font[0], 10)
+        self.title_font = (self.base_font, 28, "bold")
+        self.sign_font = (self.base_font, 48, "bold")
+        self.sequence_font = (self.base_font, 24)
+        self.info_font = (self.base_font, 12)
+        self.status_font = (self.base_font, 10)
 
         # 颜色方案
         self.background_color = "#f0f7ff"
@@ -38,18 +62,33 @@ class SignLanguageDisplay:
         # 创建UI
         self._create_widgets()
         
-        # 启动实时更新
-        self.update_interval = 100
-        self.schedule_update()
+        # 轮询模式每100ms识别一次；订阅模式由生产者调用wakeup()置位唤醒标志，
+        # Tk线程周期检查该标志，只在有新事件时取队列刷新
+        if event_queue is None:
+            self.update_interval = 100
+            self.schedule_update()
+        else:
+            self.update_interval = EVENT_CHECK_INTERVAL
+            self._check_events()
 
     def _get_compatible_font(self):
-        preferred_fonts = ["WenQuanYi Micro Hei", "SimHei", "Heiti TC", "Arial"]
-        available_fonts = font.families()
+        # 先检查缓存的字体是否仍然可用（只解析一个字体，不枚举全部字体）
+        try:
+            with open(FONT_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cached = json.load(f).get('font')
+            if cached and font.Font(root=self.root, family=cached).actual('family') == cached:
+                return cached
+        except (OSError, ValueError, tk.TclError):
+            pass
 
-        for font_name in preferred_fonts:
-            if font_name in available_fonts:
-                return font_name
-        return "Arial"
+        available_fonts = set(font.families(self.root))
+        font_name = next((name for name in PREFERRED_FONTS if name in available_fonts), "Arial")
+        try:
+            with open(FONT_CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump({'font': font_name}, f, ensure_ascii=False)
+        except OSError:
+            pass
+        return font_name
 
     def _create_widgets(self):
         self.root.configure(bg=self.background_color)
@@ -114,6 +153,8 @@ class SignLanguageDisplay:
             relief=tk.FLAT
         )
         self.sign_canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        # 只在画布尺寸变化时重新居中，不在每次刷新时查询尺寸
+        self.sign_canvas.bind("<Configure>", self._center_sign_text)
         
         self.sign_text = self.sign_canvas.create_text(
             300, 150,
@@ -170,6 +211,24 @@ class SignLanguageDisplay:
             style="TButton"
         ).pack(side=tk.RIGHT, padx=5)
         
+        if self.calibrator is not None:
+            # 标定：输入手势名称后保持手势，采集一段样本
+            self.calibration_name_var = tk.StringVar(value="")
+            tk.Entry(
+                control_frame,
+                textvariable=self.calibration_name_var,
+                font=self.info_font,
+                width=12
+            ).pack(side=tk.LEFT, padx=5)
+            
+            ttk.Button(
+                control_frame,
+                text="采集标定样本",
+                command=self.start_calibration,
+                width=15,
+                style="TButton"
+            ).pack(side=tk.LEFT, padx=5)
+        
         style = ttk.Style()
         style.configure(
             "TButton", 
@@ -179,85 +238,180 @@ class SignLanguageDisplay:
             padding=5
         )
 
+    @property
+    def current_sequence(self):
+        return self._sequence_text
+
     def schedule_update(self):
         self.update_display()
         self.root.after(self.update_interval, self.schedule_update)
 
+    def wakeup(self):
+        """通知界面有新事件（可在任意线程调用）：只置位唤醒标志，不调用任何Tk方法；
+        多次通知在下一次检查前合并为一次"""
+        self._wakeup.set()
+
+    def _check_events(self):
+        """订阅模式：在Tk线程中检查唤醒标志，被唤醒时取出队列中的事件刷新界面"""
+        if self._wakeup.is_set():
+            # 先清除再读取队列，读取期间到达的通知不会丢失
+            self._wakeup.clear()
+            self.update_display()
+            if not self.event_queue.empty():
+                # 超过MAX_EVENTS_PER_UPDATE的积压事件下个周期继续处理
+                self._wakeup.set()
+        self.root.after(self.update_interval, self._check_events)
+
+    def set_status(self, text, fg):
+        if self._status != (text, fg):
+            self._status = (text, fg)
+            self.status_label.config(text=text, fg=fg)
+
     def update_display(self):
-        start_time = time.time()
         try:
-            # 获取传感器数据
-            sensor_data = self.data_provider()
-            if sensor_data is None:
-                self.status_label.config(text="状态: 等待串口数据...", fg="orange")
-                return
-            
-            # 使用模型进行预测
-            gesture_id = self.model.predict([sensor_data])[0]
+            events = self._drain_events() if self.event_queue is not None else self._poll_events()
+        except Exception as e:
+            self.set_status(f"状态: 错误 - {str(e)}", "red")
+            return
+        if not events:
+            return
+        
+        start_time = time.perf_counter()
+        ui_start = time.perf_counter_ns()
+        # 合并突发事件：每个手势都加入序列，但界面只按最后的结果刷新一次
+        last_gesture = None
+        status = None
+        for event in events:
+            if event.get('type', 'gesture') == 'status':
+                status = (event['text'], event['color'])
+                continue
+            gesture_id = event['gesture_id']
             gesture_name = self.sign_mapping.get(str(gesture_id), f"未知手势({gesture_id})")
-            
-            # 更新手势显示
-            self.update_sign_display(gesture_name)
-            
-            # 更新序列
             self.update_sequence(gesture_name)
-            
-            # 更新状态
-            self.status_label.config(
-                text=f"状态: 识别成功 - {gesture_name} (ID: {gesture_id})",
-                fg="green"
-            )
-            
-        except Exception as e:
-            self.status_label.config(
-                text=f"状态: 错误 - {str(e)}",
-                fg="red"
-            )
+            last_gesture = (gesture_id, gesture_name, event.get('confidence'))
+            status = None
+            if 'queued_ns' in event:
+                tracker.record_since('ui_wait', event['queued_ns'])
         
-        # 计算处理时间并更新性能标签
-        processing_time = (time.time() - start_time) * 1000
-        self.perf_label.config(text=f"处理时间: {processing_time:.1f}ms")
+        if last_gesture is not None:
+            gesture_id, gesture_name, confidence = last_gesture
+            self.update_sign_display(gesture_name)
+            self.current_sequence_var.set(self._sequence_text)
+            confidence = f", 置信度 {confidence:.0%}" if confidence is not None else ""
+            self.set_status(f"状态: 识别成功 - {gesture_name} (ID: {gesture_id}{confidence})", "green")
+            tracker.record_since('ui', ui_start)
+            arrival_ns = events[-1].get('arrival_ns')
+            if arrival_ns is None and self.arrival_provider:
+                arrival_ns = self.arrival_provider()
+            if arrival_ns is not None:
+                tracker.record_since('end_to_end', arrival_ns)
+            processing_time = (time.perf_counter() - start_time) * 1000
+            self.perf_label.config(text=f"处理时间: {processing_time:.1f}ms")
+        if status is not None:
+            self.set_status(*status)
+
+    def _drain_events(self):
+        """订阅模式：一次取出队列中积压的事件（最多MAX_EVENTS_PER_UPDATE个）"""
+        events = []
+        try:
+            while len(events) < MAX_EVENTS_PER_UPDATE:
+                events.append(self.event_queue.get_nowait())
+        except queue.Empty:
+            pass
+        return events
+
+    def _poll_events(self):
+        """轮询模式：在界面线程中读取最新样本并识别，返回本次产生的事件"""
+        # 获取传感器数据
+        sensor_data = self.data_provider()
+        if sensor_data is None:
+            # 使用滤波时两次更新之间可能没有新样本，超过1秒才提示等待
+            if self.stabilizer is None or time.time() - self.last_update_time > 1.0:
+                return [{'type': 'status', 'text': "状态: 等待串口数据...", 'color': "orange"}]
+            return []
+        self.last_update_time = time.time()
         
-        # 动态调整更新间隔
-        if processing_time > 50:
-            self.update_interval = max(100, int(processing_time * 1.2))
+        # 使用模型进行预测（支持拒识的模型同时给出置信度）
+        predict_start = time.perf_counter_ns()
+        confidence = None
+        if hasattr(self.model, 'recognize'):
+            labels, confidences, _ = self.model.recognize([sensor_data])
+            gesture_id, confidence = labels[0], confidences[0]
         else:
-            self.update_interval = 100
+            gesture_id = self.model.predict([sensor_data])[0]
+        tracker.record_since('predict', predict_start)
+        if self.stabilizer is not None:
+            # 只有稳定的手势切换才刷新显示和序列；拒识结果也参与表决，
+            # 手放松后再做同一手势会被识别为一次新的切换
+            gesture_id = self.stabilizer.update(gesture_id)
+            if gesture_id is None:
+                return []
+        if gesture_id == UNKNOWN:
+            # 拒识结果不显示、不加入序列
+            return [{'type': 'status', 'text': "状态: 未识别到已知手势", 'color': "orange"}]
+        return [{'gesture_id': gesture_id, 'confidence': confidence}]
+
+    def _center_sign_text(self, event):
+        if event.width > 1 and event.height > 1:
+            self.sign_canvas.coords(self.sign_text, event.width / 2, event.height / 2)
 
     def update_sign_display(self, sign_text):
-        self.sign_canvas.itemconfig(self.sign_text, text=sign_text)
-        
-        canvas_width = self.sign_canvas.winfo_width()
-        canvas_height = self.sign_canvas.winfo_height()
-        if canvas_width > 1 and canvas_height > 1:
-            self.sign_canvas.coords(self.sign_text, canvas_width/2, canvas_height/2)
+        if sign_text != self._shown_sign:
+            self._shown_sign = sign_text
+            self.sign_canvas.itemconfig(self.sign_text, text=sign_text)
 
     def update_sequence(self, new_sign):
+        """追加到序列；与上一个手势相同时序列重新从该手势开始（保持原有行为）"""
         if new_sign == self.last_sign:
-            self.current_sequence = new_sign
+            self.sequence.clear()
+        full = len(self.sequence) == self.sequence.maxlen
+        self.sequence.append(new_sign)
+        if full or len(self.sequence) == 1:
+            # 丢弃了最旧的手势（或重新开始）时才整体重建，平时只在末尾追加
+            self._sequence_text = SEQUENCE_SEPARATOR.join(self.sequence)
         else:
-            if self.current_sequence:
-                self.current_sequence += " → " + new_sign
-            else:
-                self.current_sequence = new_sign
-        
-        self.current_sequence_var.set(self.current_sequence)
+            self._sequence_text += SEQUENCE_SEPARATOR + new_sign
         self.last_sign = new_sign
 
     def clear_sequence(self):
-        self.current_sequence = ""
+        self.sequence.clear()
+        self._sequence_text = ""
         self.current_sequence_var.set("")
         self.last_sign = None
+        if self.stabilizer is not None:
+            self.stabilizer.reset()
+        if self.on_clear is not None:
+            self.on_clear()
+        self._shown_sign = None
         self.sign_canvas.itemconfig(self.sign_text, text="等待识别...")
-        self.status_label.config(text="状态: 序列已清空", fg="blue")
+        self.set_status("状态: 序列已清空", "blue")
+
+    def start_calibration(self):
+        name = self.calibration_name_var.get().strip()
+        if not name:
+            self.set_status("状态: 请输入要标定的手势名称", "orange")
+            return
+        if self.calibrator.active:
+            return
+        self.calibrator.start(name)
+        self.set_status(f"状态: 正在采集「{name}」，请保持手势{self.calibrator.seconds:.0f}秒", "blue")
+        self.root.after(int(self.calibrator.seconds * 1000), self._finish_calibration, name)
+
+    def _finish_calibration(self, name):
+        count = self.calibrator.finish()
+        self.set_status(f"状态: 已采集「{name}」{count}个样本，后台更新模型中", "blue")
 
     def save_sequence(self):
-        if self.current_sequence:
+        if self.current_sequence and self.logger is not None:
+            # 只放入日志线程的队列，由后台批量写盘
+            self.logger.log_sentence(self.current_sequence)
+            self.set_status(f"状态: 序列已记录到 {self.logger.directory}", "blue")
+        elif self.current_sequence:
             try:
                 with open("output.txt", "a", encoding="utf-8") as f:
                     f.write(self.current_sequence + "\n")
-                self.status_label.config(text="状态: 序列已保存到 output.txt", fg="blue")
+                self.set_status("状态: 序列已保存到 output.txt", "blue")
             except Exception as e:
-                self.status_label.config(text=f"状态: 保存失败 - {str(e)}", fg="red")
+                self.set_status(f"状态: 保存失败 - {str(e)}", "red")
         else:
-            self.status_label.config(text="状态: 无法保存空序列", fg="orange")
\ No newline at end of file
+            self.set_status("状态: 无法保存空序列", "orange")
\ No newline at end of file